@@ -38,6 +38,8 @@ class GiteaAdapter(GitPlatformAdapter):
         self.host = host
         self.token = token
         self._verify_signature_enabled = verify_signature  # Rename to avoid conflict with method
+        # Kept-alive connections to the Gitea host, reused across tasks by the cached adapter
+        self.session = requests.Session()
 
     def parse_webhook(self, payload: dict, platform: str = "gitea") -> PRMetadata:
         """
@@ -128,13 +130,13 @@ class GiteaAdapter(GitPlatformAdapter):
         endpoint = f"https://{self.host}/api/v1/repos/{metadata.repo_id}/git/commits/{metadata.head_sha}.diff"
         params = {"access_token": self.token}
 
-        response = requests.get(endpoint, params=params)
+        response = self.session.get(endpoint, params=params)
         if response.status_code != 200:
             logger.error(f"Gitea API error {response.status_code}: {response.text}")
             response.raise_for_status()
 
-        # Split diff by file
-        diff_blocks = re.split(r"^diff --git ", response.text.strip(), flags=re.MULTILINE)
+        # Split diff by file, keeping each block's "diff --git" header
+        diff_blocks = re.split(r"^(?=diff --git )", response.text.strip(), flags=re.MULTILINE)
         return [block for block in diff_blocks if block]
 
     def post_review(self, metadata: PRMetadata, review: ReviewResponse) -> None:
@@ -167,7 +169,7 @@ class GiteaAdapter(GitPlatformAdapter):
             "assignees": [metadata.author] if metadata.author else [],
         }
 
-        response = requests.post(endpoint, params=params, json=issue_data)
+        response = self.session.post(endpoint, params=params, json=issue_data)
         if response.status_code != 201:
             logger.error(f"Failed to create issue: {response.status_code} {response.text}")
             response.raise_for_status()
@@ -10,14 +10,14 @@ from datetime import timedelta
 from celery import Celery
 from celery.schedules import crontab
 
-from utils.config import Config
+from utils.config import get_config
 from utils.logger import setup_logging
 
 # Initialize logging
 setup_logging()
 
 # Load configuration (singleton instance)
-config = Config()
+config = get_config()
 
 # -----------------------------------------------------------------------------
 # Celery Application Configuration
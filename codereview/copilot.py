@@ -15,6 +15,7 @@ from loguru import logger
 
 from codereview.ai import AI
 from utils.config import Config
+from utils.metrics import llm_tokens_total
 from utils.prompt_loader import load_prompt
 
 
@@ -49,6 +50,23 @@ class Copilot(AI):
         if config.COPILOT_TOKEN:
             self.access_token = self.get_access_token()
 
+    def system_prompt(self, model: str | None = None) -> str:
+        """
+        Build the system prompt code_review() sends for the given model.
+
+        Args:
+            model: Optional model override (uses Config.LLM_MODEL if not provided)
+
+        Returns:
+            str: The rendered code review prompt
+        """
+        context = {
+            "locale": self.config.LLM_LOCALE,
+            "input-focus": "general best practices",
+            "model": model or self.model,
+        }
+        return load_prompt("code-review-pr.md", context)
+
     def code_review(self, diff_content: str, model: str | None = None) -> str:
         """
         Perform code review using AI.
@@ -65,13 +83,7 @@ class Copilot(AI):
         start_time = time.time()
 
         try:
-            # Load system prompt from file
-            context = {
-                "locale": self.config.LLM_LOCALE,
-                "input-focus": "general best practices",
-                "model": model,
-            }
-            system_prompt = load_prompt("code-review-pr.md", context)
+            system_prompt = self.system_prompt(model)
 
             # Construct API request
             # Handle various base_url formats:
@@ -136,7 +148,13 @@ class Copilot(AI):
                     return "Error: Authentication failed"
 
             if response.status_code == 200:
-                result = response.json()["choices"][0]["message"]["content"]
+                body = response.json()
+                result = body["choices"][0]["message"]["content"]
+                # Exact usage as reported by the provider (absent on some proxies)
+                if usage := body.get("usage"):
+                    llm_tokens_total.labels(model_type="chat", model_name=model).inc(
+                        usage.get("total_tokens", 0)
+                    )
                 logger.bind(request_id=request_id, latency_ms=latency_ms, status="success").info(
                     "LLM request completed"
                 )
@@ -23,14 +23,20 @@ from loguru import logger
 # Import metrics to register them with Prometheus client (T079)
 import utils.metrics  # noqa: F401 - Registers metrics on import
 from utils.config import Config
+from utils.config import get_config as load_config
 from utils.logger import setup_logging
+from utils.metrics import (
+    record_webhook_parse_error,
+    record_webhook_received,
+    record_webhook_signature,
+)
 
 # =============================================================================
 # Global Configuration
 # =============================================================================
 
 # Load configuration (singleton instance)
-config = Config()
+config = load_config()
 
 # Setup logging
 setup_logging()
@@ -181,6 +187,7 @@ async def verify_webhook_signature(
         adapter = GiteaAdapter(host="", token="", verify_signature=True)
 
     is_valid = adapter.verify_signature(payload, signature or "", secret)
+    record_webhook_signature(platform, is_valid)
 
     if not is_valid:
         logger.warning(f"Invalid webhook signature for {platform}")
@@ -263,10 +270,13 @@ async def receive_webhook(
     from adapters.github import GitHubAdapter
     from worker import process_code_review
 
+    record_webhook_received(platform)
+
     # Parse webhook payload
     try:
         payload = await request.json()
     except json.JSONDecodeError as e:
+        record_webhook_parse_error(platform, "invalid_json")
         raise HTTPException(status_code=400, detail=f"Invalid JSON payload: {e}")
 
     # Select platform adapter
@@ -279,6 +289,7 @@ async def receive_webhook(
     try:
         metadata = adapter.parse_webhook(payload, platform)
     except (ValueError, KeyError) as e:
+        record_webhook_parse_error(platform, "invalid_payload")
         logger.error(f"Failed to parse webhook: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to parse webhook payload: {e}")
 
@@ -910,18 +921,16 @@ async def analyze_code_legacy(request_body: dict):
         return {"message": "Failed to get diff content"}
 
     current_issue_id = None
-    ignored_file_suffix = config.IGNORED_FILE_SUFFIX.split(",")
+    ignored_file_suffixes = config.ignored_file_suffixes
 
     for i, diff_content in enumerate(diff_blocks, start=1):
         file_path = diff_content.split(" ")[0].split("/")
         file_name = file_path[-1]
 
         # Ignore the file if it's in the ignored list
-        if ignored_file_suffix:
-            for suffix in ignored_file_suffix:
-                if file_name.endswith(suffix):
-                    logger.warning(f"File {file_name} is ignored")
-                    continue
+        if ignored_file_suffixes and file_name.lower().endswith(ignored_file_suffixes):
+            logger.warning(f"File {file_name} is ignored")
+            continue
 
         # Send the diff to AI for code analysis
         response = copilot.code_review(diff_content)
@@ -941,7 +950,7 @@ async def analyze_code_legacy(request_body: dict):
             logger.success(f"The code review: {issue_url}")
 
             # Send a notification to the webhook
-            if config.webhook and config.webhook.is_init:
+            if config.webhook.is_init:
                 headers = {}
                 if config.webhook.header_name and config.webhook.header_value:
                     headers = {config.webhook.header_name: config.webhook.header_value}
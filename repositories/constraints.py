@@ -224,30 +224,19 @@ class ConstraintRepository:
             logger.error(f"Failed to update constraint confidence: {e}")
             return None
 
-    def delete_expired(self, days_old: int = 90) -> int:
+    def delete_expired(self) -> int:
         """
-        Delete expired constraints older than specified days.
+        Delete constraints whose expires_at has passed.
 
-        Args:
-            days_old: Age in days for expiration (default 90)
+        Runs a single server-side DELETE (scripts/sql/012_create_cleanup_expired_constraints.sql)
+        that returns per-repository counts instead of the deleted rows.
 
         Returns:
             Number of constraints deleted
-
-        Raises:
-            Exception: If database operation fails
         """
-        cutoff_date = datetime.utcnow() - timedelta(days=days_old)
-
         try:
-            result = (
-                self.client.table("learned_constraints")
-                .delete()
-                .lt("created_at", cutoff_date.isoformat())
-                .execute()
-            )
-
-            deleted_count = len(result.data) if result.data else 0
+            rows = self.client.rpc("cleanup_expired_constraints", {}).execute().data or []
+            deleted_count = sum(row["deleted_count"] for row in rows)
 
             if deleted_count > 0:
                 logger.info(f"Deleted {deleted_count} expired constraints")
@@ -255,11 +244,11 @@ class ConstraintRepository:
                 # Track expiration metrics
                 from utils.metrics import constraint_expirations_total
 
-                # Get repo_ids from deleted constraints
-                repo_ids = set(row.get("repo_id", "unknown") for row in result.data)
-                for repo_id in repo_ids:
-                    constraint_expirations_total.labels(repo_id=repo_id).inc(deleted_count)
-                    constraint_count.labels(repo_id=repo_id).dec(deleted_count)
+                for row in rows:
+                    constraint_expirations_total.labels(repo_id=row["repo_id"]).inc(
+                        row["deleted_count"]
+                    )
+                    constraint_count.labels(repo_id=row["repo_id"]).dec(row["deleted_count"])
 
             return deleted_count
 
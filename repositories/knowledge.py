@@ -19,6 +19,7 @@ from openai import OpenAI
 from supabase import Client
 
 from utils.config import Config
+from utils.embedding_cache import EmbeddingCache
 from utils.metrics import (
     rag_match_count,
     rag_retrieval_failure_total,
@@ -26,6 +27,9 @@ from utils.metrics import (
     rag_retrieval_success_total,
 )
 
+# Characters of query text embedded for a context search (limits token usage)
+QUERY_MAX_CHARS = 2000
+
 
 class KnowledgeRepository:
     """
@@ -40,16 +44,20 @@ class KnowledgeRepository:
         config: Application configuration
     """
 
-    def __init__(self, supabase: Client, config: Config):
+    def __init__(
+        self, supabase: Client, config: Config, embedding_cache: EmbeddingCache | None = None
+    ):
         """
         Initialize KnowledgeRepository.
 
         Args:
             supabase: Supabase client instance
             config: Application configuration
+            embedding_cache: Optional cache for query embeddings
         """
         self.supabase = supabase
         self.config = config
+        self.embedding_cache = embedding_cache
         self.openai = OpenAI(
             api_key=config.effective_llm_api_key,
             base_url=config.effective_llm_base_url,
@@ -62,6 +70,7 @@ class KnowledgeRepository:
         repo_id: str,
         match_threshold: float | None = None,
         match_count: int | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[dict]:
         """
         Search knowledge base for relevant context using vector similarity.
@@ -71,6 +80,7 @@ class KnowledgeRepository:
             repo_id: Repository identifier for filtering
             match_threshold: Similarity threshold (0.0-1.0), defaults to config.RAG_THRESHOLD
             match_count: Number of matches to return, defaults to config.RAG_MATCH_COUNT_MIN
+            query_embedding: Precomputed query embedding; query_text is only embedded without one
 
         Returns:
             List of context chunks with metadata:
@@ -92,8 +102,9 @@ class KnowledgeRepository:
         match_count = match_count or self.config.RAG_MATCH_COUNT_MIN
 
         try:
-            # 1. Generate embedding for query
-            query_embedding = self._generate_embedding(query_text[:2000])  # Limit token usage
+            # 1. Generate embedding for query (unless the caller already has one)
+            if query_embedding is None:
+                query_embedding = self._generate_embedding(query_text[:QUERY_MAX_CHARS])
 
             if not query_embedding:
                 logger.warning(f"Failed to generate embedding for {repo_id}")
@@ -155,15 +166,23 @@ class KnowledgeRepository:
             List of floats representing embedding vector, or None if failed
         """
         try:
-            response = self.openai.embeddings.create(
-                model=self.config.EMBEDDING_MODEL,
-                input=text,
-            )
-            return response.data[0].embedding
+            if self.embedding_cache:
+                return self.embedding_cache.get_or_compute_many(
+                    [text], self.config.EMBEDDING_MODEL, self._embed
+                )[0]
+            return self._embed([text])[0]
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             return None
 
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in one API request, returning vectors in input order."""
+        response = self.openai.embeddings.create(
+            model=self.config.EMBEDDING_MODEL,
+            input=texts,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
     def _format_citation(self, metadata: dict) -> str:
         """
         Format citation string from metadata.
@@ -188,13 +207,16 @@ class KnowledgeRepository:
             return "See repository history"
 
 
-def create_knowledge_repository(supabase: Client, config: Config) -> KnowledgeRepository | None:
+def create_knowledge_repository(
+    supabase: Client, config: Config, embedding_cache: EmbeddingCache | None = None
+) -> KnowledgeRepository | None:
     """
     Factory function to create KnowledgeRepository with validation.
 
     Args:
         supabase: Supabase client instance
         config: Application configuration
+        embedding_cache: Optional cache for query embeddings
 
     Returns:
         KnowledgeRepository instance if Supabase configured, None otherwise
@@ -207,4 +229,4 @@ def create_knowledge_repository(supabase: Client, config: Config) -> KnowledgeRe
         logger.info("RAG disabled via configuration")
         return None
 
-    return KnowledgeRepository(supabase, config)
+    return KnowledgeRepository(supabase, config, embedding_cache)
@@ -73,11 +73,13 @@ SQL_STATEMENTS = [
         CONSTRAINT knowledge_base_repo_check CHECK (repo_id IS NOT NULL)
     );
 
-    -- Index for vector similarity search (IVFFlat for performance)
-    CREATE INDEX IF NOT EXISTS knowledge_base_embedding_idx
+    -- Index for vector similarity search (half-precision HNSW, as in
+    -- migration 011; replaces the former knowledge_base_embedding_idx)
+    DROP INDEX IF EXISTS knowledge_base_embedding_idx;
+    CREATE INDEX IF NOT EXISTS idx_kb_vector_half
     ON knowledge_base
-    USING ivfflat (embedding vector_cosine_ops)
-    WITH (lists = 100);
+    USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+    WITH (m = 24, ef_construction = 128);
 
     -- Index for repo-specific queries
     CREATE INDEX IF NOT EXISTS knowledge_base_repo_idx
@@ -130,11 +132,13 @@ SQL_STATEMENTS = [
         CONSTRAINT learned_constraints_confidence_check CHECK (confidence_score BETWEEN 0 AND 1)
     );
 
-    -- Index for vector similarity search (constraint matching)
-    CREATE INDEX IF NOT EXISTS learned_constraints_embedding_idx
+    -- Index for vector similarity search (constraint matching; half-precision
+    -- HNSW, as in migration 010; replaces learned_constraints_embedding_idx)
+    DROP INDEX IF EXISTS learned_constraints_embedding_idx;
+    CREATE INDEX IF NOT EXISTS idx_lc_vector_half
     ON learned_constraints
-    USING ivfflat (embedding vector_cosine_ops)
-    WITH (lists = 50);
+    USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+    WITH (m = 24, ef_construction = 128);
 
     -- Index for repo-specific queries
     CREATE INDEX IF NOT EXISTS learned_constraints_repo_idx
@@ -0,0 +1,43 @@
+-- Migration: 009_create_delete_repo_data.sql
+-- Purpose: Create delete_repo_data function for batched right-to-forget deletion
+-- Dependencies: 002_create_knowledge_base.sql, 003_create_learned_constraints.sql, 007_create_migration_table.sql
+-- Idempotent: Yes (uses OR REPLACE / ON CONFLICT)
+
+-- Delete up to p_batch_size knowledge base entries and learned constraints for
+-- a repository, returning only the row counts. Callers loop until both counts
+-- fall below p_batch_size; each call is its own short transaction, so large
+-- repositories never hold row locks for the whole purge.
+CREATE OR REPLACE FUNCTION public.delete_repo_data(p_repo_id text, p_batch_size int DEFAULT 1000)
+RETURNS json
+LANGUAGE plpgsql
+VOLATILE
+AS $$
+DECLARE
+  knowledge_deleted int;
+  constraints_deleted int;
+BEGIN
+  DELETE FROM public.knowledge_base
+  WHERE id IN (
+    SELECT id FROM public.knowledge_base WHERE repo_id = p_repo_id LIMIT p_batch_size
+  );
+  GET DIAGNOSTICS knowledge_deleted = ROW_COUNT;
+
+  DELETE FROM public.learned_constraints
+  WHERE id IN (
+    SELECT id FROM public.learned_constraints WHERE repo_id = p_repo_id LIMIT p_batch_size
+  );
+  GET DIAGNOSTICS constraints_deleted = ROW_COUNT;
+
+  RETURN json_build_object(
+    'knowledge_deleted', knowledge_deleted,
+    'constraints_deleted', constraints_deleted
+  );
+END;
+$$;
+
+-- Add function comment
+COMMENT ON FUNCTION public.delete_repo_data IS 'Right-to-forget deletion of one batch of knowledge_base and learned_constraints rows for a repository. Parameters: p_repo_id (text, normalized owner/repo), p_batch_size (int, default 1000). Returns json with knowledge_deleted and constraints_deleted counts; call repeatedly until both are below p_batch_size.';
+
+-- Record migration
+INSERT INTO public.schema_migrations (version) VALUES ('009_create_delete_repo_data.sql')
+ON CONFLICT (version) DO NOTHING;
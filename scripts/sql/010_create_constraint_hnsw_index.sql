@@ -0,0 +1,102 @@
+-- Migration: 010_create_constraint_hnsw_index.sql
+-- Purpose: Replace the IVFFlat constraint index with a half-precision HNSW index and scope check_constraints to one repository
+-- Dependencies: 003_create_learned_constraints.sql, 005_create_vector_indexes.sql, 006_create_functions.sql, 007_create_migration_table.sql
+-- Idempotent: Yes (uses IF EXISTS / IF NOT EXISTS / OR REPLACE / ON CONFLICT)
+-- Requires: pgvector 0.8+ (halfvec, iterative index scans)
+
+-- Build settings for this session only. 1GB keeps the build in memory for
+-- ~100k constraints without exceeding the container's 4GB minimum.
+SET maintenance_work_mem = '1GB';
+SET max_parallel_maintenance_workers = 7;
+
+-- HNSW needs no training data (IVFFlat lists are only useful after ~1000
+-- rows) and gives better recall at the same latency for constraint lookups.
+-- The index holds 16-bit copies of the embeddings (3 KB instead of 6 KB per
+-- 1536-dim vector), so twice as much of the graph stays cache-resident; the
+-- full-precision column is kept and used to re-rank each candidate set, so
+-- returned similarities and threshold decisions are exact.
+DROP INDEX IF EXISTS public.idx_lc_vector;
+
+CREATE INDEX IF NOT EXISTS idx_lc_vector_half
+  ON public.learned_constraints
+  USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+  WITH (m = 24, ef_construction = 128);
+
+COMMENT ON INDEX idx_lc_vector_half IS 'Half-precision HNSW index for constraint matching (m=24, ef_construction=128; queried with ef_search=100); candidates are re-ranked on the full-precision embedding.';
+
+RESET maintenance_work_mem;
+RESET max_parallel_maintenance_workers;
+
+-- B-tree index on learned_constraints repo_id for filtering
+CREATE INDEX IF NOT EXISTS idx_lc_repo_id
+  ON public.learned_constraints(repo_id);
+
+COMMENT ON INDEX idx_lc_repo_id IS 'B-tree index for repository filtering';
+
+-- The previous signature had no repository parameter, so the worker's call
+-- (which passes p_repo_id) could not resolve it; drop it to keep the RPC unambiguous.
+DROP FUNCTION IF EXISTS public.check_constraints(vector, float);
+
+-- Nearest constraints for a repository. The inner query is a plain
+-- ORDER BY distance LIMIT k, the only shape the HNSW index can serve; it
+-- fetches four candidates per requested match, which are re-ranked and
+-- thresholded on the exact cosine distance instead of filtering every row in
+-- the table. The index is shared by all repositories, so the repo filter runs
+-- on the rows it returns: an iterative scan keeps walking the graph until
+-- enough rows of this repository pass (up to hnsw.max_scan_tuples) instead of
+-- stopping after ef_search candidates, which for a repository with few
+-- constraints could all belong to other tenants. relaxed_order may return
+-- those rows slightly out of order; the outer query sorts them.
+CREATE OR REPLACE FUNCTION public.check_constraints(
+  p_repo_id text,
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.8,
+  match_count int DEFAULT 3
+)
+RETURNS table (
+  id text,
+  repo_id text,
+  violation_reason text,
+  code_pattern text,
+  user_reason text,
+  embedding real[],
+  confidence_score float,
+  expires_at timestamptz,
+  created_at timestamptz,
+  similarity float
+)
+LANGUAGE sql
+STABLE
+SET hnsw.ef_search = 100
+SET hnsw.iterative_scan = relaxed_order
+AS $$
+  SELECT
+    candidates.id::text,
+    candidates.repo_id,
+    coalesce(candidates.violation_reason, ''),
+    candidates.code_pattern,
+    candidates.user_reason,
+    candidates.embedding::real[],
+    candidates.confidence_score,
+    candidates.expires_at,
+    candidates.created_at,
+    1 - (candidates.embedding <=> query_embedding) as similarity
+  FROM (
+    SELECT lc.*
+    FROM public.learned_constraints lc
+    WHERE lc.repo_id = p_repo_id
+      AND lc.expires_at > now()
+    ORDER BY lc.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+    LIMIT match_count * 4
+  ) candidates
+  WHERE 1 - (candidates.embedding <=> query_embedding) > match_threshold
+  ORDER BY candidates.embedding <=> query_embedding
+  LIMIT match_count;
+$$;
+
+-- Add function comment
+COMMENT ON FUNCTION public.check_constraints IS 'Check if code pattern matches learned constraints (false positives) of one repository via the half-precision HNSW index with exact re-ranking. Parameters: p_repo_id (text), query_embedding (vector), match_threshold (float, default 0.8), match_count (int, default 3). Returns matching constraints with similarity scores.';
+
+-- Record migration
+INSERT INTO public.schema_migrations (version) VALUES ('010_create_constraint_hnsw_index.sql')
+ON CONFLICT (version) DO NOTHING;
@@ -0,0 +1,76 @@
+-- Migration: 011_quantize_vector_indexes.sql
+-- Purpose: Search knowledge_base through a half-precision HNSW index with exact re-ranking
+-- Dependencies: 002_create_knowledge_base.sql, 005_create_vector_indexes.sql, 006_create_functions.sql, 007_create_migration_table.sql
+-- Idempotent: Yes (uses IF EXISTS / IF NOT EXISTS / OR REPLACE / ON CONFLICT)
+-- Requires: pgvector 0.8+ (halfvec, iterative index scans)
+
+-- Same layout as idx_lc_vector_half (010): the index holds 16-bit copies of
+-- the embeddings, and the full-precision column re-ranks each candidate set,
+-- so returned similarities and threshold decisions are exact.
+SET maintenance_work_mem = '1GB';
+SET max_parallel_maintenance_workers = 7;
+
+DROP INDEX IF EXISTS public.idx_kb_vector;
+
+CREATE INDEX IF NOT EXISTS idx_kb_vector_half
+  ON public.knowledge_base
+  USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops)
+  WITH (m = 24, ef_construction = 128);
+
+COMMENT ON INDEX idx_kb_vector_half IS 'Half-precision HNSW index for knowledge_base similarity search; candidates are re-ranked on the full-precision embedding.';
+
+RESET maintenance_work_mem;
+RESET max_parallel_maintenance_workers;
+
+-- The previous signature had no repository filter, so KnowledgeRepository's
+-- call (which passes repo_id_filter) could not resolve it; drop it to keep the
+-- RPC unambiguous.
+DROP FUNCTION IF EXISTS public.match_knowledge(vector, float, int);
+
+-- Nearest knowledge base entries, optionally for one repository. The index
+-- scan fetches four candidates per requested match, which are re-ranked and
+-- thresholded on the exact cosine distance. As in check_constraints (010), an
+-- iterative scan keeps a repository filter from discarding every candidate
+-- of the shared index; the outer query restores exact ordering.
+CREATE OR REPLACE FUNCTION public.match_knowledge(
+  query_embedding vector(1536),
+  match_threshold float DEFAULT 0.75,
+  match_count int DEFAULT 3,
+  repo_id_filter text DEFAULT NULL
+)
+RETURNS table (
+  id bigint,
+  repo_id text,
+  content text,
+  metadata jsonb,
+  similarity float
+)
+LANGUAGE sql
+STABLE
+SET hnsw.ef_search = 100
+SET hnsw.iterative_scan = relaxed_order
+AS $$
+  SELECT
+    candidates.id,
+    candidates.repo_id,
+    candidates.content,
+    candidates.metadata,
+    1 - (candidates.embedding <=> query_embedding) as similarity
+  FROM (
+    SELECT kb.id, kb.repo_id, kb.content, kb.metadata, kb.embedding
+    FROM public.knowledge_base kb
+    WHERE repo_id_filter IS NULL OR kb.repo_id = repo_id_filter
+    ORDER BY kb.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+    LIMIT match_count * 4
+  ) candidates
+  WHERE 1 - (candidates.embedding <=> query_embedding) > match_threshold
+  ORDER BY candidates.embedding <=> query_embedding
+  LIMIT match_count;
+$$;
+
+-- Add function comment
+COMMENT ON FUNCTION public.match_knowledge IS 'Retrieve similar code patterns from knowledge_base for RAG context via the half-precision HNSW index with exact re-ranking. Parameters: query_embedding (vector), match_threshold (float, default 0.75), match_count (int, default 3), repo_id_filter (text, default NULL for all repositories). Returns table of matching entries with similarity scores.';
+
+-- Record migration
+INSERT INTO public.schema_migrations (version) VALUES ('011_quantize_vector_indexes.sql')
+ON CONFLICT (version) DO NOTHING;
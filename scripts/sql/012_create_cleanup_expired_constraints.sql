@@ -0,0 +1,32 @@
+-- Migration: 012_create_cleanup_expired_constraints.sql
+-- Purpose: Create cleanup_expired_constraints function for the hourly expiration job
+-- Dependencies: 003_create_learned_constraints.sql, 005_create_vector_indexes.sql, 007_create_migration_table.sql
+-- Idempotent: Yes (uses OR REPLACE / ON CONFLICT)
+
+-- Delete every constraint past its expires_at in one statement and return only
+-- per-repository counts. The range is served by idx_lc_expires_at (005), and the
+-- deleted rows (including their 1536-dim embeddings) never leave the database.
+CREATE OR REPLACE FUNCTION public.cleanup_expired_constraints()
+RETURNS table (
+  repo_id text,
+  deleted_count bigint
+)
+LANGUAGE sql
+VOLATILE
+AS $$
+  WITH deleted AS (
+    DELETE FROM public.learned_constraints lc
+    WHERE lc.expires_at < now()
+    RETURNING lc.repo_id
+  )
+  SELECT deleted.repo_id, count(*) AS deleted_count
+  FROM deleted
+  GROUP BY deleted.repo_id;
+$$;
+
+-- Add function comment
+COMMENT ON FUNCTION public.cleanup_expired_constraints IS 'Delete all learned constraints whose expires_at has passed. Returns table of repo_id and deleted_count per repository.';
+
+-- Record migration
+INSERT INTO public.schema_migrations (version) VALUES ('012_create_cleanup_expired_constraints.sql')
+ON CONFLICT (version) DO NOTHING;
@@ -26,6 +26,7 @@ from supabase import Client
 from models.indexing import IndexDepth, IndexingProgress
 from utils.config import Config
 from utils.metrics import (
+    MetricBatch,
     indexing_chunks_embedded_total,
     indexing_duration_seconds,
     indexing_files_processed_total,
@@ -108,6 +109,9 @@ class IndexingService:
     CHUNK_SIZE = 2000  # characters
     CHUNK_OVERLAP = 200  # characters
 
+    # Files processed between metric flushes during indexing
+    METRICS_FLUSH_FILES = 20
+
     def __init__(self, supabase: Client, config: Config):
         """
         Initialize IndexingService.
@@ -190,80 +194,89 @@ class IndexingService:
                 chunks_indexed = 0
                 secrets_found = 0
 
-                for idx, file_path in enumerate(files_to_index):
-                    try:
-                        # Update progress (10% to 90%)
-                        percentage = 10.0 + (idx / total_files) * 80.0
-                        self._update_progress(
-                            progress_callback,
-                            IndexingProgress(
-                                stage="chunking",
-                                files_processed=idx,
-                                total_files=total_files,
-                                chunks_indexed=chunks_indexed,
-                                percentage=percentage,
-                            ),
-                        )
-
-                        # Read file content
-                        with open(file_path, encoding="utf-8", errors="ignore") as f:
-                            content = f.read()
-
-                        # Skip if too large
-                        if len(content) > self.MAX_FILE_SIZE:
-                            logger.debug(f"Skipping large file: {file_path}")
-                            continue
-
-                        # Secret scanning (Constitution XIII)
-                        redacted_content, matches = redact_secrets(
-                            content, os.path.relpath(file_path, clone_path)
-                        )
-                        if matches:
-                            secrets_found += len(matches)
-                            for match in matches:
-                                indexing_secrets_found_total.labels(
-                                    repo_id=repo_id,
-                                    secret_type=match.secret_type.value,
-                                ).inc()
-                            logger.warning(f"Secrets found in {file_path}, using redacted content")
-                            content = redacted_content
-
-                        # Chunk file content
-                        chunks = self._chunk_content(content)
-
-                        # Generate embeddings and store
-                        for chunk_idx, chunk in enumerate(chunks):
-                            if not chunk.strip():
+                # Per-file counters are accumulated and applied once per label set,
+                # every METRICS_FLUSH_FILES files so they track long runs live
+                with MetricBatch() as metric_batch:
+                    for idx, file_path in enumerate(files_to_index):
+                        if idx and idx % self.METRICS_FLUSH_FILES == 0:
+                            metric_batch.flush()
+                        try:
+                            # Update progress (10% to 90%)
+                            percentage = 10.0 + (idx / total_files) * 80.0
+                            self._update_progress(
+                                progress_callback,
+                                IndexingProgress(
+                                    stage="chunking",
+                                    files_processed=idx,
+                                    total_files=total_files,
+                                    chunks_indexed=chunks_indexed,
+                                    percentage=percentage,
+                                ),
+                            )
+
+                            # Read file content
+                            with open(file_path, encoding="utf-8", errors="ignore") as f:
+                                content = f.read()
+
+                            # Skip if too large
+                            if len(content) > self.MAX_FILE_SIZE:
+                                logger.debug(f"Skipping large file: {file_path}")
                                 continue
 
-                            # Generate embedding
-                            embedding = self._generate_embedding(chunk)
-                            if not embedding:
-                                continue
-
-                            # Store in Supabase
-                            relative_path = os.path.relpath(file_path, clone_path)
-                            self.supabase.table("knowledge_base").insert(
-                                {
-                                    "repo_id": repo_id,
-                                    "content": chunk,
-                                    "metadata": {
-                                        "file_path": relative_path,
-                                        "branch": branch,
-                                        "chunk_index": chunk_idx,
-                                        "file_size": len(content),
-                                    },
-                                    "embedding": embedding,
-                                }
-                            ).execute()
-
-                            chunks_indexed += 1
-
-                        indexing_files_processed_total.labels(repo_id=repo_id).inc()
-
-                    except Exception as e:
-                        logger.error(f"Failed to index file {file_path}: {e}")
-                        continue
+                            # Secret scanning (Constitution XIII)
+                            redacted_content, matches = redact_secrets(
+                                content, os.path.relpath(file_path, clone_path)
+                            )
+                            if matches:
+                                secrets_found += len(matches)
+                                for match in matches:
+                                    metric_batch.inc(
+                                        indexing_secrets_found_total,
+                                        repo_id,
+                                        match.secret_type.value,
+                                    )
+                                logger.warning(
+                                    f"Secrets found in {file_path}, using redacted content"
+                                )
+                                content = redacted_content
+
+                            # Chunk file content
+                            chunks = self._chunk_content(content)
+
+                            # Generate embeddings and store
+                            for chunk_idx, chunk in enumerate(chunks):
+                                if not chunk.strip():
+                                    continue
+
+                                # Generate embedding
+                                embedding = self._generate_embedding(chunk)
+                                if not embedding:
+                                    continue
+
+                                # Store in Supabase
+                                relative_path = os.path.relpath(file_path, clone_path)
+                                self.supabase.table("knowledge_base").insert(
+                                    {
+                                        "repo_id": repo_id,
+                                        "content": chunk,
+                                        "metadata": {
+                                            "file_path": relative_path,
+                                            "branch": branch,
+                                            "chunk_index": chunk_idx,
+                                            "file_size": len(content),
+                                        },
+                                        "embedding": embedding,
+                                    }
+                                ).execute()
+
+                                chunks_indexed += 1
+                                metric_batch.inc(indexing_chunks_embedded_total, repo_id)
+
+                            metric_batch.inc(indexing_files_processed_total, repo_id)
+
+                        except Exception as e:
+                            logger.error(f"Failed to index file {file_path}: {e}")
+                            continue
 
                 # Stage 4: Complete
                 self._update_progress(
@@ -281,7 +294,6 @@ class IndexingService:
                 indexing_duration_seconds.labels(repo_id=repo_id, index_depth=depth.value).observe(
                     duration
                 )
-                indexing_chunks_embedded_total.labels(repo_id=repo_id).inc(chunks_indexed)
 
                 logger.info(
                     f"Indexing completed: repo_id={repo_id}, "
@@ -455,6 +455,26 @@ def mock_supabase_client() -> Mock:
     return client
 
 
+# =============================================================================
+# Mock Redis Cache Fixture
+# =============================================================================
+
+
+@pytest.fixture
+def store() -> tuple[MagicMock, dict[str, bytes]]:
+    """
+    Dict-backed stand-in for the Redis commands the caches use.
+
+    Returns the mock client (mget, pipelined set) and the dict it reads and writes.
+    """
+    data: dict[str, bytes] = {}
+    client = MagicMock()
+    client.mget.side_effect = lambda keys: [data.get(k) for k in keys]
+    pipe = client.pipeline.return_value
+    pipe.set.side_effect = lambda key, value, ex: data.__setitem__(key, value)
+    return client, data
+
+
 # =============================================================================
 # Mock OpenAI Client Fixture
 # =============================================================================
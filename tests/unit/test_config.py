@@ -0,0 +1,97 @@
+"""
+Unit Tests for Configuration Management
+
+Tests legacy key resolution and validation memoization in utils.config.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from utils.config import Config
+
+
+@pytest.fixture
+def config_env(override_test_env, monkeypatch):
+    """Test environment without Supabase, with validation state reset around each test."""
+    monkeypatch.delenv("SUPABASE_URL", raising=False)
+    monkeypatch.delenv("SUPABASE_SERVICE_KEY", raising=False)
+    monkeypatch.delenv("SUPABASE_DB_URL", raising=False)
+    Config.reset_validation()
+    yield monkeypatch
+    Config.reset_validation()
+
+
+class TestConfigValidation:
+    """Test Config._validate memoization."""
+
+    def test_repeat_construction_skips_validation(self, config_env):
+        """GIVEN an unchanged environment WHEN constructing Config twice THEN warn only once."""
+        with patch("utils.config.logger") as mock_logger:
+            first = Config()
+            second = Config()
+
+        assert mock_logger.warning.call_count == 1
+        assert first.RAG_ENABLED is False
+        assert second.RAG_ENABLED is False
+
+    def test_reset_validation_reruns_checks(self, config_env):
+        """GIVEN a validated Config WHEN resetting validation THEN the next instance re-validates."""
+        with patch("utils.config.logger") as mock_logger:
+            Config()
+            Config.reset_validation()
+            Config()
+
+        assert mock_logger.warning.call_count == 2
+
+    def test_changed_inputs_are_validated(self, config_env):
+        """GIVEN a validated Config WHEN the LLM key is removed THEN raise ValueError."""
+        Config()
+        config_env.delenv("LLM_API_KEY")
+
+        with pytest.raises(ValueError, match="LLM authentication"):
+            Config(_env_file=None)
+
+
+class TestLLMConcurrency:
+    """Test the LLM_CONCURRENCY setting."""
+
+    def test_defaults_to_eight(self, config_env):
+        """GIVEN no LLM_CONCURRENCY WHEN constructing Config THEN allow 8 concurrent requests."""
+        config_env.delenv("LLM_CONCURRENCY", raising=False)
+
+        assert Config(_env_file=None).LLM_CONCURRENCY == 8
+
+    def test_zero_rejected(self, config_env):
+        """GIVEN LLM_CONCURRENCY=0 WHEN constructing Config THEN raise ValueError."""
+        config_env.setenv("LLM_CONCURRENCY", "0")
+
+        with pytest.raises(ValueError, match="LLM_CONCURRENCY"):
+            Config(_env_file=None)
+
+
+class TestEmbeddingBatchSize:
+    """Test the EMBEDDING_BATCH_SIZE setting."""
+
+    def test_defaults_to_sixty_four(self, config_env):
+        """GIVEN no EMBEDDING_BATCH_SIZE WHEN constructing Config THEN batch 64 inputs."""
+        config_env.delenv("EMBEDDING_BATCH_SIZE", raising=False)
+
+        assert Config(_env_file=None).EMBEDDING_BATCH_SIZE == 64
+
+
+class TestEffectiveLLMSettings:
+    """Test the effective_llm_* properties."""
+
+    def test_follow_updated_settings(self, config_env):
+        """GIVEN a read Config WHEN LLM_BASE_URL/LLM_API_KEY change THEN the properties follow."""
+        config = Config(_env_file=None)
+        assert config.effective_llm_base_url
+
+        config.LLM_BASE_URL = "https://llm.example/v1"
+        config.LLM_API_KEY = "new-key"
+        copy = config.model_copy(update={"LLM_BASE_URL": "https://other.example/v1"})
+
+        assert config.effective_llm_base_url == "https://llm.example/v1"
+        assert config.effective_llm_api_key == "new-key"
+        assert copy.effective_llm_base_url == "https://other.example/v1"
@@ -622,6 +622,48 @@ class TestConstraintRepositoryGetActiveConstraints:
         assert all(c.expires_at > now for c in result)
 
 
+# =============================================================================
+# Test: delete_expired
+# =============================================================================
+
+
+class TestConstraintRepositoryDeleteExpired:
+    """Test suite for ConstraintRepository.delete_expired() method."""
+
+    def test_delete_expired_uses_single_rpc(self):
+        """
+        GIVEN expired constraints in two repositories
+        WHEN calling delete_expired()
+        THEN one cleanup RPC runs and the per-repository counts are summed
+        """
+        from repositories.constraints import ConstraintRepository
+
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.return_value.data = [
+            {"repo_id": "octocat/a", "deleted_count": 3},
+            {"repo_id": "octocat/b", "deleted_count": 2},
+        ]
+
+        deleted = ConstraintRepository(mock_client).delete_expired()
+
+        assert deleted == 5
+        mock_client.rpc.assert_called_once_with("cleanup_expired_constraints", {})
+        mock_client.table.assert_not_called()
+
+    def test_delete_expired_returns_zero_on_error(self):
+        """
+        GIVEN the cleanup RPC fails
+        WHEN calling delete_expired()
+        THEN zero is returned instead of raising
+        """
+        from repositories.constraints import ConstraintRepository
+
+        mock_client = MagicMock()
+        mock_client.rpc.return_value.execute.side_effect = Exception("connection refused")
+
+        assert ConstraintRepository(mock_client).delete_expired() == 0
+
+
 # =============================================================================
 # Edge Cases and Error Handling
 # =============================================================================
@@ -5,20 +5,40 @@ Tests data isolation, retention policies, cleanup jobs, and
 audit logging per Constitution XIII.
 """
 
+import io
+import json
+import re
+import time
+from collections import deque
+from datetime import UTC, datetime
 from unittest.mock import MagicMock, Mock, patch
 
+import httpx
 import pytest
+from postgrest.exceptions import APIError
 
 from utils.data_governance import (
+    CONSTRAINT_RETENTION_DAYS,
+    FAILED_TASK_RETENTION_DAYS,
+    KNOWLEDGE_RETENTION_DAYS,
+    REVIEW_RETENTION_DAYS,
+    RIGHT_TO_FORGET_BATCH_SIZE,
     DataIsolationError,
     DataRetentionError,
-    RetentionPolicy,
+    _audit_queue,
+    _cutoff_iso,
+    _utc_iso_now,
     build_repo_filter,
+    cleanup_all_expired_data_bulk,
     cleanup_expired_constraints,
+    cleanup_expired_constraints_batch,
     cleanup_expired_knowledge,
+    cleanup_expired_knowledge_batch,
     delete_all_repo_data,
     enforce_repo_isolation,
     export_repo_data,
+    export_repo_data_stream,
+    flush_audit_log,
     log_data_access,
     verify_repo_access,
 )
@@ -58,6 +78,14 @@ class TestEnforceRepoIsolation:
 
         assert "Invalid repo_id format" in str(exc_info.value)
 
+    @pytest.mark.parametrize("repo_id", ["/repo", "owner/", "owner%2F", "/"])
+    def test_empty_owner_or_repo_raises_error(self, repo_id):
+        """GIVEN repo_id with an empty owner or repo WHEN enforcing isolation THEN raise DataIsolationError."""
+        with pytest.raises(DataIsolationError) as exc_info:
+            enforce_repo_isolation(repo_id)
+
+        assert "Invalid repo_id format" in str(exc_info.value)
+
 
 class TestBuildRepoFilter:
     """Test Supabase filter builder for repo isolation."""
@@ -72,25 +100,64 @@ class TestBuildRepoFilter:
         filter_dict = build_repo_filter("octocat%2Ftest-repo")
         assert filter_dict == {"repo_id": "eq.octocat/test-repo"}
 
+    def test_build_filter_is_cached_and_read_only(self):
+        """GIVEN the same repo_id twice WHEN building filters THEN reuse one read-only mapping."""
+        first = build_repo_filter("octocat/cached-repo")
+
+        assert build_repo_filter("octocat/cached-repo") is first
+        with pytest.raises(TypeError):
+            first["repo_id"] = "eq.other/repo"
+
 
 class TestRetentionPolicy:
     """Test data retention policy configuration."""
 
     def test_knowledge_retention_days(self):
         """GIVEN retention policy WHEN checking knowledge retention THEN be 180 days."""
-        assert RetentionPolicy.KNOWLEDGE_RETENTION_DAYS == 180
+        assert KNOWLEDGE_RETENTION_DAYS == 180
 
     def test_constraint_retention_days(self):
         """GIVEN retention policy WHEN checking constraint retention THEN be 90 days."""
-        assert RetentionPolicy.CONSTRAINT_RETENTION_DAYS == 90
+        assert CONSTRAINT_RETENTION_DAYS == 90
 
     def test_review_retention_days(self):
         """GIVEN retention policy WHEN checking review retention THEN be 365 days."""
-        assert RetentionPolicy.REVIEW_RETENTION_DAYS == 365
+        assert REVIEW_RETENTION_DAYS == 365
 
     def test_failed_task_retention_days(self):
         """GIVEN retention policy WHEN checking failed task retention THEN be 30 days."""
-        assert RetentionPolicy.FAILED_TASK_RETENTION_DAYS == 30
+        assert FAILED_TASK_RETENTION_DAYS == 30
+
+
+class TestCutoffIso:
+    """Test retention cutoff timestamp formatting."""
+
+    def test_cutoff_is_fixed_format_utc(self):
+        """GIVEN a reference time WHEN computing a cutoff THEN return a Z-suffixed UTC timestamp."""
+        now = datetime(2025, 7, 1, 12, 30, 45, 123456, tzinfo=UTC)
+
+        assert _cutoff_iso(30, now) == "2025-06-01T12:30:45Z"
+
+
+class TestUtcIsoNow:
+    """Test the per-second cached export timestamp."""
+
+    def test_formats_and_caches_per_second(self):
+        """GIVEN calls within one second WHEN formatting THEN reuse the cached string."""
+        with (
+            patch(
+                "utils.data_governance.time.time",
+                side_effect=[1751373045.1, 1751373045.9, 1751373046.0],
+            ),
+            patch("utils.data_governance.time.strftime", wraps=time.strftime) as strftime,
+        ):
+            first = _utc_iso_now()
+            second = _utc_iso_now()
+            third = _utc_iso_now()
+
+        assert first == second == "2025-07-01T12:30:45Z"
+        assert third == "2025-07-01T12:30:46Z"
+        assert strftime.call_count == 2
 
 
 class TestCleanupExpiredKnowledge:
@@ -100,7 +167,7 @@ class TestCleanupExpiredKnowledge:
         """GIVEN successful cleanup WHEN calling function THEN return result dict."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.delete.return_value.lt.return_value.execute.return_value = MagicMock(
-            data=[{"id": 1}, {"id": 2}]
+            data=[], count=2
         )
 
         result = cleanup_expired_knowledge(mock_supabase, retention_days=180)
@@ -108,12 +175,15 @@ class TestCleanupExpiredKnowledge:
         assert result["status"] == "success"
         assert result["deleted_count"] == 2
         assert result["retention_days"] == 180
+        mock_supabase.table.return_value.delete.assert_called_once_with(
+            count="exact", returning="minimal"
+        )
 
     def test_cleanup_with_repo_id(self):
         """GIVEN repo_id specified WHEN cleaning up THEN apply repo filter."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.delete.return_value.lt.return_value.eq.return_value.execute.return_value = MagicMock(
-            data=[]
+            data=[], count=0
         )
 
         cleanup_expired_knowledge(mock_supabase, repo_id="octocat/test-repo")
@@ -124,11 +194,28 @@ class TestCleanupExpiredKnowledge:
     def test_cleanup_failure_raises_error(self):
         """GIVEN Supabase error WHEN cleaning up THEN raise DataRetentionError."""
         mock_supabase = Mock()
-        mock_supabase.table.side_effect = Exception("Database error")
+        mock_supabase.table.side_effect = APIError({"message": "Database error"})
 
         with pytest.raises(DataRetentionError):
             cleanup_expired_knowledge(mock_supabase)
 
+    def test_cleanup_transport_error_raises_retention_error(self):
+        """GIVEN a network timeout WHEN cleaning up THEN raise DataRetentionError."""
+        mock_supabase = Mock()
+        mock_supabase.table.side_effect = httpx.ReadTimeout("timed out")
+
+        with pytest.raises(DataRetentionError, match="timed out"):
+            cleanup_expired_knowledge(mock_supabase)
+
+    def test_cleanup_invalid_repo_raises_isolation_error(self):
+        """GIVEN an invalid repo_id WHEN cleaning up THEN raise DataIsolationError without querying."""
+        mock_supabase = Mock()
+
+        with pytest.raises(DataIsolationError):
+            cleanup_expired_knowledge(mock_supabase, repo_id="invalid-no-slash")
+
+        mock_supabase.table.assert_not_called()
+
 
 class TestCleanupExpiredConstraints:
     """Test learned constraints cleanup functionality."""
@@ -137,7 +224,7 @@ class TestCleanupExpiredConstraints:
         """GIVEN successful cleanup WHEN calling function THEN return result dict."""
         mock_supabase = Mock()
         mock_supabase.table.return_value.delete.return_value.lt.return_value.execute.return_value = MagicMock(
-            data=[{"id": 1}]
+            data=[], count=1
         )
 
         result = cleanup_expired_constraints(mock_supabase, retention_days=90)
@@ -147,6 +234,48 @@ class TestCleanupExpiredConstraints:
         assert result["retention_days"] == 90
 
 
+class TestCleanupExpiredBatch:
+    """Test multi-repository cleanup with a shared cutoff."""
+
+    def test_cleanup_uses_precomputed_cutoff(self):
+        """GIVEN a cutoff_iso WHEN cleaning up THEN filter on it unchanged."""
+        mock_supabase = Mock()
+        mock_supabase.table.return_value.delete.return_value.lt.return_value.execute.return_value = MagicMock(
+            data=[], count=0
+        )
+
+        cleanup_expired_knowledge(mock_supabase, cutoff_iso="2024-01-01T00:00:00")
+
+        mock_supabase.table.return_value.delete.return_value.lt.assert_called_once_with(
+            "created_at", "2024-01-01T00:00:00"
+        )
+
+    def test_knowledge_batch_uses_single_in_filter(self):
+        """GIVEN several repo_ids WHEN batch cleaning knowledge THEN issue one IN-scoped delete."""
+        mock_supabase = Mock()
+        in_filter = mock_supabase.table.return_value.delete.return_value.lt.return_value.in_
+        in_filter.return_value.execute.return_value = MagicMock(data=[], count=2)
+
+        result = cleanup_expired_knowledge_batch(
+            mock_supabase, ["octocat/a", "octocat%2Fb"], "2024-01-01T00:00:00"
+        )
+
+        in_filter.assert_called_once_with("repo_id", ["octocat/a", "octocat/b"])
+        assert result["deleted_count"] == 2
+        assert result["repo_ids"] == ["octocat/a", "octocat/b"]
+
+    def test_constraints_batch_invalid_repo_raises_error(self):
+        """GIVEN an invalid repo_id in the batch WHEN cleaning up THEN raise DataIsolationError."""
+        mock_supabase = Mock()
+
+        with pytest.raises(DataIsolationError):
+            cleanup_expired_constraints_batch(
+                mock_supabase, ["octocat/a", "invalid-repo"], "2024-01-01T00:00:00"
+            )
+
+        mock_supabase.table.assert_not_called()
+
+
 class TestCleanupAllExpiredData:
     """Test combined cleanup functionality."""
 
@@ -158,14 +287,51 @@ class TestCleanupAllExpiredData:
         pass
 
 
+class TestCleanupAllExpiredDataBulk:
+    """Test bulk cleanup across many repositories."""
+
+    @pytest.mark.parametrize("repo_ids", [None, ["octocat/test-repo"]])
+    def test_bulk_cleanup_without_supabase_is_skipped(self, repo_ids):
+        """GIVEN Supabase disabled WHEN bulk cleaning THEN skip without querying."""
+        result = cleanup_all_expired_data_bulk(None, repo_ids)
+
+        assert result["status"] == "skipped"
+        assert result["total_deleted"] == 0
+
+    def test_bulk_cleanup_chunks_repo_ids(self):
+        """GIVEN more repos than one chunk holds WHEN bulk cleaning THEN issue two deletes per chunk."""
+        mock_supabase = Mock()
+        in_filter = mock_supabase.table.return_value.delete.return_value.lt.return_value.in_
+        in_filter.return_value.execute.return_value = MagicMock(data=[], count=1)
+        repo_ids = [f"octocat/repo-{i}" for i in range(501)]
+
+        result = cleanup_all_expired_data_bulk(mock_supabase, repo_ids)
+
+        assert result["status"] == "success"
+        assert in_filter.call_count == 4
+        assert len(in_filter.call_args_list[0].args[1]) == 500
+        assert in_filter.call_args_list[-1].args[1] == ["octocat/repo-500"]
+        assert result["total_deleted"] == 4
+
+    def test_bulk_cleanup_reports_errors(self):
+        """GIVEN a Supabase error WHEN bulk cleaning THEN return an error result."""
+        mock_supabase = Mock()
+        mock_supabase.table.side_effect = Exception("Database error")
+
+        result = cleanup_all_expired_data_bulk(mock_supabase, ["octocat/test-repo"])
+
+        assert result["status"] == "error"
+        assert "Database error" in result["error"]
+
+
 class TestDeleteAllRepoData:
     """Test right-to-forget (GDPR-style) deletion."""
 
     def test_delete_all_repo_data_success(self):
         """GIVEN valid repo_id WHEN deleting all data THEN return success result."""
         mock_supabase = Mock()
-        mock_supabase.table.return_value.delete.return_value.eq.return_value.execute.return_value = MagicMock(
-            data=[{"id": 1}, {"id": 2}]
+        mock_supabase.rpc.return_value.execute.return_value = MagicMock(
+            data={"knowledge_deleted": 2, "constraints_deleted": 3}
         )
 
         result = delete_all_repo_data(mock_supabase, "octocat/test-repo")
@@ -173,7 +339,29 @@ class TestDeleteAllRepoData:
         assert result["status"] == "success"
         assert result["repo_id"] == "octocat/test-repo"
         assert result["knowledge_deleted"] == 2
-        assert result["constraints_deleted"] == 2
+        assert result["constraints_deleted"] == 3
+        mock_supabase.rpc.assert_called_once_with(
+            "delete_repo_data",
+            {"p_repo_id": "octocat/test-repo", "p_batch_size": RIGHT_TO_FORGET_BATCH_SIZE},
+        )
+        mock_supabase.table.assert_not_called()
+
+    def test_delete_all_repo_data_loops_over_batches(self):
+        """GIVEN more rows than one batch WHEN deleting all data THEN repeat until a partial batch."""
+        mock_supabase = Mock()
+        mock_supabase.rpc.return_value.execute.side_effect = [
+            MagicMock(
+                data={"knowledge_deleted": RIGHT_TO_FORGET_BATCH_SIZE, "constraints_deleted": 10}
+            ),
+            MagicMock(data={"knowledge_deleted": 5, "constraints_deleted": 0}),
+        ]
+
+        result = delete_all_repo_data(mock_supabase, "octocat/test-repo")
+
+        assert result["status"] == "success"
+        assert result["knowledge_deleted"] == RIGHT_TO_FORGET_BATCH_SIZE + 5
+        assert result["constraints_deleted"] == 10
+        assert mock_supabase.rpc.call_count == 2
 
     def test_delete_all_invalid_repo_raises_error(self):
         """GIVEN invalid repo_id WHEN deleting all data THEN raise DataIsolationError."""
@@ -186,6 +374,14 @@ class TestDeleteAllRepoData:
 class TestLogDataAccess:
     """Test audit logging functionality."""
 
+    @pytest.fixture(autouse=True)
+    def _no_background_flusher(self):
+        """Keep flushing deterministic by never starting the background thread."""
+        with patch("utils.data_governance._ensure_audit_flusher"):
+            flush_audit_log()
+            yield
+            flush_audit_log()
+
     def test_log_data_access_logs_entry(self):
         """GIVEN data access WHEN logging THEN create audit log entry."""
         with patch("utils.data_governance.logger") as mock_logger:
@@ -197,8 +393,91 @@ class TestLogDataAccess:
                 user_id="user123",
             )
 
-            # Verify log was called
+            # Records are buffered until flushed
+            mock_logger.bind.assert_not_called()
+            assert flush_audit_log() == 1
+
+            # Verify one structured entry with the access as bound fields
             mock_logger.bind.assert_called_once()
+            fields = mock_logger.bind.call_args.kwargs
+            assert fields["audit"] == "data_access"
+            assert fields["action"] == "read"
+            assert fields["repo_id"] == "octocat/test-repo"
+            assert fields["user_id"] == "user123"
+            assert fields["record_id"] == 123
+            assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", fields["timestamp"])
+            mock_logger.bind.return_value.info.assert_called_once_with("Data access logged")
+
+    def test_metadata_copied_when_logged(self):
+        """GIVEN logged metadata WHEN the caller mutates it THEN the audit record is unchanged."""
+        metadata = {"rows": 1}
+        with patch("utils.data_governance.logger") as mock_logger:
+            log_data_access("read", "octocat/test-repo", "knowledge_base", metadata=metadata)
+            metadata["rows"] = 2
+            flush_audit_log()
+
+        assert mock_logger.bind.call_args.kwargs["metadata"] == {"rows": 1}
+
+    def test_flush_emits_one_entry_per_record(self):
+        """GIVEN several accesses WHEN flushing THEN emit one log entry for each."""
+        with patch("utils.data_governance.logger") as mock_logger:
+            for record_id in range(3):
+                log_data_access("read", "octocat/test-repo", "knowledge_base", record_id)
+
+            assert flush_audit_log() == 3
+            assert flush_audit_log() == 0
+
+            assert [c.kwargs["record_id"] for c in mock_logger.bind.call_args_list] == [0, 1, 2]
+
+    def test_buffered_records_share_interned_strings(self):
+        """GIVEN repeated accesses to one repo WHEN buffering THEN records share the interned repo_id."""
+        repo_ids = ["".join(["octocat/", "test-repo"]) for _ in range(2)]
+        assert repo_ids[0] is not repo_ids[1]
+
+        for repo_id in repo_ids:
+            log_data_access("read", repo_id, "knowledge_base")
+
+        first, second = _audit_queue
+        assert first[2] is second[2]
+
+    def test_record_appended_during_flush_is_kept(self):
+        """GIVEN a record appended while a flush drains WHEN flushing again THEN it is emitted."""
+
+        class AppendDuringDrain(deque):
+            late_append = True
+
+            def popleft(self):
+                if self.late_append:
+                    # Simulate another thread logging mid-drain (once)
+                    self.late_append = False
+                    log_data_access("write", "octocat/test-repo", "knowledge_base", 99)
+                return super().popleft()
+
+        queue = AppendDuringDrain()
+        with (
+            patch("utils.data_governance._audit_queue", queue),
+            patch("utils.data_governance.logger") as mock_logger,
+        ):
+            log_data_access("read", "octocat/test-repo", "knowledge_base", 1)
+            log_data_access("read", "octocat/test-repo", "knowledge_base", 2)
+
+            assert flush_audit_log() == 2
+            assert flush_audit_log() == 1
+            assert mock_logger.bind.call_args.kwargs["record_id"] == 99
+
+    def test_overflow_is_reported(self):
+        """GIVEN more pending records than the cap WHEN flushing THEN warn how many were dropped."""
+        with (
+            patch("utils.data_governance._audit_queue", deque(maxlen=2)),
+            patch("utils.data_governance.AUDIT_LOG_MAX_PENDING", 2),
+            patch("utils.data_governance.logger") as mock_logger,
+        ):
+            for record_id in range(5):
+                log_data_access("read", "octocat/test-repo", "knowledge_base", record_id)
+
+            assert flush_audit_log() == 2
+            assert "Dropped 3 audit records" in mock_logger.warning.call_args.args[0]
+            assert [c.kwargs["record_id"] for c in mock_logger.bind.call_args_list] == [3, 4]
 
 
 class TestExportRepoData:
@@ -246,27 +525,69 @@ class TestExportRepoData:
         assert result["repo_id"] == "octocat/test-repo"
 
 
+def _paged_query(pages):
+    """Build a chainable query mock whose execute() returns the given pages in turn."""
+    query = MagicMock()
+    for method in ("select", "eq", "gt", "order", "limit"):
+        getattr(query, method).return_value = query
+    query.execute.side_effect = [MagicMock(data=page) for page in pages]
+    return query
+
+
+class TestExportRepoDataStream:
+    """Test streaming JSONL export."""
+
+    def test_stream_pages_by_id(self):
+        """GIVEN more rows than one page WHEN streaming THEN page with id keyset and write JSONL."""
+        kb_query = _paged_query([[{"id": 1}, {"id": 2}], [{"id": 3}]])
+        lc_query = _paged_query([[]])
+        mock_supabase = Mock()
+        mock_supabase.table.side_effect = lambda name: (
+            kb_query if name == "knowledge_base" else lc_query
+        )
+        sink = io.BytesIO()
+
+        counts = export_repo_data_stream(mock_supabase, "octocat/test-repo", sink, page_size=2)
+
+        assert counts == {"knowledge_base": 3, "learned_constraints": 0}
+        kb_query.gt.assert_called_once_with("id", 2)
+        kb_query.select.assert_called_with("id, repo_id, content, metadata, created_at")
+        lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+        assert lines[0] == {"table": "knowledge_base", "record": {"id": 1}}
+        assert len(lines) == 3
+
+    def test_stream_invalid_repo_raises_error(self):
+        """GIVEN invalid repo_id WHEN streaming THEN raise DataIsolationError."""
+        with pytest.raises(DataIsolationError):
+            export_repo_data_stream(Mock(), "invalid-repo", io.BytesIO())
+
+
 class TestVerifyRepoAccess:
     """Test repository access verification."""
 
     def test_verify_access_returns_true(self):
         """GIVEN record belongs to repo WHEN verifying access THEN return True."""
         mock_supabase = Mock()
-        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(
-            data=[{"id": 1, "repo_id": "octocat/test-repo"}]
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(
+            data=[{"id": 1}]
         )
 
         result = verify_repo_access(mock_supabase, "octocat/test-repo", "knowledge_base", 1)
 
         assert result is True
+        mock_supabase.table.return_value.select.assert_called_once_with("id")
 
     def test_verify_access_returns_false(self):
         """GIVEN record does not belong to repo WHEN verifying access THEN return False."""
         mock_supabase = Mock()
-        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = MagicMock(
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.limit.return_value.execute.return_value = MagicMock(
             data=[]  # No matching records
         )
 
         result = verify_repo_access(mock_supabase, "octocat/test-repo", "knowledge_base", 999)
 
         assert result is False
+
+    def test_verify_access_without_supabase_returns_false(self):
+        """GIVEN Supabase disabled WHEN verifying access THEN return False without validating."""
+        assert verify_repo_access(None, "not-a-repo-id", "knowledge_base", 1) is False
@@ -5,12 +5,22 @@ Tests the fallback level system, health status tracking, and
 graceful degradation decorators for Supabase, Redis, and LLM failures.
 """
 
-from unittest.mock import patch
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
 
 from utils.degradation import (
     FallbackContext,
     FallbackLevel,
     HealthStatus,
+    check_redis_health,
+    check_supabase_health,
+    force_recheck,
+    get_fallback_level,
+    get_feature_flags,
     get_health_status,
     is_rag_enabled,
     is_rlhf_enabled,
@@ -20,6 +30,17 @@ from utils.degradation import (
 )
 
 
+@pytest.fixture(autouse=True)
+def healthy_services():
+    """Start every test with all services healthy and no pending probe gates."""
+    status = get_health_status()
+    status.mask = HealthStatus().mask
+    force_recheck()
+    yield status
+    status.mask = HealthStatus().mask
+    force_recheck()
+
+
 class TestFallbackLevel:
     """Test FallbackLevel enum values."""
 
@@ -67,6 +88,15 @@ class TestHealthStatus:
         status.set_llm_health(True)
         assert status.llm_healthy is True
 
+    def test_unchanged_health_keeps_last_check(self):
+        """GIVEN a healthy service WHEN reporting it healthy again THEN last_check is untouched."""
+        status = HealthStatus()
+        status.last_check = 0.0
+        status.set_supabase_health(True)
+        assert status.last_check == 0.0
+        status.set_supabase_health(False)
+        assert status.last_check > 0.0
+
     def test_get_fallback_level_full(self):
         """GIVEN all services healthy WHEN getting fallback level THEN return FULL."""
         status = HealthStatus()
@@ -91,6 +121,25 @@ class TestHealthStatus:
         status.set_supabase_health(False)
         assert status.get_fallback_level() == FallbackLevel.DEGRADED_BOTH
 
+    @pytest.mark.parametrize(
+        ("llm", "supabase", "redis", "expected"),
+        [
+            (True, True, True, FallbackLevel.FULL),
+            (True, True, False, FallbackLevel.DEGRADED_RAG),
+            (True, False, True, FallbackLevel.DEGRADED_BOTH),
+            (True, False, False, FallbackLevel.MINIMAL),
+            (False, True, True, FallbackLevel.EMERGENCY),
+            (False, False, False, FallbackLevel.EMERGENCY),
+        ],
+    )
+    def test_get_fallback_level_for_health_combination(self, llm, supabase, redis, expected):
+        """GIVEN a combination of service health WHEN getting fallback level THEN map it from the mask."""
+        status = HealthStatus()
+        status.llm_healthy = llm
+        status.supabase_healthy = supabase
+        status.redis_healthy = redis
+        assert status.get_fallback_level() == expected
+
 
 class TestSupabaseFallback:
     """Test Supabase connection fallback decorator."""
@@ -127,6 +176,23 @@ class TestSupabaseFallback:
         result = query_data()
         assert result == {"error": "degraded"}
 
+    def test_supabase_fallback_short_circuits_while_down(self):
+        """GIVEN a recent Supabase failure WHEN calling again THEN return fallback without calling."""
+        calls = []
+
+        @with_supabase_fallback(fallback_return=[])
+        def query_data():
+            calls.append(1)
+            raise Exception("Connection failed")
+
+        query_data()
+        assert query_data() == []
+        assert len(calls) == 1
+
+        force_recheck("supabase")
+        query_data()
+        assert len(calls) == 2
+
 
 class TestRedisFallback:
     """Test Redis connection fallback decorator."""
@@ -153,6 +219,22 @@ class TestRedisFallback:
         assert result is None
         assert get_health_status().redis_healthy is False
 
+    def test_redis_fallback_retries_after_interval(self, healthy_services):
+        """GIVEN Redis marked down WHEN the check interval has passed THEN call through and recover."""
+        status = healthy_services
+
+        @with_redis_fallback(fallback_return=None)
+        def get_cached():
+            return {"cached": "value"}
+
+        status.set_redis_health(False)
+        status.last_probe["redis"] = time.time()
+        assert get_cached() is None
+
+        status.last_probe["redis"] = time.time() - status.check_interval
+        assert get_cached() == {"cached": "value"}
+        assert status.redis_healthy is True
+
 
 class TestLLMFallback:
     """Test LLM connection fallback decorator."""
@@ -179,6 +261,122 @@ class TestLLMFallback:
         assert result == ""
         assert get_health_status().llm_healthy is False
 
+    def test_llm_fallback_retries_retryable_errors(self):
+        """GIVEN a retryable error WHEN calling decorated function THEN retry with bounded backoff."""
+        calls = []
+
+        @with_llm_fallback(fallback_return="", max_retries=2, backoff_base=1.0, backoff_cap=2.0)
+        def generate_review():
+            calls.append(1)
+            if len(calls) < 3:
+                raise TimeoutError("timed out")
+            return "Review comment"
+
+        with patch("utils.degradation.time.sleep") as mock_sleep:
+            result = generate_review()
+
+        assert result == "Review comment"
+        assert mock_sleep.call_count == 2
+        assert all(1.0 <= call.args[0] <= 2.0 for call in mock_sleep.call_args_list)
+
+    @pytest.mark.parametrize(
+        "error",
+        [requests.Timeout("read timed out"), httpx.ConnectError("connection refused")],
+    )
+    def test_llm_fallback_retries_client_transport_errors(self, error):
+        """GIVEN a requests/httpx transport error WHEN calling decorated function THEN retry it."""
+        calls = []
+
+        @with_llm_fallback(fallback_return="", max_retries=1)
+        def generate_review():
+            calls.append(1)
+            if len(calls) < 2:
+                raise error
+            return "Review comment"
+
+        with patch("utils.degradation.time.sleep"):
+            result = generate_review()
+
+        assert result == "Review comment"
+        assert len(calls) == 2
+
+    def test_llm_fallback_does_not_retry_other_errors(self):
+        """GIVEN a non-retryable error WHEN calling decorated function THEN fall back immediately."""
+        calls = []
+
+        @with_llm_fallback(fallback_return="", max_retries=2)
+        def generate_review():
+            calls.append(1)
+            raise PermissionError("invalid API key")
+
+        with patch("utils.degradation.time.sleep") as mock_sleep:
+            result = generate_review()
+
+        assert result == ""
+        assert len(calls) == 1
+        mock_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_llm_fallback_async_awaits_backoff(self):
+        """GIVEN a coroutine function WHEN decorating THEN retry with asyncio.sleep."""
+
+        @with_llm_fallback(fallback_return="", max_retries=1)
+        async def generate_review():
+            raise ConnectionError("connection reset")
+
+        with patch("utils.degradation.asyncio.sleep") as mock_sleep:
+            result = await generate_review()
+
+        assert result == ""
+        mock_sleep.assert_awaited_once()
+        assert get_health_status().llm_healthy is False
+
+
+class TestHealthChecks:
+    """Test interval-gated health probes."""
+
+    @pytest.mark.asyncio
+    async def test_supabase_check_uses_cached_result_within_interval(self):
+        """GIVEN a recent health check WHEN checking Supabase THEN return cached health without probing."""
+        status = get_health_status()
+        status.set_supabase_health(True)
+        status.last_probe["supabase"] = time.time()
+        mock_supabase = MagicMock()
+
+        assert await check_supabase_health(mock_supabase) is True
+        mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_supabase_check_probes_when_forced(self):
+        """GIVEN a failing Supabase WHEN forcing a health check THEN probe and mark unhealthy."""
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value.select.return_value.limit.return_value.execute.side_effect = ConnectionError(
+            "down"
+        )
+
+        assert await check_supabase_health(mock_supabase, force=True) is False
+        assert get_health_status().supabase_healthy is False
+        get_health_status().set_supabase_health(True)
+
+    @pytest.mark.asyncio
+    async def test_redis_check_probes_after_interval(self):
+        """GIVEN the check interval elapsed WHEN checking Redis THEN send PING."""
+        status = get_health_status()
+        status.last_probe["redis"] = time.time() - status.check_interval
+        mock_redis = MagicMock()
+
+        assert await check_redis_health(mock_redis) is True
+        mock_redis.ping.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_supabase_probe_is_head_request(self):
+        """GIVEN a healthy Supabase WHEN probing THEN request headers only, for a single id."""
+        mock_supabase = MagicMock()
+
+        assert await check_supabase_health(mock_supabase, force=True) is True
+        mock_supabase.table.return_value.select.assert_called_once_with("id", head=True)
+        mock_supabase.table.return_value.select.return_value.limit.assert_called_once_with(1)
+
 
 class TestFallbackContext:
     """Test FallbackContext manager."""
@@ -188,10 +386,53 @@ class TestFallbackContext:
         with patch("utils.degradation.logger"), FallbackContext(FallbackLevel.DEGRADED_RAG):
             pass
 
+    def test_fallback_context_overrides_and_restores_level(self):
+        """GIVEN nested FallbackContexts WHEN exiting each THEN the previous level is restored."""
+        from utils.degradation import _health_status
+
+        _health_status.supabase_healthy = True
+        _health_status.redis_healthy = True
+        _health_status.llm_healthy = True
+
+        with FallbackContext(FallbackLevel.DEGRADED_RAG):
+            assert get_fallback_level() == FallbackLevel.DEGRADED_RAG
+            assert is_rag_enabled() is False
+            with FallbackContext(FallbackLevel.MINIMAL):
+                assert get_fallback_level() == FallbackLevel.MINIMAL
+                assert is_rlhf_enabled() is False
+            assert get_fallback_level() == FallbackLevel.DEGRADED_RAG
+            assert is_rlhf_enabled() is True
+
+        assert get_fallback_level() == FallbackLevel.FULL
+        assert is_rag_enabled() is True
+
 
 class TestUtilityFunctions:
     """Test utility functions."""
 
+    @pytest.mark.parametrize(
+        ("supabase", "redis", "expected"),
+        [
+            (True, True, (True, True, FallbackLevel.FULL)),
+            (True, False, (False, True, FallbackLevel.DEGRADED_RAG)),
+            (False, True, (False, False, FallbackLevel.DEGRADED_BOTH)),
+        ],
+    )
+    def test_get_feature_flags(self, healthy_services, supabase, redis, expected):
+        """GIVEN service health WHEN getting feature flags THEN match the individual checks."""
+        healthy_services.supabase_healthy = supabase
+        healthy_services.redis_healthy = redis
+
+        flags = get_feature_flags()
+
+        assert flags == expected
+        assert (flags.rag, flags.rlhf) == (is_rag_enabled(), is_rlhf_enabled())
+
+    def test_get_feature_flags_honours_fallback_context(self):
+        """GIVEN an active FallbackContext WHEN getting feature flags THEN use the override."""
+        with FallbackContext(FallbackLevel.DEGRADED_RLHF):
+            assert get_feature_flags() == (True, False, FallbackLevel.DEGRADED_RLHF)
+
     def test_is_rag_enabled_full(self):
         """GIVEN fallback level is FULL WHEN checking RAG THEN return True."""
         from utils.degradation import _health_status
@@ -231,3 +472,13 @@ class TestUtilityFunctions:
         _health_status.redis_healthy = True
         _health_status.llm_healthy = True
         assert is_rlhf_enabled() is False
+
+    def test_redis_down_keeps_rlhf_only(self):
+        """GIVEN fallback level is DEGRADED_RAG WHEN checking features THEN only RLHF is enabled."""
+        from utils.degradation import _health_status
+
+        _health_status.supabase_healthy = True
+        _health_status.redis_healthy = False
+        _health_status.llm_healthy = True
+        assert is_rag_enabled() is False
+        assert is_rlhf_enabled() is True
@@ -0,0 +1,107 @@
+"""
+Unit Tests for the Embedding Cache
+
+Tests content-addressed lookups, batched computation of misses and
+graceful degradation in utils.embedding_cache.
+"""
+
+from unittest.mock import MagicMock
+
+import redis
+
+from utils.embedding_cache import EmbeddingCache, cache_key, create_embedding_cache
+
+
+def _compute(calls):
+    def compute(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+    return compute
+
+
+class TestCacheKey:
+    """Test content addressing."""
+
+    def test_key_depends_on_model_and_text(self):
+        """GIVEN the same text WHEN keyed under different models THEN the keys differ."""
+        assert cache_key("m1", "abc") == cache_key("m1", "abc")
+        assert cache_key("m1", "abc") != cache_key("m2", "abc")
+        assert cache_key("m1", "abc") != cache_key("m1", "abd")
+
+
+class TestGetOrComputeMany:
+    """Test EmbeddingCache.get_or_compute_many()."""
+
+    def test_misses_computed_once_then_served_from_cache(self, store):
+        """GIVEN an empty cache WHEN embedding twice THEN compute only on the first call."""
+        client, _ = store
+        cache = EmbeddingCache(client, ttl_seconds=60)
+        calls = []
+
+        first = cache.get_or_compute_many(["ab", "abc"], "m", _compute(calls))
+        second = cache.get_or_compute_many(["abc", "ab"], "m", _compute(calls))
+
+        assert first == [[2.0, 0.5], [3.0, 0.5]]
+        assert second == [[3.0, 0.5], [2.0, 0.5]]
+        assert calls == [["ab", "abc"]]
+        assert client.pipeline.return_value.set.call_args.kwargs["ex"] == 60
+
+    def test_duplicate_inputs_computed_once(self, store):
+        """GIVEN repeated texts WHEN embedding THEN each distinct text is computed once."""
+        client, _ = store
+        calls = []
+
+        result = EmbeddingCache(client, 60).get_or_compute_many(
+            ["x", "yy", "x"], "m", _compute(calls)
+        )
+
+        assert calls == [["x", "yy"]]
+        assert result == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+
+    def test_only_misses_sent_to_compute(self, store):
+        """GIVEN one cached text WHEN embedding it with a new one THEN compute only the new one."""
+        client, _ = store
+        cache = EmbeddingCache(client, 60)
+        calls = []
+        cache.get_or_compute_many(["a"], "m", _compute(calls))
+
+        cache.get_or_compute_many(["a", "bb"], "m", _compute(calls))
+
+        assert calls == [["a"], ["bb"]]
+
+    def test_redis_error_falls_back_to_compute(self, store):
+        """GIVEN Redis is unreachable WHEN embedding THEN compute every input."""
+        client, _ = store
+        client.mget.side_effect = redis.ConnectionError("down")
+        calls = []
+
+        result = EmbeddingCache(client, 60).get_or_compute_many(["a", "bb"], "m", _compute(calls))
+
+        assert result == [[1.0, 0.5], [2.0, 0.5]]
+        assert calls == [["a", "bb"]]
+
+    def test_write_failure_still_returns_embeddings(self, store):
+        """GIVEN the write-back fails WHEN embedding THEN the computed vectors are returned."""
+        client, _ = store
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+
+        result = EmbeddingCache(client, 60).get_or_compute_many(["a"], "m", _compute([]))
+
+        assert result == [[1.0, 0.5]]
+
+
+class TestCreateEmbeddingCache:
+    """Test the configuration factory."""
+
+    def test_zero_ttl_disables_cache(self):
+        """GIVEN EMBEDDING_CACHE_TTL=0 WHEN creating the cache THEN return None."""
+        config = MagicMock(EMBEDDING_CACHE_TTL=0)
+
+        assert create_embedding_cache(config) is None
+
+    def test_non_redis_broker_disables_cache(self):
+        """GIVEN a non-Redis broker URL WHEN creating the cache THEN return None."""
+        config = MagicMock(EMBEDDING_CACHE_TTL=60, CELERY_BROKER_URL="amqp://guest@rabbit//")
+
+        assert create_embedding_cache(config) is None
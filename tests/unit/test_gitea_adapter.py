@@ -273,7 +273,7 @@ class TestGiteaAdapterGetDiff:
     from Gitea API.
     """
 
-    @patch("adapters.gitea.requests.get")
+    @patch("adapters.gitea.requests.Session.get")
     def test_get_diff_successful(self, mock_get):
         """
         GIVEN a valid metadata
@@ -311,7 +311,7 @@ class TestGiteaAdapterGetDiff:
         assert "gitea.example.com" in call_args[0][0]
         assert metadata.head_sha in call_args[0][0]
 
-    @patch("adapters.gitea.requests.get")
+    @patch("adapters.gitea.requests.Session.get")
     def test_get_diff_api_error(self, mock_get):
         """
         GIVEN a metadata that causes API error
@@ -342,6 +342,53 @@ class TestGiteaAdapterGetDiff:
         with pytest.raises(Exception):
             adapter.get_diff(metadata)
 
+    def test_get_diff_reuses_session(self):
+        """
+        GIVEN one adapter instance
+        WHEN fetching diffs repeatedly
+        THEN every request goes through the same HTTP session
+        """
+        adapter = GiteaAdapter(host="gitea.example.com:3000", token="test_token")
+        adapter.session = MagicMock()
+        adapter.session.get.return_value = MagicMock(status_code=200, text="diff --git a/f b/f")
+        metadata = PRMetadata(
+            repo_id="octocat/test-repo",
+            pr_number=1,
+            base_sha="a" * 40,
+            head_sha="b" * 40,
+            platform="gitea",
+        )
+
+        adapter.get_diff(metadata)
+        adapter.get_diff(metadata)
+
+        assert adapter.session.get.call_count == 2
+
+    def test_get_diff_blocks_keep_header(self):
+        """
+        GIVEN a multi-file diff
+        WHEN splitting it into blocks
+        THEN each block starts with its own "diff --git" header
+        """
+        adapter = GiteaAdapter(host="gitea.example.com:3000", token="test_token")
+        adapter.session = MagicMock()
+        adapter.session.get.return_value = MagicMock(
+            status_code=200,
+            text="diff --git a/a.py b/a.py\n+x\ndiff --git a/b.py b/b.py\n+y\n",
+        )
+        metadata = PRMetadata(
+            repo_id="octocat/test-repo",
+            pr_number=1,
+            base_sha="a" * 40,
+            head_sha="b" * 40,
+            platform="gitea",
+        )
+
+        assert adapter.get_diff(metadata) == [
+            "diff --git a/a.py b/a.py\n+x\n",
+            "diff --git a/b.py b/b.py\n+y",
+        ]
+
 
 class TestGiteaAdapterVerifySignature:
     """
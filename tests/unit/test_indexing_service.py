@@ -700,6 +700,51 @@ class TestIndexingServiceProgressTracking:
             ), f"Stage '{stage}' should be valid"
 
 
+class TestIndexingServiceMetrics:
+    """Test IndexingService counter updates during a run."""
+
+    @patch("services.indexing.OpenAI")
+    def test_counters_flushed_while_indexing(self, mock_openai, tmp_path, mock_supabase_client):
+        """
+        GIVEN a repository with more files than METRICS_FLUSH_FILES
+        WHEN indexing
+        THEN file and chunk counters advance before the run completes
+        """
+        from services.indexing import IndexingService
+        from utils.metrics import indexing_chunks_embedded_total, indexing_files_processed_total
+
+        files = []
+        for i in range(IndexingService.METRICS_FLUSH_FILES + 5):
+            path = tmp_path / f"module_{i}.py"
+            path.write_text(f"x = {i}\n")
+            files.append(str(path))
+        repo_id = "octocat/live-metrics"
+        processed = indexing_files_processed_total.labels(repo_id=repo_id)
+        chunks = indexing_chunks_embedded_total.labels(repo_id=repo_id)
+        initial = processed._value.get(), chunks._value.get()
+        seen = []
+
+        def on_progress(progress):
+            if progress.stage == "chunking":
+                seen.append((processed._value.get() - initial[0], chunks._value.get() - initial[1]))
+
+        service = IndexingService(mock_supabase_client, MagicMock())
+        with (
+            patch.object(service, "_clone_repository", return_value=str(tmp_path)),
+            patch.object(service, "_scan_files", return_value=files),
+            patch.object(service, "_generate_embedding", return_value=[0.1] * 1536),
+        ):
+            service.index_repository(
+                repo_id, "https://example.com/r.git", "token", progress_callback=on_progress
+            )
+
+        flush_at = IndexingService.METRICS_FLUSH_FILES
+        assert seen[flush_at - 1] == (0, 0)
+        assert seen[flush_at] == (flush_at, flush_at)
+        assert processed._value.get() - initial[0] == len(files)
+        assert chunks._value.get() - initial[1] == len(files)
+
+
 # =============================================================================
 # Fixtures
 # =============================================================================
@@ -182,6 +182,39 @@ class TestKnowledgeRepositorySearchContext:
         params_dict = call_args[0][1] if len(call_args[0]) > 1 else call_args[1]
         assert "query_embedding" in params_dict, "RPC call should include query_embedding"
 
+    @patch("repositories.knowledge.KnowledgeRepository._generate_embedding")
+    def test_search_context_uses_precomputed_embedding(
+        self, mock_get_embedding, mock_supabase_client
+    ):
+        """
+        GIVEN a precomputed query embedding
+        WHEN calling search_context()
+        THEN it is sent to match_knowledge without embedding query_text again
+        """
+        # Arrange
+        from repositories.knowledge import KnowledgeRepository
+
+        mock_supabase_client.rpc.return_value.execute.return_value.data = []
+        mock_config = MagicMock()
+        mock_config.effective_llm_api_key = "test"
+        mock_config.effective_llm_base_url = "http://test"
+
+        repo = KnowledgeRepository(supabase=mock_supabase_client, config=mock_config)
+
+        # Act
+        repo.search_context(
+            query_text="sample code",
+            repo_id="octocat/test-repo",
+            match_threshold=0.75,
+            match_count=3,
+            query_embedding=[0.5] * 1536,
+        )
+
+        # Assert
+        mock_get_embedding.assert_not_called()
+        params_dict = mock_supabase_client.rpc.call_args[0][1]
+        assert params_dict["query_embedding"] == [0.5] * 1536
+
     @patch("repositories.knowledge.KnowledgeRepository._generate_embedding")
     def test_search_context_passes_match_threshold_and_count(
         self, mock_get_embedding, mock_supabase_client
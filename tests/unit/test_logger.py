@@ -0,0 +1,297 @@
+"""
+Unit Tests for Logging Configuration
+
+Tests the batched file sink used for structured JSON log files and the
+stdlib-to-loguru InterceptHandler, setup_logging() idempotency and the
+structured JSON formatter.
+"""
+
+import logging
+import os
+import time
+import zipfile
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import orjson
+import pytest
+from loguru import logger
+
+from utils.logger import (
+    BatchedFileSink,
+    InterceptHandler,
+    setup_logging,
+    stop_logging,
+    structured_formatter,
+)
+
+
+class TestBatchedFileSink:
+    """Test BatchedFileSink writes, flushing and rotation."""
+
+    def test_records_flushed_on_stop(self, tmp_path):
+        """GIVEN queued records WHEN the sink is stopped THEN all lines are appended in order."""
+        sink = BatchedFileSink(str(tmp_path / "app.log"))
+        for i in range(1000):
+            sink.write(f"line {i}\n")
+        sink.stop()
+
+        lines = (tmp_path / "app.log").read_text().splitlines()
+        assert lines == [f"line {i}" for i in range(1000)]
+
+    def test_records_within_flush_interval_share_one_write(self, tmp_path, monkeypatch):
+        """GIVEN records arriving within the flush interval WHEN drained THEN write them at once."""
+        # A frozen clock keeps the writer inside the interval however slowly records arrive
+        monkeypatch.setattr("utils.logger.time.monotonic", lambda: 0.0)
+        sink = BatchedFileSink(str(tmp_path / "app.log"), flush_interval=60.0)
+        with patch("utils.logger.os.write", wraps=os.write) as write:
+            for i in range(3):
+                sink.write(f"line {i}\n")
+                time.sleep(0.01)
+            sink.stop()
+
+        assert [c.args[1] for c in write.call_args_list] == [b"line 0\nline 1\nline 2\n"]
+
+    def test_serialized_loguru_records(self, tmp_path):
+        """GIVEN a serialize=True handler WHEN logging THEN each line is a JSON record."""
+        handler_id = logger.add(BatchedFileSink(str(tmp_path / "app.log")), serialize=True)
+        logger.bind(trace_id="abc").info("hello")
+        logger.remove(handler_id)
+
+        record = orjson.loads((tmp_path / "app.log").read_bytes().splitlines()[0])
+        assert record["record"]["message"] == "hello"
+        assert record["record"]["extra"]["trace_id"] == "abc"
+
+    def test_rotates_and_compresses_when_size_exceeded(self, tmp_path):
+        """GIVEN a small rotation size WHEN it is exceeded THEN the file is zipped and restarted."""
+        sink = BatchedFileSink(str(tmp_path / "app.log"), rotation_bytes=64)
+        sink.write("x" * 100 + "\n")
+        sink.stop()
+
+        archives = list(tmp_path.glob("app.*.log.zip"))
+        assert len(archives) == 1
+        with zipfile.ZipFile(archives[0]) as archive:
+            assert archive.read(archive.namelist()[0]) == b"x" * 100 + b"\n"
+        assert (tmp_path / "app.log").read_bytes() == b""
+
+    def test_repeated_rotations_keep_every_record(self, tmp_path):
+        """GIVEN several rotations within one second WHEN stopped THEN no archive is overwritten."""
+        sink = BatchedFileSink(str(tmp_path / "app.log"), rotation_bytes=64, flush_interval=0)
+        for i in range(20):
+            sink.write(f"{i:02d}" + "x" * 70 + "\n")
+            time.sleep(0.005)
+        sink.stop()
+
+        lines = (tmp_path / "app.log").read_text().splitlines()
+        archives = list(tmp_path.glob("app.*.log.zip"))
+        for path in archives:
+            with zipfile.ZipFile(path) as archive:
+                lines += archive.read(archive.namelist()[0]).decode().splitlines()
+        assert len(archives) > 1
+        assert sorted(line[:2] for line in lines) == [f"{i:02d}" for i in range(20)]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+    def test_forked_writers_lose_nothing_across_rotation(self, tmp_path, monkeypatch):
+        """GIVEN forked children writing WHEN the parent rotates THEN every record is kept."""
+        monkeypatch.setattr("utils.logger.FILE_SINK_CHECK_INTERVAL_SEC", 0.01)
+        sink = BatchedFileSink(
+            str(tmp_path / "app.log"), rotation_bytes=2000, flush_interval=0, rotation_grace=0.5
+        )
+        children = []
+        for child in range(3):
+            pid = os.fork()
+            if pid == 0:
+                for i in range(300):
+                    sink.write(f"{child}-{i}\n")
+                    time.sleep(0.0005)
+                sink.stop()
+                os._exit(0)
+            children.append(pid)
+        for pid in children:
+            os.waitpid(pid, 0)
+        sink.stop()
+
+        lines = (tmp_path / "app.log").read_text().splitlines()
+        archives = list(tmp_path.glob("app.*.log.zip"))
+        for path in archives:
+            with zipfile.ZipFile(path) as archive:
+                lines += archive.read(archive.namelist()[0]).decode().splitlines()
+        assert len(archives) > 1
+        assert sorted(lines) == sorted(f"{c}-{i}" for c in range(3) for i in range(300))
+
+
+class TestInterceptHandler:
+    """Test stdlib records are forwarded to loguru with the right caller."""
+
+    @pytest.fixture
+    def records(self):
+        captured = []
+        handler_id = logger.add(lambda m: captured.append(m.record), level="DEBUG")
+        stdlib_logger = logging.getLogger("tests.intercept")
+        stdlib_logger.addHandler(InterceptHandler())
+        stdlib_logger.propagate = False
+        stdlib_logger.setLevel(logging.DEBUG)
+        yield stdlib_logger, captured
+        stdlib_logger.handlers.clear()
+        logger.remove(handler_id)
+
+    def test_level_call_uses_fixed_depth(self, records):
+        """GIVEN a Logger.warning() call WHEN intercepted THEN the caller function is reported."""
+        stdlib_logger, captured = records
+        stdlib_logger.warning("disk low")
+
+        assert captured[0]["level"].name == "WARNING"
+        assert captured[0]["function"] == "test_level_call_uses_fixed_depth"
+        assert captured[0]["message"] == "disk low"
+
+    def test_indirect_call_falls_back_to_frame_walk(self, records):
+        """GIVEN a Logger.exception() call WHEN intercepted THEN the frame walk finds the caller."""
+        stdlib_logger, captured = records
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            stdlib_logger.exception("failed")
+
+        assert captured[0]["level"].name == "ERROR"
+        assert captured[0]["function"] == "test_indirect_call_falls_back_to_frame_walk"
+        assert captured[0]["exception"] is not None
+
+    def test_custom_level_resolved_by_name(self, records, monkeypatch):
+        """GIVEN a stdlib level named like a loguru level WHEN intercepted THEN use the loguru level."""
+        monkeypatch.setitem(logging._levelToName, 25, "SUCCESS")
+        stdlib_logger, captured = records
+        stdlib_logger.log(25, "done")
+
+        assert captured[0]["level"].name == "SUCCESS"
+        assert captured[0]["function"] == "test_custom_level_resolved_by_name"
+        assert captured[0]["exception"] is None
+
+    def test_records_below_min_level_dropped(self, records, monkeypatch):
+        """GIVEN sinks configured at INFO WHEN a DEBUG record arrives THEN it is not forwarded."""
+        monkeypatch.setattr("utils.logger._min_level_no", logging.INFO)
+        stdlib_logger, captured = records
+        stdlib_logger.debug("noise")
+
+        assert captured == []
+
+
+class TestSetupLogging:
+    """Test setup_logging idempotency."""
+
+    @pytest.fixture
+    def mock_logger(self, monkeypatch):
+        monkeypatch.setattr("utils.logger._min_level_no", 0)
+        with (
+            patch("utils.logger.logger") as mock_logger,
+            patch("utils.logger.logging.basicConfig"),
+            patch("utils.logger.BatchedFileSink"),
+        ):
+            mock_logger.level.return_value.no = logging.DEBUG
+            yield mock_logger
+
+    def test_second_call_is_noop(self, mock_logger, monkeypatch):
+        """GIVEN logging already configured WHEN calling setup_logging again THEN change nothing."""
+        monkeypatch.setattr("utils.logger._configured", True)
+
+        setup_logging()
+
+        mock_logger.remove.assert_not_called()
+        mock_logger.add.assert_not_called()
+
+    def test_force_reconfigures(self, mock_logger, monkeypatch):
+        """GIVEN logging already configured WHEN forcing setup THEN sinks are reinstalled."""
+        monkeypatch.setattr("utils.logger._configured", True)
+        monkeypatch.setattr(logging, "_srcfile", logging._srcfile)
+
+        setup_logging(force=True)
+
+        mock_logger.remove.assert_called_once_with()
+        assert mock_logger.add.call_count == 3
+        assert logging._srcfile is None
+
+    def test_intercept_handler_reused_across_reconfiguration(self, mock_logger, monkeypatch):
+        """GIVEN repeated forced setups WHEN installing the root handler THEN reuse one InterceptHandler."""
+        monkeypatch.setattr(logging, "_srcfile", logging._srcfile)
+
+        with patch("utils.logger.logging.basicConfig") as basic_config:
+            setup_logging(force=True)
+            setup_logging(force=True)
+
+        first, second = (c.kwargs["handlers"] for c in basic_config.call_args_list)
+        assert first[0] is second[0]
+        assert isinstance(first[0], InterceptHandler)
+
+    def test_console_plain_when_not_a_tty(self, mock_logger, monkeypatch):
+        """GIVEN stdout is not a terminal WHEN setting up logging THEN the console sink is uncolored."""
+        monkeypatch.setattr("utils.logger._configured", False)
+        monkeypatch.setattr("sys.stdout.isatty", lambda: False)
+        monkeypatch.setattr(logging, "_srcfile", logging._srcfile)
+
+        setup_logging()
+
+        console = mock_logger.add.call_args_list[0].kwargs
+        assert console["colorize"] is False
+        assert "<white>" not in console["format"]
+
+    def test_file_sink_uses_configured_level(self, mock_logger, monkeypatch):
+        """GIVEN LOG_FILE_LEVEL=INFO WHEN setting up logging THEN app.log only takes INFO and above."""
+        monkeypatch.setattr("utils.logger._configured", False)
+        monkeypatch.setattr("utils.logger.LOG_FILE_LEVEL", "INFO")
+        monkeypatch.setattr(logging, "_srcfile", logging._srcfile)
+
+        setup_logging()
+
+        assert mock_logger.add.call_args_list[1].kwargs["level"] == "INFO"
+
+
+class TestStopLogging:
+    """Test third-party logger silencing."""
+
+    def test_noisy_stdlib_loggers_short_circuit_below_warning(self):
+        """GIVEN stop_logging() WHEN httpx logs at DEBUG THEN the stdlib drops it before building a record."""
+        httpx_logger = logging.getLogger("httpx")
+        previous = httpx_logger.level
+        try:
+            stop_logging()
+
+            assert not httpx_logger.isEnabledFor(logging.INFO)
+            assert httpx_logger.isEnabledFor(logging.WARNING)
+        finally:
+            httpx_logger.setLevel(previous)
+
+
+class TestStructuredFormatter:
+    """Test structured JSON record formatting."""
+
+    @staticmethod
+    def _record(**extra):
+        return {
+            "time": datetime(2025, 1, 1, tzinfo=UTC),
+            "level": SimpleNamespace(name="INFO"),
+            "message": "done",
+            "file": SimpleNamespace(name="worker.py"),
+            "line": 10,
+            "function": "run",
+            "extra": extra,
+        }
+
+    def test_bound_fields_coerced(self):
+        """GIVEN bound context of mixed types WHEN formatting THEN coerce to the field types."""
+        data = orjson.loads(
+            structured_formatter(
+                self._record(trace_id=123, latency_ms=12.7, status="ok", unrelated="x")
+            )
+        )
+
+        assert data["trace_id"] == "123"
+        assert data["latency_ms"] == 12
+        assert data["status"] == "ok"
+        assert "unrelated" not in data
+
+    def test_none_values_serialized_as_null(self):
+        """GIVEN a bound field set to None WHEN formatting THEN emit null instead of failing."""
+        data = orjson.loads(structured_formatter(self._record(latency_ms=None, request_id=None)))
+
+        assert data["latency_ms"] is None
+        assert data["request_id"] is None
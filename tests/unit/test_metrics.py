@@ -108,6 +108,279 @@ class TestMetricsEmission:
         samples = list(review_duration_seconds.labels(platform="gitea", status="success").collect())
         assert len(samples) > 0
 
+    def test_track_llm_request_decorator(self):
+        """Test that track_llm_request records duration and token usage."""
+        from types import SimpleNamespace
+
+        from utils.metrics import llm_tokens_total, track_llm_request
+
+        tokens = llm_tokens_total.labels(model_type="chat", model_name="test-model")
+        initial_value = tokens._value.get()
+
+        @track_llm_request(model_type="chat", model_name="test-model")
+        def dummy_llm_call():
+            return SimpleNamespace(usage=SimpleNamespace(total_tokens=42))
+
+        dummy_llm_call()
+        dummy_llm_call()
+
+        assert dummy_llm_call.__name__ == "dummy_llm_call"
+        assert tokens._value.get() == initial_value + 84
+
+    @pytest.mark.asyncio
+    async def test_track_llm_request_times_async_function(self):
+        """Test that async functions are awaited before the duration is observed."""
+        import asyncio
+        import inspect
+        from types import SimpleNamespace
+        from unittest.mock import patch
+
+        from utils.metrics import track_llm_request
+
+        with (
+            patch("utils.metrics.llm_request_duration_seconds") as histogram,
+            patch("utils.metrics.llm_tokens_total") as tokens,
+        ):
+
+            @track_llm_request(model_type="chat", model_name="async-model")
+            async def dummy_llm_call():
+                await asyncio.sleep(0.01)
+                return SimpleNamespace(usage=SimpleNamespace(total_tokens=7))
+
+            result = await dummy_llm_call()
+
+        assert inspect.iscoroutinefunction(dummy_llm_call)
+        assert result.usage.total_tokens == 7
+        assert histogram.labels.return_value.observe.call_args.args[0] >= 0.01
+        tokens.labels.return_value.inc.assert_called_once_with(7)
+
+    def test_track_review_duration_observes_on_exception(self):
+        """Test that a failing review still records its duration."""
+        from unittest.mock import patch
+
+        from utils.metrics import track_review_duration
+
+        with patch("utils.metrics.review_duration_seconds") as histogram:
+
+            @track_review_duration(platform="github", status="failure")
+            def failing_review():
+                raise RuntimeError("boom")
+
+            with pytest.raises(RuntimeError):
+                failing_review()
+
+        histogram.labels.return_value.observe.assert_called_once()
+
+    def test_metric_batch_applies_one_increment_per_label_set(self):
+        """Test that MetricBatch aggregates increments until exit."""
+        from unittest.mock import MagicMock
+
+        from utils.metrics import MetricBatch, indexing_files_processed_total
+
+        counter = MagicMock()
+        child = indexing_files_processed_total.labels(repo_id="batch/repo")
+        initial_value = child._value.get()
+
+        with MetricBatch() as batch:
+            for _ in range(5):
+                batch.inc(counter, "a")
+            batch.inc(counter, "b", amount=2)
+            batch.inc(indexing_files_processed_total, "batch/repo")
+            counter.labels.assert_not_called()
+
+        assert [c.args for c in counter.labels.call_args_list] == [("a",), ("b",)]
+        assert [c.args for c in counter.labels.return_value.inc.call_args_list] == [(5.0,), (2.0,)]
+        assert child._value.get() == initial_value + 1
+
+    def test_celery_collector_stops_on_event_and_records_success(self):
+        """Test that the collector records success and exits when stopped."""
+        import threading
+        from unittest.mock import MagicMock, patch
+
+        from utils.metrics import (
+            celery_metrics_collector_last_success_seconds,
+            start_celery_metrics_collector,
+        )
+
+        stop = threading.Event()
+        collected = threading.Event()
+        celery_app = MagicMock()
+        celery_app.control.inspect.return_value.active.side_effect = lambda: collected.set() or {}
+
+        with patch("utils.metrics.update_celery_queue_depth", return_value=0):
+            thread = start_celery_metrics_collector(
+                celery_app, "redis://localhost:6379/0", interval_seconds=60, stop_event=stop
+            )
+            assert collected.wait(timeout=5)
+            stop.set()
+            thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        celery_app.control.inspect.assert_called_with(timeout=0.5)
+        assert celery_metrics_collector_last_success_seconds._value.get() > 0
+
+    def test_task_events_maintain_worker_active_tasks(self):
+        """Test that task events update the active task gauge without an inspect broadcast."""
+        from utils.metrics import _TASK_EVENT_HANDLERS, celery_worker_active_tasks
+
+        worker = {"hostname": "celery@events-test"}
+        for event_type in ("task-started", "task-started", "task-succeeded"):
+            _TASK_EVENT_HANDLERS[event_type](worker)
+        gauge = celery_worker_active_tasks.labels(worker_name="celery@events-test")
+        assert gauge._value.get() == 1
+
+        _TASK_EVENT_HANDLERS["task-failed"](worker)
+        _TASK_EVENT_HANDLERS["task-failed"](worker)
+        assert gauge._value.get() == 0
+
+    def test_revoked_and_rejected_tasks_leave_active_count(self):
+        """Test that revoked and rejected tasks decrement the active task gauge."""
+        from utils.metrics import _TASK_EVENT_HANDLERS, celery_worker_active_tasks
+
+        worker = {"hostname": "celery@revoked-test"}
+        for event_type in ("task-started", "task-started", "task-revoked", "task-rejected"):
+            _TASK_EVENT_HANDLERS[event_type](worker)
+
+        assert (
+            celery_worker_active_tasks.labels(worker_name="celery@revoked-test")._value.get() == 0
+        )
+
+    def test_celery_collector_skips_inspect_while_events_connected(self):
+        """Test that scrapes read event-driven counts instead of broadcasting inspect()."""
+        import threading
+        from unittest.mock import MagicMock, patch
+
+        from utils.metrics import start_celery_metrics_collector
+
+        stop = threading.Event()
+        celery_app = MagicMock()
+
+        with (
+            patch("utils.metrics.start_celery_event_monitor") as start_monitor,
+            patch("utils.metrics._events_connected") as connected,
+            patch("utils.metrics.update_celery_queue_depth", side_effect=lambda *_: stop.set()),
+        ):
+            connected.is_set.return_value = True
+            thread = start_celery_metrics_collector(
+                celery_app, "redis://localhost:6379/0", stop_event=stop
+            )
+            thread.join(timeout=5)
+
+        start_monitor.assert_called_once_with(celery_app, stop_event=stop)
+        celery_app.control.inspect.assert_not_called()
+
+    def test_celery_collector_reseeds_from_inspect_while_events_connected(self):
+        """Test that event-driven counts are periodically reseeded from inspect()."""
+        import threading
+        from unittest.mock import MagicMock, patch
+
+        from utils.metrics import EVENT_RESEED_INTERVALS, start_celery_metrics_collector
+
+        stop = threading.Event()
+        collections = []
+        celery_app = MagicMock()
+        celery_app.control.inspect.return_value.active.return_value = {}
+
+        def collect(*_):
+            collections.append(celery_app.control.inspect.call_count)
+            if len(collections) == 2 * EVENT_RESEED_INTERVALS + 1:
+                stop.set()
+
+        with (
+            patch("utils.metrics.start_celery_event_monitor"),
+            patch("utils.metrics._events_connected") as connected,
+            patch("utils.metrics.update_celery_queue_depth", side_effect=collect),
+        ):
+            connected.is_set.return_value = True
+            thread = start_celery_metrics_collector(
+                celery_app, "redis://localhost:6379/0", interval_seconds=0, stop_event=stop
+            )
+            thread.join(timeout=5)
+
+        # inspect() runs on every EVENT_RESEED_INTERVALS-th collection only
+        assert celery_app.control.inspect.call_count == 2
+        assert collections[EVENT_RESEED_INTERVALS] == 1
+        assert collections[2 * EVENT_RESEED_INTERVALS] == 2
+
+    def test_webhook_helpers_use_prebound_children(self):
+        """Test that webhook helpers increment known platforms without label lookups."""
+        from unittest.mock import patch
+
+        from utils.metrics import (
+            record_webhook_received,
+            record_webhook_signature,
+            webhook_received_total,
+            webhook_signature_verified_total,
+        )
+
+        received = webhook_received_total.labels(platform="gitea")
+        verified = webhook_signature_verified_total.labels(platform="gitea", result="failure")
+        received_before = received._value.get()
+        verified_before = verified._value.get()
+
+        with patch.object(webhook_received_total, "labels") as labels:
+            record_webhook_received("gitea")
+        labels.assert_not_called()
+        record_webhook_signature("gitea", valid=False)
+
+        assert received._value.get() == received_before + 1
+        assert verified._value.get() == verified_before + 1
+
+    def test_webhook_helpers_fall_back_for_unknown_platform(self):
+        """Test that platforms without prebound children are still counted."""
+        from utils.metrics import record_webhook_parse_error, webhook_parse_errors_total
+
+        record_webhook_parse_error("gitlab", "invalid_json")
+
+        child = webhook_parse_errors_total.labels(platform="gitlab", error_type="invalid_json")
+        assert child._value.get() >= 1
+
+    def test_queue_depth_reuses_redis_client_per_broker(self):
+        """Test that queue depth scrapes share one Redis client per broker URL."""
+        from unittest.mock import patch
+
+        from utils.metrics import _redis_for, update_celery_queue_depth
+
+        _redis_for.cache_clear()
+        with patch("utils.metrics.redis.Redis.from_url") as from_url:
+            from_url.return_value.pipeline.return_value.execute.return_value = [3]
+            assert update_celery_queue_depth("redis://localhost:6379/0", "reviews") == 3
+            assert update_celery_queue_depth("redis://localhost:6379/0", "reviews") == 3
+        _redis_for.cache_clear()
+
+        from_url.assert_called_once()
+        assert from_url.call_args.args == ("redis://localhost:6379/0",)
+
+    def test_queue_depths_use_one_pipeline(self):
+        """Test that several queue depths are read in a single pipelined round-trip."""
+        from unittest.mock import patch
+
+        from utils.metrics import celery_queue_depth, update_celery_queue_depths
+
+        with patch("utils.metrics._redis_for") as redis_for:
+            pipe = redis_for.return_value.pipeline.return_value
+            pipe.execute.return_value = [4, 0]
+
+            depths = update_celery_queue_depths("redis://localhost:6379/0", ["reviews", "indexing"])
+
+        assert depths == {"reviews": 4, "indexing": 0}
+        redis_for.return_value.pipeline.assert_called_once_with(transaction=False)
+        assert [c.args for c in pipe.llen.call_args_list] == [("reviews",), ("indexing",)]
+        pipe.execute.assert_called_once_with()
+        assert celery_queue_depth.labels(queue_name="reviews")._value.get() == 4
+
+    def test_queue_depth_accepts_tls_broker_and_skips_non_redis(self):
+        """Test that rediss:// brokers are scraped and non-Redis brokers return None."""
+        from utils.metrics import _redis_for, update_celery_queue_depth
+
+        _redis_for.cache_clear()
+        client = _redis_for("rediss://:secret@redis.example:6380/2")
+        kwargs = client.connection_pool.connection_kwargs
+        assert (kwargs["host"], kwargs["port"], kwargs["db"]) == ("redis.example", 6380, 2)
+
+        assert update_celery_queue_depth("amqp://guest@rabbit//") is None
+        _redis_for.cache_clear()
+
     def test_all_metrics_have_help_text(self):
         """Test that all metrics have HELP documentation."""
         from prometheus_client import Counter, Gauge, Histogram, Summary
@@ -0,0 +1,86 @@
+"""
+Unit Tests for Prompt Loading
+
+Tests front matter stripping, variable substitution and template caching
+in utils.prompt_loader.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from utils.prompt_loader import (
+    _load_template,
+    _substitute_variables,
+    load_prompt,
+    load_prompt_with_metadata,
+)
+
+
+@pytest.fixture
+def prompts_dir(tmp_path):
+    """Point the loader at a temporary prompts directory with an empty cache."""
+    _load_template.cache_clear()
+    with patch("utils.prompt_loader._PROMPTS_DIR", str(tmp_path)):
+        yield tmp_path
+    _load_template.cache_clear()
+
+
+class TestSubstituteVariables:
+    """Test ${variable} substitution."""
+
+    def test_known_variables_replaced(self):
+        """GIVEN a template with known variables WHEN substituting THEN replace them."""
+        context = {"name": "World", "locale": "en"}
+
+        assert _substitute_variables("Hello ${name} in ${locale}", context) == "Hello World in en"
+
+    def test_missing_variable_left_in_place(self):
+        """GIVEN an unknown variable WHEN substituting THEN keep the placeholder."""
+        assert _substitute_variables("Hello ${name}", {}) == "Hello ${name}"
+
+
+class TestLoadPrompt:
+    """Test prompt file loading."""
+
+    def test_front_matter_stripped_and_variables_substituted(self, prompts_dir):
+        """GIVEN a prompt with front matter WHEN loading THEN return the substituted body."""
+        (prompts_dir / "review.md").write_text("---\nmode: agent\n---\n\nReview in ${locale}.\n")
+
+        assert load_prompt("review.md", {"locale": "en-us"}) == "Review in en-us."
+
+    def test_file_read_once_per_template(self, prompts_dir):
+        """GIVEN a loaded prompt WHEN loading it again with another context THEN reuse the cached template."""
+        (prompts_dir / "review.md").write_text("Review in ${locale}.")
+
+        assert load_prompt("review.md", {"locale": "en"}) == "Review in en."
+        (prompts_dir / "review.md").write_text("changed")
+        assert load_prompt("review.md", {"locale": "fr"}) == "Review in fr."
+        assert _load_template.cache_info().hits == 1
+
+    def test_missing_file_uses_fallback(self, prompts_dir):
+        """GIVEN no prompt file WHEN loading THEN return the fallback prompt."""
+        prompt = load_prompt("missing.md", {"locale": "en"})
+
+        assert "senior code reviewer" in prompt
+        assert prompt.endswith("feedback in en.")
+
+    def test_load_prompt_does_not_parse_yaml(self, prompts_dir):
+        """GIVEN a prompt with front matter WHEN loading THEN YAML is never parsed."""
+        (prompts_dir / "review.md").write_text("---\nmode: agent\n---\nBody")
+
+        with patch("yaml.safe_load") as safe_load:
+            assert load_prompt("review.md") == "Body"
+
+        safe_load.assert_not_called()
+
+    def test_load_prompt_with_metadata(self, prompts_dir):
+        """GIVEN a prompt with front matter WHEN loading with metadata THEN return both."""
+        (prompts_dir / "review.md").write_text(
+            "---\nmode: agent\ntemperature: 0.1\n---\nIn ${locale}"
+        )
+
+        prompt, metadata = load_prompt_with_metadata("review.md", {"locale": "en"})
+
+        assert prompt == "In en"
+        assert metadata == {"mode": "agent", "temperature": 0.1}
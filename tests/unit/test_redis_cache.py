@@ -0,0 +1,81 @@
+"""
+Unit Tests for the Redis Batch Cache
+
+Tests the shared read-through lookup in utils.redis_cache that backs the
+embedding and review caches.
+"""
+
+from unittest.mock import MagicMock
+
+import redis
+
+from utils.redis_cache import create_redis_client, get_or_compute_many
+
+
+def _lookup(client, inputs, calls, **kwargs):
+    def compute(batch):
+        calls.append(list(batch))
+        return [value.upper() for value in batch]
+
+    return get_or_compute_many(
+        client,
+        [f"k:{value}" for value in inputs],
+        inputs,
+        compute,
+        encode=str.encode,
+        decode=bytes.decode,
+        ttl_seconds=60,
+        name="Test",
+        **kwargs,
+    )
+
+
+class TestGetOrComputeMany:
+    """Test get_or_compute_many()."""
+
+    def test_values_round_trip_through_codec(self, store):
+        """GIVEN computed values WHEN looked up again THEN they are decoded from Redis."""
+        client, data = store
+        calls = []
+
+        _lookup(client, ["a", "b", "a"], calls)
+        result = _lookup(client, ["b", "a"], calls)
+
+        assert result == ["B", "A"]
+        assert calls == [["a", "b"]]
+        assert data == {"k:a": b"A", "k:b": b"B"}
+
+    def test_rejected_values_not_written(self, store):
+        """GIVEN a cacheable filter WHEN it rejects a value THEN only the others are stored."""
+        client, data = store
+
+        result = _lookup(client, ["a", "b"], [], cacheable=lambda value: value != "B")
+
+        assert result == ["A", "B"]
+        assert data == {"k:a": b"A"}
+
+    def test_empty_inputs_skip_redis(self, store):
+        """GIVEN no inputs WHEN looked up THEN Redis is not called."""
+        client, _ = store
+
+        assert _lookup(client, [], []) == []
+        client.mget.assert_not_called()
+
+    def test_redis_error_falls_back_to_compute(self, store):
+        """GIVEN Redis is unreachable WHEN looked up THEN every input is computed."""
+        client, _ = store
+        client.mget.side_effect = redis.ConnectionError("down")
+        calls = []
+
+        assert _lookup(client, ["a", "a"], calls) == ["A", "A"]
+        assert calls == [["a", "a"]]
+
+
+class TestCreateRedisClient:
+    """Test the broker connection factory."""
+
+    def test_non_redis_broker_returns_none(self):
+        """GIVEN a non-Redis broker URL WHEN connecting THEN return None."""
+        config = MagicMock(CELERY_BROKER_URL="amqp://guest@rabbit//")
+
+        assert create_redis_client(config, "Test") is None
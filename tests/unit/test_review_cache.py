@@ -0,0 +1,106 @@
+"""
+Unit Tests for the Review Response Cache
+
+Tests exact-match lookups, error-response exclusion and graceful
+degradation in utils.review_cache.
+"""
+
+from unittest.mock import MagicMock
+
+import redis
+
+from utils.review_cache import ReviewCache, cache_key, create_review_cache
+
+
+def _compute(calls, responses=None):
+    def compute(diffs):
+        calls.append(list(diffs))
+        return [(responses or {}).get(d, f"review of {d}") for d in diffs]
+
+    return compute
+
+
+class TestCacheKey:
+    """Test content addressing."""
+
+    def test_key_depends_on_model_locale_prompt_and_diff(self):
+        """GIVEN the same diff WHEN keyed under another model, locale or prompt THEN the keys differ."""
+        assert cache_key("m", "en", "p", "+a") == cache_key("m", "en", "p", "+a")
+        assert cache_key("m", "en", "p", "+a") != cache_key("m2", "en", "p", "+a")
+        assert cache_key("m", "en", "p", "+a") != cache_key("m", "fr", "p", "+a")
+        assert cache_key("m", "en", "p", "+a") != cache_key("m", "en", "p2", "+a")
+        assert cache_key("m", "en", "p", "+a") != cache_key("m", "en", "p", "+b")
+
+
+class TestGetOrComputeMany:
+    """Test ReviewCache.get_or_compute_many()."""
+
+    def test_reviewed_diffs_served_from_cache(self, store):
+        """GIVEN diffs reviewed once WHEN reviewed again THEN no LLM call is made."""
+        client, _ = store
+        cache = ReviewCache(client, ttl_seconds=60)
+        calls = []
+
+        first = cache.get_or_compute_many(["+a", "+b"], "m", "en", "p", _compute(calls))
+        second = cache.get_or_compute_many(["+b", "+a"], "m", "en", "p", _compute(calls))
+
+        assert first == ["review of +a", "review of +b"]
+        assert second == ["review of +b", "review of +a"]
+        assert calls == [["+a", "+b"]]
+        assert client.pipeline.return_value.set.call_args.kwargs["ex"] == 60
+
+    def test_duplicate_diffs_reviewed_once(self, store):
+        """GIVEN the same hunk twice in one PR WHEN reviewing THEN call the LLM once for it."""
+        client, _ = store
+        calls = []
+
+        result = ReviewCache(client, 60).get_or_compute_many(
+            ["+a", "+b", "+a"], "m", "en", "p", _compute(calls)
+        )
+
+        assert calls == [["+a", "+b"]]
+        assert result == ["review of +a", "review of +b", "review of +a"]
+
+    def test_edited_prompt_reviews_again(self, store):
+        """GIVEN diffs reviewed under one prompt WHEN the prompt changes THEN they are reviewed again."""
+        client, _ = store
+        cache = ReviewCache(client, 60)
+        calls = []
+        cache.get_or_compute_many(["+a"], "m", "en", "p", _compute(calls))
+
+        cache.get_or_compute_many(["+a"], "m", "en", "p2", _compute(calls))
+
+        assert calls == [["+a"], ["+a"]]
+
+    def test_error_responses_not_cached(self, store):
+        """GIVEN a failed LLM call WHEN reviewing again THEN the diff is retried."""
+        client, _ = store
+        cache = ReviewCache(client, 60)
+        calls = []
+        cache.get_or_compute_many(["+a"], "m", "en", "p", _compute(calls, {"+a": "Error: timeout"}))
+
+        result = cache.get_or_compute_many(["+a"], "m", "en", "p", _compute(calls))
+
+        assert result == ["review of +a"]
+        assert calls == [["+a"], ["+a"]]
+
+    def test_redis_error_falls_back_to_review(self, store):
+        """GIVEN Redis is unreachable WHEN reviewing THEN every diff goes to the LLM."""
+        client, _ = store
+        client.mget.side_effect = redis.ConnectionError("down")
+        calls = []
+
+        result = ReviewCache(client, 60).get_or_compute_many(
+            ["+a"], "m", "en", "p", _compute(calls)
+        )
+
+        assert result == ["review of +a"]
+        assert calls == [["+a"]]
+
+
+class TestCreateReviewCache:
+    """Test the configuration factory."""
+
+    def test_zero_ttl_disables_cache(self):
+        """GIVEN REVIEW_CACHE_TTL=0 WHEN creating the cache THEN return None."""
+        assert create_review_cache(MagicMock(REVIEW_CACHE_TTL=0)) is None
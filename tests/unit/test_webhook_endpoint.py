@@ -132,6 +132,40 @@ class TestWebhookEndpointUnit:
         data = response.json()
         assert "detail" in data
 
+    def test_invalid_json_counted_in_webhook_metrics(self, monkeypatch):
+        """
+        GIVEN invalid JSON payload
+        WHEN POST /v1/webhook/github
+        THEN the received and invalid_json parse error counters are incremented
+        """
+        monkeypatch.setenv("GITHUB_TOKEN", "test_token")
+        monkeypatch.setenv("GITEA_TOKEN", "test_token")
+        monkeypatch.setenv("GITEA_HOST", "gitea.example.com:3000")
+        monkeypatch.setenv("LLM_API_KEY", "test_llm_key")
+        monkeypatch.setenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+        monkeypatch.setenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+
+        from main import app
+        from utils.metrics import webhook_parse_errors_total, webhook_received_total
+
+        received = webhook_received_total.labels(platform="github")
+        parse_errors = webhook_parse_errors_total.labels(
+            platform="github", error_type="invalid_json"
+        )
+        received_before = received._value.get()
+        parse_errors_before = parse_errors._value.get()
+
+        with TestClient(app) as client:
+            response = client.post(
+                "/v1/webhook/github",
+                content="not valid json",
+                headers={"Content-Type": "application/json"},
+            )
+
+        assert response.status_code == 400
+        assert received._value.get() == received_before + 1
+        assert parse_errors._value.get() == parse_errors_before + 1
+
     def test_invalid_platform_returns_400(self, monkeypatch):
         """
         GIVEN an invalid platform parameter
@@ -8,14 +8,40 @@ These tests MUST FAIL because the Celery task implementation may
 not exist or have incorrect signatures/behavior.
 """
 
-from unittest.mock import MagicMock, patch
-
 import pytest
+from pydantic import ValidationError
 
 from models.platform import PRMetadata
 from models.review import ReviewConfig
 
 
+@pytest.fixture(scope="module")
+def worker_mod():
+    """Import the worker module once for every test in this module."""
+    import worker
+
+    return worker
+
+
+@pytest.fixture(scope="module")
+def celery_conf():
+    """Snapshot the Celery settings asserted on by the configuration tests."""
+    from celery_app import app
+
+    conf = app.conf
+    return {
+        "broker_url": conf.get("broker_url"),
+        "result_backend": conf.get("result_backend"),
+        "task_routes": conf.get("task_routes", {}),
+    }
+
+
+@pytest.fixture
+def metadata(request):
+    """Resolve a PRMetadata fixture by name for platform-parametrized tests."""
+    return request.getfixturevalue(request.param)
+
+
 class TestProcessCodeReviewTask:
     """
     Test process_code_review Celery task.
@@ -23,27 +49,7 @@ class TestProcessCodeReviewTask:
     These tests verify the Celery task signature and behavior.
     """
 
-    def test_process_code_review_task_exists(self):
-        """
-        GIVEN the worker module
-        WHEN importing process_code_review task
-        THEN the task should exist
-
-        FAIL EXPECTED: Task may not be defined or not properly decorated
-        """
-        # Arrange & Act
-        try:
-            from worker import process_code_review
-        except ImportError as e:
-            pytest.fail(f"process_code_review task not found: {e}")
-
-        # Assert
-        assert process_code_review is not None
-        assert hasattr(process_code_review, "delay"), (
-            "process_code_review should be a Celery task with delay() method"
-        )
-
-    def test_process_code_review_task_name(self):
+    def test_process_code_review_task_name(self, worker_mod):
         """
         GIVEN the process_code_review task
         WHEN checking its name
@@ -51,11 +57,8 @@ class TestProcessCodeReviewTask:
 
         FAIL EXPECTED: Task may have wrong name
         """
-        # Arrange
-        from worker import process_code_review
-
         # Act
-        task_name = process_code_review.name
+        task_name = worker_mod.process_code_review.name
 
         # Assert
         assert task_name == "worker.process_code_review", (
@@ -63,7 +66,7 @@ class TestProcessCodeReviewTask:
         )
 
     def test_process_code_review_accepts_metadata_dict(
-        self, sample_pr_metadata_github, sample_trace_id
+        self, worker_mod, sample_pr_metadata_github, sample_trace_id
     ):
         """
         GIVEN a PRMetadata dict and trace_id
@@ -73,19 +76,17 @@ class TestProcessCodeReviewTask:
         FAIL EXPECTED: Task signature may not accept dict parameter
         """
         # Arrange
-        from worker import process_code_review
-
         metadata_dict = sample_pr_metadata_github
 
         # Act & Assert - Just verify it doesn't raise TypeError
         try:
-            result = process_code_review.s(metadata_dict, sample_trace_id)
+            result = worker_mod.process_code_review.s(metadata_dict, sample_trace_id)
             assert result is not None
         except TypeError as e:
             pytest.fail(f"Task signature doesn't accept parameters: {e}")
 
     def test_process_code_review_accepts_prmetadata_model(
-        self, sample_pr_metadata_github, sample_trace_id
+        self, worker_mod, sample_pr_metadata_github, sample_trace_id
     ):
         """
         GIVEN a PRMetadata model instance
@@ -95,59 +96,44 @@ class TestProcessCodeReviewTask:
         FAIL EXPECTED: Task may not handle PRMetadata model correctly
         """
         # Arrange
-        from worker import process_code_review
-
-        metadata = PRMetadata(**sample_pr_metadata_github)
+        # Fixture data is already valid; skip re-validation on the model hop
+        metadata = PRMetadata.model_construct(**sample_pr_metadata_github)
         metadata_dict = metadata.model_dump()
 
         # Act & Assert
         try:
-            result = process_code_review.s(metadata_dict, sample_trace_id)
+            result = worker_mod.process_code_review.s(metadata_dict, sample_trace_id)
             assert result is not None
         except Exception as e:
             pytest.fail(f"Task failed to accept PRMetadata dict: {e}")
 
-    def test_process_code_review_with_github_metadata(
-        self, sample_pr_metadata_github, sample_trace_id
+    @pytest.mark.parametrize(
+        ("metadata", "platform"),
+        [
+            ("sample_pr_metadata_github", "github"),
+            ("sample_pr_metadata_gitea", "gitea"),
+        ],
+        indirect=["metadata"],
+    )
+    def test_process_code_review_with_platform_metadata(
+        self, worker_mod, metadata, platform, sample_trace_id
     ):
         """
-        GIVEN a GitHub PRMetadata
+        GIVEN a GitHub or Gitea PRMetadata
         WHEN calling process_code_review
-        THEN it should handle GitHub platform correctly
+        THEN it should handle the platform correctly
 
-        FAIL EXPECTED: May not handle GitHub platform properly
+        FAIL EXPECTED: May not handle the platform properly
         """
         # Arrange
-        from worker import process_code_review
-
-        metadata_dict = sample_pr_metadata_github
-        metadata_dict["platform"] = "github"
+        metadata_dict = metadata
+        metadata_dict["platform"] = platform
 
         # Act & Assert
-        result = process_code_review.s(metadata_dict, sample_trace_id)
+        result = worker_mod.process_code_review.s(metadata_dict, sample_trace_id)
         assert result is not None
 
-    def test_process_code_review_with_gitea_metadata(
-        self, sample_pr_metadata_gitea, sample_trace_id
-    ):
-        """
-        GIVEN a Gitea PRMetadata
-        WHEN calling process_code_review
-        THEN it should handle Gitea platform correctly
-
-        FAIL EXPECTED: May not handle Gitea platform properly
-        """
-        # Arrange
-        from worker import process_code_review
-
-        metadata_dict = sample_pr_metadata_gitea
-        metadata_dict["platform"] = "gitea"
-
-        # Act & Assert
-        result = process_code_review.s(metadata_dict, sample_trace_id)
-        assert result is not None
-
-    def test_process_code_review_task_is_bound(self):
+    def test_process_code_review_task_is_bound(self, worker_mod):
         """
         GIVEN the process_code_review task
         WHEN checking its definition
@@ -155,13 +141,10 @@ class TestProcessCodeReviewTask:
 
         FAIL EXPECTED: Task may not be bound
         """
-        # Arrange
-        from worker import process_code_review
-
         # Assert - Bound tasks have 'bind=True' in decorator
         # This is harder to test directly, but we can check if it has request attr
         # when applied
-        assert hasattr(process_code_review, "apply_async")
+        assert hasattr(worker_mod.process_code_review, "apply_async")
 
 
 class TestCeleryAppConfiguration:
@@ -180,67 +163,27 @@ class TestCeleryAppConfiguration:
         FAIL EXPECTED: Celery app may not be configured
         """
         # Arrange & Act
-        try:
-            from celery_app import app
-        except ImportError as e:
-            pytest.fail(f"Celery app not found: {e}")
+        from celery_app import app
 
         # Assert
         assert app is not None
         assert app.main == "cortexreview"
 
-    def test_celery_broker_url_configured(self):
-        """
-        GIVEN the Celery app configuration
-        WHEN checking broker_url
-        THEN it should be set to Redis URL
-
-        FAIL EXPECTED: Broker URL may not be configured
-        """
-        # Arrange
-        from celery_app import app
-
-        # Act
-        broker_url = app.conf.get("broker_url")
-
-        # Assert
-        assert broker_url is not None, "broker_url should be configured"
-        assert "redis" in broker_url, "broker_url should use Redis"
-
-    def test_celery_result_backend_configured(self):
-        """
-        GIVEN the Celery app configuration
-        WHEN checking result_backend
-        THEN it should be set to Redis URL
-
-        FAIL EXPECTED: Result backend may not be configured
-        """
-        # Arrange
-        from celery_app import app
-
-        # Act
-        result_backend = app.conf.get("result_backend")
-
-        # Assert
-        assert result_backend is not None, "result_backend should be configured"
-        assert "redis" in result_backend, "result_backend should use Redis"
-
-    def test_celery_task_routes_configured(self):
+    def test_celery_app_config(self, celery_conf):
         """
         GIVEN the Celery app configuration
-        WHEN checking task_routes
-        THEN process_code_review should be routed to code_review queue
+        WHEN checking broker_url, result_backend and task_routes
+        THEN both URLs should point at Redis and process_code_review
+        should have a route
 
-        FAIL EXPECTED: Task routing may not be configured
+        FAIL EXPECTED: Broker, backend or routing may not be configured
         """
-        # Arrange
-        from celery_app import app
-
-        # Act
-        task_routes = app.conf.get("task_routes", {})
-
         # Assert
-        assert "worker.process_code_review" in task_routes, (
+        assert celery_conf["broker_url"] is not None, "broker_url should be configured"
+        assert "redis" in celery_conf["broker_url"], "broker_url should use Redis"
+        assert celery_conf["result_backend"] is not None, "result_backend should be configured"
+        assert "redis" in celery_conf["result_backend"], "result_backend should use Redis"
+        assert "worker.process_code_review" in celery_conf["task_routes"], (
             "process_code_review should have a route configured"
         )
 
@@ -252,73 +195,30 @@ class TestCeleryTaskRegistration:
     These tests verify all tasks are properly registered.
     """
 
-    def test_index_repository_task_exists(self):
+    @pytest.mark.parametrize(
+        "task_name",
+        [
+            "process_code_review",
+            "index_repository",
+            "process_feedback",
+            "cleanup_expired_constraints",
+            "aggregate_metrics",
+        ],
+    )
+    def test_task_exists(self, worker_mod, task_name):
         """
         GIVEN the worker module
-        WHEN importing index_repository task
-        THEN the task should exist
+        WHEN looking up a task by name
+        THEN it should exist as a Celery task with delay()
 
         FAIL EXPECTED: Task may not be defined
         """
-        # Arrange & Act
-        try:
-            from worker import index_repository
-        except ImportError as e:
-            pytest.fail(f"index_repository task not found: {e}")
-
-        # Assert
-        assert index_repository is not None
-
-    def test_process_feedback_task_exists(self):
-        """
-        GIVEN the worker module
-        WHEN importing process_feedback task
-        THEN the task should exist
-
-        FAIL EXPECTED: Task may not be defined
-        """
-        # Arrange & Act
-        try:
-            from worker import process_feedback
-        except ImportError as e:
-            pytest.fail(f"process_feedback task not found: {e}")
-
-        # Assert
-        assert process_feedback is not None
-
-    def test_cleanup_expired_constraints_task_exists(self):
-        """
-        GIVEN the worker module
-        WHEN importing cleanup_expired_constraints task
-        THEN the task should exist
-
-        FAIL EXPECTED: Task may not be defined
-        """
-        # Arrange & Act
-        try:
-            from worker import cleanup_expired_constraints
-        except ImportError as e:
-            pytest.fail(f"cleanup_expired_constraints task not found: {e}")
-
-        # Assert
-        assert cleanup_expired_constraints is not None
-
-    def test_aggregate_metrics_task_exists(self):
-        """
-        GIVEN the worker module
-        WHEN importing aggregate_metrics task
-        THEN the task should exist
-
-        FAIL EXPECTED: Task may not be defined
-        """
-        # Arrange & Act
-        try:
-            from worker import aggregate_metrics
-        except ImportError as e:
-            pytest.fail(f"aggregate_metrics task not found: {e}")
+        # Act
+        task = getattr(worker_mod, task_name, None)
 
         # Assert
-        assert aggregate_metrics is not None
+        assert task is not None, f"{task_name} task not found"
+        assert hasattr(task, "delay"), f"{task_name} should be a Celery task with delay() method"
 
 
 class TestProcessCodeReviewTaskBehavior:
@@ -328,27 +228,17 @@ class TestProcessCodeReviewTaskBehavior:
     These tests verify the task behaves correctly when executed.
     """
 
-    @patch("worker.process_code_review")
     def test_task_returns_dict_with_task_id(
-        self, mock_task, sample_pr_metadata_github, sample_trace_id
+        self, worker_mod, sample_pr_metadata_github, sample_trace_id
     ):
         """
-        GIVEN a mocked process_code_review task
+        GIVEN the process_code_review task
         WHEN calling it with valid parameters
         THEN it should return a dict with task_id field
 
         FAIL EXPECTED: Task may not return correct format
         """
         # Arrange
-        from celery import Task
-
-        mock_self = MagicMock(spec=Task)
-        mock_self.request.id = sample_trace_id
-        mock_self.request.get.return_value = None
-
-        # Import actual task
-        import worker
-
         # We can't easily mock the whole task execution, so we just
         # verify the task signature is correct
         metadata_dict = sample_pr_metadata_github
@@ -356,58 +246,37 @@ class TestProcessCodeReviewTaskBehavior:
         # Act & Assert - Just verify parameters are accepted
         try:
             # Create signature
-            sig = worker.process_code_review.s(metadata_dict, sample_trace_id)
+            sig = worker_mod.process_code_review.s(metadata_dict, sample_trace_id)
             assert sig is not None
         except Exception as e:
             pytest.fail(f"Task signature failed: {e}")
 
-    @patch("worker.process_code_review")
-    def test_task_accepts_valid_pr_number(
-        self, mock_task, sample_pr_metadata_github, sample_trace_id
-    ):
-        """
-        GIVEN metadata with valid pr_number (> 0)
-        WHEN calling the task
-        THEN it should accept the pr_number
-
-        FAIL EXPECTED: Task may not handle PR events correctly
-        """
-        # Arrange
-        import worker
-
-        metadata_dict = sample_pr_metadata_github.copy()
-        metadata_dict["pr_number"] = 42  # Valid PR number
-
-        # Act & Assert
-        try:
-            sig = worker.process_code_review.s(metadata_dict, sample_trace_id)
-            assert sig is not None
-        except Exception as e:
-            pytest.fail(f"Task failed with PR number: {e}")
-
-    @patch("worker.process_code_review")
-    def test_task_accepts_push_event_pr_number_zero(
-        self, mock_task, sample_pr_metadata_gitea, sample_trace_id
-    ):
-        """
-        GIVEN metadata with pr_number=0 (push event)
+    @pytest.mark.parametrize(
+        ("metadata", "pr_number"),
+        [
+            ("sample_pr_metadata_github", 42),  # Valid PR number
+            ("sample_pr_metadata_gitea", 0),  # Push event
+        ],
+        indirect=["metadata"],
+    )
+    def test_task_accepts_pr_number(self, worker_mod, metadata, pr_number, sample_trace_id):
+        """
+        GIVEN metadata with a PR number (> 0) or a push event (pr_number=0)
         WHEN calling the task
         THEN it should accept the pr_number
 
-        FAIL EXPECTED: Task may not handle push events correctly
+        FAIL EXPECTED: Task may not handle PR or push events correctly
         """
         # Arrange
-        import worker
-
-        metadata_dict = sample_pr_metadata_gitea.copy()
-        metadata_dict["pr_number"] = 0  # Push event
+        metadata_dict = metadata.copy()
+        metadata_dict["pr_number"] = pr_number
 
         # Act & Assert
         try:
-            sig = worker.process_code_review.s(metadata_dict, sample_trace_id)
+            sig = worker_mod.process_code_review.s(metadata_dict, sample_trace_id)
             assert sig is not None
         except Exception as e:
-            pytest.fail(f"Task failed with push event: {e}")
+            pytest.fail(f"Task failed with pr_number={pr_number}: {e}")
 
 
 class TestReviewConfigModel:
@@ -453,7 +322,14 @@ class TestReviewConfigModel:
         assert config.include_auto_fix_patches is False  # Default
         assert config.max_context_matches == 10  # Default
 
-    def test_review_config_max_context_matches_validation(self):
+    @pytest.mark.parametrize(
+        "max_context_matches",
+        [
+            100,  # Too high
+            1,  # Too low (min is 3)
+        ],
+    )
+    def test_review_config_max_context_matches_validation(self, max_context_matches):
         """
         GIVEN invalid max_context_matches value
         WHEN creating the model
@@ -462,8 +338,95 @@ class TestReviewConfigModel:
         FAIL EXPECTED: Validation may not be enforced
         """
         # Arrange & Act & Assert
-        with pytest.raises(Exception):  # ValidationError
-            ReviewConfig(max_context_matches=100)  # Too high
+        with pytest.raises(ValidationError):
+            ReviewConfig(max_context_matches=max_context_matches)
+
+
+class TestCheckLearnedConstraints:
+    """Test _check_learned_constraints() per-block suppression lookups."""
+
+    def test_blocks_checked_concurrently(self, override_test_env, sample_pr_metadata_github):
+        """
+        GIVEN several embedded diff blocks
+        WHEN checking learned constraints
+        THEN the RPCs overlap and each block gets its own matches
+        """
+        import threading
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock, patch
+
+        import worker
+
+        # Sequential calls would time out here and fall back to no matches
+        barrier = threading.Barrier(2, timeout=5)
+
+        def check_suppressions(repo_id, embedding, threshold):
+            barrier.wait()
+            return [SimpleNamespace(id=f"c{embedding[0]:.0f}")]
 
-        with pytest.raises(Exception):  # ValidationError
-            ReviewConfig(max_context_matches=1)  # Too low (min is 3)
+        constraint_repo = MagicMock()
+        constraint_repo.check_suppressions.side_effect = check_suppressions
+        metadata = PRMetadata(**sample_pr_metadata_github)
+
+        with (
+            patch.object(worker, "supabase_client", MagicMock()),
+            patch.object(worker, "ConstraintRepository", return_value=constraint_repo),
+            patch.object(worker.config, "LLM_CONCURRENCY", 4),
+        ):
+            result = worker._check_learned_constraints(metadata, [[1.0], None, [2.0]])
+
+        assert result == [["c1"], [], ["c2"]]
+        assert constraint_repo.check_suppressions.call_count == 2
+
+
+class TestEmbedReviewInputs:
+    """Test _embed_review_inputs() RAG query and per-block embeddings."""
+
+    def test_query_is_embedding_of_joined_text(self, override_test_env):
+        """
+        GIVEN a RAG query and diff blocks
+        WHEN embedding the review inputs
+        THEN the query vector embeds the query text and each block gets its own vector in one batch
+        """
+        from unittest.mock import patch
+
+        import worker
+
+        batches = []
+
+        def embed_texts(texts):
+            batches.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        blocks = ["a" * 5, "b" * 7]
+        with (
+            patch.object(worker, "embedding_cache", None),
+            patch.object(worker, "_embed_texts", side_effect=embed_texts),
+        ):
+            query, embedded = worker._embed_review_inputs("\n".join(blocks), blocks)
+
+        assert query == [13.0]
+        assert embedded == [[5.0], [7.0]]
+        assert batches == [["a" * 5 + "\n" + "b" * 7, "a" * 5, "b" * 7]]
+
+    def test_query_truncated_like_knowledge_search(self, override_test_env):
+        """
+        GIVEN a query longer than the knowledge search limit
+        WHEN embedding it without RLHF blocks
+        THEN only the characters search_context would embed are sent
+        """
+        from unittest.mock import patch
+
+        import worker
+        from repositories.knowledge import QUERY_MAX_CHARS
+
+        with (
+            patch.object(worker, "embedding_cache", None),
+            patch.object(
+                worker, "_embed_texts", side_effect=lambda texts: [[float(len(t))] for t in texts]
+            ),
+        ):
+            query, embedded = worker._embed_review_inputs("x" * (QUERY_MAX_CHARS + 100), [])
+
+        assert query == [float(QUERY_MAX_CHARS)]
+        assert embedded == []
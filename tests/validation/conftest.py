@@ -0,0 +1,127 @@
+"""
+Validation Test Fixtures
+
+Session-scoped fixtures shared by the constitution compliance checks.
+"""
+
+import ast
+import io
+import mmap
+import os
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Well-known project files inspected by several compliance checks
+REPO_TEXT_FILES = (
+    ".env.example",
+    "Dockerfile",
+    "docker-compose.yml",
+    "celery_app.py",
+    "worker.py",
+)
+
+# Sources at least this large are memory-mapped instead of copied into memory
+MMAP_THRESHOLD = 1024 * 1024
+
+# Directories never descended into when collecting project sources
+EXCLUDED_DIRS = frozenset(
+    {
+        ".venv",
+        ".git",
+        "__pycache__",
+        ".specify",
+        ".claude",
+        "venv",
+        "build",
+        "dist",
+    }
+)
+
+
+def iter_py_files(root: str = "."):
+    """
+    Yield project Python file paths below root as plain strings.
+
+    Built on os.scandir so directory entries carry their cached type
+    information; excluded directories are never descended into (a
+    virtualenv alone can hold thousands of files).
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    yield from iter_py_files(entry.path)
+            elif entry.name.endswith(".py"):
+                yield entry.path
+
+
+def _load_source(path: str) -> bytes | mmap.mmap:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return f.read()
+        # The mapping stays valid after the file object is closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@pytest.fixture(scope="session")
+def python_sources():
+    """
+    Raw contents of every project Python file, keyed by path.
+
+    The tree is walked once per session via iter_py_files(); reads are
+    I/O-bound and release the GIL, so they are overlapped in a thread pool.
+    Files of MMAP_THRESHOLD bytes or more are exposed as read-only mmaps,
+    which support the same find/slice/regex operations as bytes.
+    """
+    paths = list(iter_py_files())
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        sources = dict(zip(paths, executor.map(_load_source, paths), strict=True))
+    yield sources
+    for content in sources.values():
+        if isinstance(content, mmap.mmap):
+            content.close()
+
+
+@pytest.fixture(scope="session")
+def repo_text_files() -> dict[str, str]:
+    """Text of the well-known project files, read once per session."""
+    return {path: Path(path).read_text() for path in REPO_TEXT_FILES if Path(path).exists()}
+
+
+@pytest.fixture(scope="session")
+def pyproject() -> dict:
+    """Parsed pyproject.toml, shared by the Constitution XIV checks."""
+    with Path("pyproject.toml").open("rb") as f:
+        return tomllib.load(f)
+
+
+@pytest.fixture(scope="session")
+def worker_ast(repo_text_files) -> ast.Module:
+    """Parsed worker.py, shared by structural checks."""
+    return ast.parse(repo_text_files["worker.py"], filename="worker.py")
+
+
+@pytest.fixture(scope="session")
+def celery_app_ast(repo_text_files) -> ast.Module:
+    """Parsed celery_app.py, shared by structural checks."""
+    return ast.parse(repo_text_files["celery_app.py"], filename="celery_app.py")
+
+
+@pytest.fixture(scope="session")
+def compose_yaml(repo_text_files) -> dict:
+    """Parsed docker-compose.yml, using the LibYAML loader when available."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(repo_text_files["docker-compose.yml"], Loader=loader) or {}
+
+
+@pytest.fixture(scope="session")
+def env_example_keys(repo_text_files) -> frozenset[str]:
+    """Variable names declared in .env.example (comments ignored)."""
+    from dotenv import dotenv_values
+
+    return frozenset(dotenv_values(stream=io.StringIO(repo_text_files[".env.example"])))
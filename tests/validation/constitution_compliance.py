@@ -23,10 +23,79 @@ XIV. Test-Driven Development
 Run: pytest tests/validation/constitution_compliance.py -v
 """
 
+import ast
+import os
+import re
+import stat
+import sys
 from pathlib import Path
 
 import pytest
 
+# Secret prefixes and the value length after them that is flagged:
+# OpenAI keys, GitHub tokens and AWS access key IDs
+SECRET_PATTERNS: tuple[tuple[str, int], ...] = (("sk-", 20), ("ghp_", 20), ("AKIA", 20))
+
+# Any secret prefix; only lines containing one are inspected
+SECRET_PREFIX_RE = re.compile(b"|".join(re.escape(p.encode()) for p, _ in SECRET_PATTERNS))
+
+# Characters ending the value after a secret prefix
+SECRET_VALUE_TERMINATORS = ('"', "'", ",", ")", ";")
+
+# Lines reading secrets from configuration rather than embedding them
+CONFIG_REFERENCE_MARKERS: tuple[bytes, ...] = (b"config.", b"os.getenv", b"os.environ", b" environ")
+
+# Lowercase markers of example/placeholder values
+PLACEHOLDER_MARKERS: tuple[bytes, ...] = (b"example", b"placeholder", b"your_", b"here")
+
+# OpenAI client import, at any indentation (e.g. inside a function or try block)
+OPENAI_IMPORT_RE = re.compile(rb"from openai import|import openai")
+
+# The fourteen constitution principles, in order
+PRINCIPLES: tuple[str, ...] = (
+    "I. Configuration as Code",
+    "II. Prompts as Data",
+    "III. Container-First",
+    "IV. Graceful Degradation",
+    "V. OpenAI-Compatible API",
+    "VI. Modular Service Architecture",
+    "VII. Async-First Processing",
+    "VIII. Platform Abstraction",
+    "IX. Observability",
+    "X. Webhook Security",
+    "XI. Task Reliability",
+    "XII. Feedback Loop",
+    "XIII. Data Governance",
+    "XIV. Test-Driven Development",
+)
+
+# Project layout mandated across principles: (path, "file" | "dir")
+REQUIRED_PATHS: tuple[tuple[str, str], ...] = (
+    (".env.example", "file"),  # I. Configuration as Code
+    ("prompts", "dir"),  # II. Prompts as Data
+    ("Dockerfile", "file"),  # III. Container-First
+    ("docker-compose.yml", "file"),  # III. Container-First
+    ("models", "dir"),  # VI. Modular Service Architecture
+    ("adapters", "dir"),  # VI. Modular Service Architecture
+    ("services", "dir"),  # VI. Modular Service Architecture
+    ("adapters/base.py", "file"),  # VI. Modular Service Architecture
+    ("celery_app.py", "file"),  # VII. Async-First Processing
+    ("worker.py", "file"),  # VII. Async-First Processing
+    ("adapters/github.py", "file"),  # VIII. Platform Abstraction
+    ("adapters/gitea.py", "file"),  # VIII. Platform Abstraction
+    ("utils/metrics.py", "file"),  # IX. Observability
+    ("models/feedback.py", "file"),  # XII. Feedback Loop
+    ("utils/data_governance.py", "file"),  # XIII. Data Governance
+    ("utils/secrets.py", "file"),  # XIII. Data Governance
+)
+
+
+def _has_test_file(directory: str) -> bool:
+    """Return True as soon as a test_*.py entry is found in directory."""
+    with os.scandir(directory) as entries:
+        return any(e.name.startswith("test_") and e.name.endswith(".py") for e in entries)
+
+
 # =============================================================================
 # I. Configuration as Code
 # =============================================================================
@@ -35,71 +104,50 @@ import pytest
 class TestConstitution1_ConfigurationAsCode:
     """Validate Principle I: Configuration as Code."""
 
-    def test_env_file_exists(self):
-        """GIVEN the project WHEN checking for .env file THEN .env.example exists."""
-        env_example = Path(".env.example")
-        assert env_example.exists(), ".env.example must exist for configuration reference"
-
-    def test_no_hardcoded_secrets_in_python(self):
+    def test_no_hardcoded_secrets_in_python(self, python_sources):
         """GIVEN Python source files WHEN scanning for secrets THEN none found."""
-        excluded_dirs = {
-            ".venv",
-            ".git",
-            "__pycache__",
-            ".specify",
-            ".claude",
-            "venv",
-            "build",
-            "dist",
-        }
-
-        # Common secret patterns (with realistic thresholds)
-        # Each tuple: (pattern, min_length_to_trigger_flag)
-        # We only flag if the value after the pattern is >= min_length
-        secret_patterns = [
-            ("sk-", 20),  # OpenAI key (at least 20 chars)
-            ("ghp_", 20),  # GitHub token (at least 20 chars)
-            ("AKIA", 20),  # AWS key (at least 20 chars)
-        ]
-
-        for py_file in Path().rglob("*.py"):
-            # Skip excluded directories and test files
-            if any(excluded in py_file.parts for excluded in excluded_dirs):
-                continue
-            if "test" in str(py_file):
+        for py_file, content in python_sources.items():
+            # Skip test files
+            if "test" in py_file:
                 continue
 
-            content = py_file.read_text()
-            lines = content.split("\n")
-            for i, line in enumerate(lines, 1):
+            inspected_line = -1
+            for match in SECRET_PREFIX_RE.finditer(content):
+                line_start = content.rfind(b"\n", 0, match.start()) + 1
+                if line_start == inspected_line:
+                    continue
+                inspected_line = line_start
+                line_end = content.find(b"\n", match.end())
+                line = content[line_start : line_end if line_end != -1 else len(content)]
+
                 # Skip comments
-                if line.strip().startswith("#"):
+                if line.lstrip().startswith(b"#"):
                     continue
 
                 # Skip lines that are clearly config references or assignments
-                if any(skip in line for skip in ["config.", "os.getenv", "os.environ", " environ"]):
+                if any(marker in line for marker in CONFIG_REFERENCE_MARKERS):
                     continue
 
                 # Skip example/placeholder values
-                if any(placeholder in line.lower() for placeholder in
-                       ["example", "placeholder", "your_", "here"]):
+                lowered = line.lower()
+                if any(marker in lowered for marker in PLACEHOLDER_MARKERS):
                     continue
 
-                # Check each secret pattern
-                for pattern, min_len in secret_patterns:
-                    if pattern in line:
-                        # Extract the value after the pattern
-                        parts = line.split(pattern)
-                        if len(parts) > 1:
-                            remaining = parts[1].strip()
-                            # Remove quotes, commas, parentheses
-                            for char in ['"', "'", ",", ")", ";"]:
-                                remaining = remaining.split(char)[0]
-                            # Only flag if it's long enough to be a real secret
-                            if len(remaining) >= min_len:
-                                pytest.fail(
-                                    f"Potential hardcoded secret in {py_file}:{i}: {line[:50]}"
-                                )
+                text = line.decode(errors="replace")
+                for pattern, min_len in SECRET_PATTERNS:
+                    if pattern not in text:
+                        continue
+                    # The value after the prefix, up to the first quote, comma or bracket
+                    remaining = text.split(pattern)[1].strip()
+                    for char in SECRET_VALUE_TERMINATORS:
+                        remaining = remaining.split(char)[0]
+                    # Only flag if it's long enough to be a real secret
+                    if len(remaining) >= min_len:
+                        # Slice first: mmap-backed sources have no count()
+                        line_no = content[:line_start].count(b"\n") + 1
+                        pytest.fail(
+                            f"Potential hardcoded secret in {py_file}:{line_no}: {text[:50]}"
+                        )
 
     def test_config_class_centralized(self):
         """GIVEN the utils module WHEN checking for Config class THEN it exists."""
@@ -116,12 +164,6 @@ class TestConstitution1_ConfigurationAsCode:
 class TestConstitution2_PromptsAsData:
     """Validate Principle II: Prompts as Data."""
 
-    def test_prompts_directory_exists(self):
-        """GIVEN the project WHEN checking for prompts directory THEN it exists."""
-        prompts_dir = Path("prompts")
-        assert prompts_dir.exists(), "prompts/ directory must exist"
-        assert prompts_dir.is_dir(), "prompts/ must be a directory"
-
     def test_prompts_have_yaml_front_matter(self):
         """GIVEN prompt markdown files WHEN checking format THEN they have YAML front matter."""
         prompts_dir = Path("prompts")
@@ -147,32 +189,20 @@ class TestConstitution2_PromptsAsData:
 class TestConstitution3_ContainerFirst:
     """Validate Principle III: Container-First."""
 
-    def test_dockerfile_exists(self):
-        """GIVEN the project WHEN checking for Dockerfile THEN it exists."""
-        dockerfile = Path("Dockerfile")
-        assert dockerfile.exists(), "Dockerfile must exist"
-
-    def test_docker_compose_exists(self):
-        """GIVEN the project WHEN checking for docker-compose.yml THEN it exists."""
-        compose_file = Path("docker-compose.yml")
-        assert compose_file.exists(), "docker-compose.yml must exist"
-
-    def test_dockerfile_uses_python_311(self):
+    def test_dockerfile_uses_python_311(self, repo_text_files):
         """GIVEN Dockerfile WHEN checking base image THEN it uses Python 3.11+."""
-        dockerfile = Path("Dockerfile")
-        content = dockerfile.read_text()
+        content = repo_text_files["Dockerfile"]
         assert "python:3.1" in content or "python:3.12" in content, (
             "Dockerfile must use Python 3.11+"
         )
 
-    def test_docker_compose_has_required_services(self):
+    def test_docker_compose_has_required_services(self, compose_yaml):
         """GIVEN docker-compose.yml WHEN checking services THEN includes api, worker, redis."""
-        compose_file = Path("docker-compose.yml")
-        content = compose_file.read_text()
+        services = compose_yaml.get("services") or {}
 
-        required_services = ["api:", "worker:", "redis:"]
+        required_services = ["api", "worker", "redis"]
         for service in required_services:
-            assert service in content, f"docker-compose.yml must include {service} service"
+            assert service in services, f"docker-compose.yml must include {service} service"
 
 
 # =============================================================================
@@ -206,55 +236,21 @@ class TestConstitution4_GracefulDegradation:
 class TestConstitution5_OpenAICompatible:
     """Validate Principle V: OpenAI-Compatible API."""
 
-    def test_openai_config_in_env(self):
+    def test_openai_config_in_env(self, env_example_keys):
         """GIVEN .env.example WHEN checking for OpenAI config THEN it has required vars."""
-        env_example = Path(".env.example")
-        content = env_example.read_text()
-
-        assert "LLM_API_KEY" in content or "OPENAI_KEY" in content, (
+        assert "LLM_API_KEY" in env_example_keys or "OPENAI_KEY" in env_example_keys, (
             ".env.example must include LLM_API_KEY"
         )
-        assert "LLM_BASE_URL" in content, ".env.example must include LLM_BASE_URL"
+        assert "LLM_BASE_URL" in env_example_keys, ".env.example must include LLM_BASE_URL"
 
-    def test_openai_client_used(self):
+    def test_openai_client_used(self, python_sources):
         """GIVEN the worker module WHEN checking imports THEN it uses OpenAI client."""
-        # Check that OpenAI is imported somewhere
-        for py_file in Path().rglob("*.py"):
-            if "test" in str(py_file) or ".venv" in str(py_file):
-                continue
-            content = py_file.read_text()
-            if "from openai import" in content or "import openai" in content:
-                return True
-        pytest.fail("OpenAI client not found in any module")
-
-
-# =============================================================================
-# VI. Modular Service Architecture
-# =============================================================================
-
-
-class TestConstitution6_ModularServiceArchitecture:
-    """Validate Principle VI: Modular Service Architecture."""
-
-    def test_models_directory_exists(self):
-        """GIVEN the project WHEN checking for models directory THEN it exists."""
-        models_dir = Path("models")
-        assert models_dir.exists(), "models/ directory must exist"
-
-    def test_adapters_directory_exists(self):
-        """GIVEN the project WHEN checking for adapters directory THEN it exists."""
-        adapters_dir = Path("adapters")
-        assert adapters_dir.exists(), "adapters/ directory must exist"
-
-    def test_services_directory_exists(self):
-        """GIVEN the project WHEN checking for services directory THEN it exists."""
-        services_dir = Path("services")
-        assert services_dir.exists(), "services/ directory must exist"
-
-    def test_base_adapter_exists(self):
-        """GIVEN adapters module WHEN checking for base THEN base.py exists."""
-        base_adapter = Path("adapters/base.py")
-        assert base_adapter.exists(), "adapters/base.py must exist"
+        if not any(
+            OPENAI_IMPORT_RE.search(content)
+            for path, content in python_sources.items()
+            if "test" not in path
+        ):
+            pytest.fail("OpenAI client not found in any module")
 
 
 # =============================================================================
@@ -265,40 +261,14 @@ class TestConstitution6_ModularServiceArchitecture:
 class TestConstitution7_AsyncFirstProcessing:
     """Validate Principle VII: Async-First Processing."""
 
-    def test_celery_app_exists(self):
-        """GIVEN the project WHEN checking for Celery app THEN celery_app.py exists."""
-        celery_app = Path("celery_app.py")
-        assert celery_app.exists(), "celery_app.py must exist"
-
-    def test_worker_module_exists(self):
-        """GIVEN the project WHEN checking for worker THEN worker.py exists."""
-        worker_file = Path("worker.py")
-        assert worker_file.exists(), "worker.py must exist"
-
-    def test_worker_has_tasks(self):
+    def test_worker_has_tasks(self, worker_ast):
         """GIVEN worker.py WHEN checking for tasks THEN process_code_review exists."""
-        worker_file = Path("worker.py")
-        content = worker_file.read_text()
-        assert "process_code_review" in content, "worker.py must define process_code_review task"
-
-
-# =============================================================================
-# VIII. Platform Abstraction
-# =============================================================================
-
-
-class TestConstitution8_PlatformAbstraction:
-    """Validate Principle VIII: Platform Abstraction."""
-
-    def test_github_adapter_exists(self):
-        """GIVEN adapters module WHEN checking for GitHub THEN github.py exists."""
-        github_adapter = Path("adapters/github.py")
-        assert github_adapter.exists(), "adapters/github.py must exist"
-
-    def test_gitea_adapter_exists(self):
-        """GIVEN adapters module WHEN checking for Gitea THEN gitea.py exists."""
-        gitea_adapter = Path("adapters/gitea.py")
-        assert gitea_adapter.exists(), "adapters/gitea.py must exist"
+        function_names = {
+            node.name for node in ast.walk(worker_ast) if isinstance(node, ast.FunctionDef)
+        }
+        assert "process_code_review" in function_names, (
+            "worker.py must define process_code_review task"
+        )
 
 
 # =============================================================================
@@ -309,16 +279,11 @@ class TestConstitution8_PlatformAbstraction:
 class TestConstitution9_Observability:
     """Validate Principle IX: Observability."""
 
-    def test_metrics_module_exists(self):
-        """GIVEN utils module WHEN checking for metrics THEN metrics.py exists."""
-        metrics_file = Path("utils/metrics.py")
-        assert metrics_file.exists(), "utils/metrics.py must exist"
-
-    def test_prometheus_configured(self):
+    def test_prometheus_configured(self, env_example_keys):
         """GIVEN .env.example WHEN checking for Prometheus THEN it has config."""
-        env_example = Path(".env.example")
-        content = env_example.read_text()
-        assert "ENABLE_PROMETHEUS" in content, ".env.example must include ENABLE_PROMETHEUS"
+        assert "ENABLE_PROMETHEUS" in env_example_keys, (
+            ".env.example must include ENABLE_PROMETHEUS"
+        )
 
 
 # =============================================================================
@@ -329,14 +294,11 @@ class TestConstitution9_Observability:
 class TestConstitution10_WebhookSecurity:
     """Validate Principle X: Webhook Security."""
 
-    def test_webhook_secrets_in_env(self):
+    def test_webhook_secrets_in_env(self, env_example_keys):
         """GIVEN .env.example WHEN checking for webhook secrets THEN they are configured."""
-        env_example = Path(".env.example")
-        content = env_example.read_text()
-
         assert (
-            "PLATFORM_GITHUB_WEBHOOK_SECRET" in content
-            or "PLATFORM_GITEA_WEBHOOK_SECRET" in content
+            "PLATFORM_GITHUB_WEBHOOK_SECRET" in env_example_keys
+            or "PLATFORM_GITEA_WEBHOOK_SECRET" in env_example_keys
         ), ".env.example must include webhook secret configuration"
 
 
@@ -348,47 +310,19 @@ class TestConstitution10_WebhookSecurity:
 class TestConstitution11_TaskReliability:
     """Validate Principle XI: Task Reliability."""
 
-    def test_celery_retry_configured(self):
+    def test_celery_retry_configured(self, celery_app_ast):
         """GIVEN celery_app.py WHEN checking for retry THEN it's configured."""
-        celery_app = Path("celery_app.py")
-        content = celery_app.read_text()
-
-        assert "task_retry" in content or "max_retries" in content, (
-            "celery_app.py must configure retry settings"
-        )
-
-
-# =============================================================================
-# XII. Feedback Loop
-# =============================================================================
-
-
-class TestConstitution12_FeedbackLoop:
-    """Validate Principle XII: Feedback Loop."""
-
-    def test_feedback_models_exist(self):
-        """GIVEN models module WHEN checking for feedback THEN feedback.py exists."""
-        feedback_models = Path("models/feedback.py")
-        assert feedback_models.exists(), "models/feedback.py must exist"
-
-
-# =============================================================================
-# XIII. Data Governance
-# =============================================================================
-
-
-class TestConstitution13_DataGovernance:
-    """Validate Principle XIII: Data Governance."""
-
-    def test_data_governance_module_exists(self):
-        """GIVEN utils module WHEN checking for data governance THEN data_governance.py exists."""
-        dg_file = Path("utils/data_governance.py")
-        assert dg_file.exists(), "utils/data_governance.py must exist"
+        keywords = {
+            keyword.arg
+            for node in ast.walk(celery_app_ast)
+            if isinstance(node, ast.Call)
+            for keyword in node.keywords
+            if keyword.arg
+        }
 
-    def test_secrets_scanner_exists(self):
-        """GIVEN utils module WHEN checking for secrets scanner THEN secrets.py exists."""
-        secrets_file = Path("utils/secrets.py")
-        assert secrets_file.exists(), "utils/secrets.py must exist"
+        assert "max_retries" in keywords or any(
+            keyword.startswith("task_retry") for keyword in keywords
+        ), "celery_app.py must configure retry settings"
 
 
 # =============================================================================
@@ -404,53 +338,48 @@ class TestConstitution14_TestDrivenDevelopment:
         tests_dir = Path("tests")
         assert tests_dir.exists(), "tests/ directory must exist"
 
-    def test_pytest_config_exists(self):
+    def test_pytest_config_exists(self, pyproject):
         """GIVEN the project WHEN checking for pytest config THEN it's configured."""
-        pyproject = Path("pyproject.toml")
-        assert pyproject.exists(), "pyproject.toml must exist"
-
-        content = pyproject.read_text()
-        assert "[tool.pytest.ini_options]" in content, (
+        assert "ini_options" in pyproject.get("tool", {}).get("pytest", {}), (
             "pyproject.toml must include pytest configuration"
         )
 
-    def test_coverage_threshold_defined(self):
+    def test_coverage_threshold_defined(self, pyproject):
         """GIVEN pytest config WHEN checking for coverage THEN threshold is >= 80%."""
-        pyproject = Path("pyproject.toml")
-        content = pyproject.read_text()
-
-        assert "cov-fail-under" in content, "pyproject.toml must define coverage threshold"
-        # Check that threshold is at least 80
-        for line in content.split("\n"):
-            if "cov-fail-under" in line:
-                # Extract number from formats like:
-                # '--cov-fail-under=80' (CLI arg style)
-                # 'cov-fail-under = 80' (config style)
-                import re
-                match = re.search(r'cov-fail-under[=\s]+(\d+)', line)
-                if match:
-                    threshold = int(match.group(1))
-                    assert threshold >= 80, f"Coverage threshold must be >= 80%, got {threshold}%"
-                    return
-        pytest.fail("Could not parse coverage threshold from pyproject.toml")
-
-    def test_unit_tests_exist(self):
-        """GIVEN tests directory WHEN checking for unit tests THEN they exist."""
-        unit_dir = Path("tests/unit")
-        assert unit_dir.exists(), "tests/unit/ directory must exist"
-
-        # Count test files
-        test_files = list(unit_dir.glob("test_*.py"))
-        assert len(test_files) > 0, "At least one unit test must exist"
-
-    def test_integration_tests_exist(self):
-        """GIVEN tests directory WHEN checking for integration tests THEN they exist."""
-        integration_dir = Path("tests/integration")
-        assert integration_dir.exists(), "tests/integration/ directory must exist"
-
-        # Count test files
-        test_files = list(integration_dir.glob("test_*.py"))
-        assert len(test_files) > 0, "At least one integration test must exist"
+        addopts = pyproject["tool"]["pytest"]["ini_options"].get("addopts", [])
+        if isinstance(addopts, str):
+            addopts = addopts.split()
+
+        prefix = "--cov-fail-under="
+        threshold = next(
+            (opt.removeprefix(prefix) for opt in addopts if opt.startswith(prefix)), None
+        )
+        if threshold is None:
+            threshold = pyproject["tool"].get("coverage", {}).get("report", {}).get("fail_under")
+
+        assert threshold is not None, "pyproject.toml must define coverage threshold"
+        assert float(threshold) >= 80, f"Coverage threshold must be >= 80%, got {threshold}%"
+
+    @pytest.mark.parametrize("test_dir", ["tests/unit", "tests/integration"])
+    def test_suite_has_tests(self, test_dir):
+        """GIVEN tests directory WHEN checking each suite THEN it holds at least one test file."""
+        assert os.path.isdir(test_dir), f"{test_dir}/ directory must exist"
+        assert _has_test_file(test_dir), f"At least one test must exist in {test_dir}/"
+
+
+# =============================================================================
+# Required Project Layout
+# =============================================================================
+
+
+@pytest.mark.parametrize(("path", "kind"), REQUIRED_PATHS)
+def test_required_path(path, kind):
+    """GIVEN the project layout WHEN checking required paths THEN each exists with the right kind."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        pytest.fail(f"{path} must exist")
+    assert stat.S_ISDIR(st.st_mode) == (kind == "dir"), f"{path} must be a {kind}"
 
 
 # =============================================================================
@@ -466,28 +395,19 @@ def test_constitution_compliance_summary():
     # This test generates a summary report
     # It will run after all other tests due to the 'summary' marker
 
-    principles = [
-        "I. Configuration as Code",
-        "II. Prompts as Data",
-        "III. Container-First",
-        "IV. Graceful Degradation",
-        "V. OpenAI-Compatible API",
-        "VI. Modular Service Architecture",
-        "VII. Async-First Processing",
-        "VIII. Platform Abstraction",
-        "IX. Observability",
-        "X. Webhook Security",
-        "XI. Task Reliability",
-        "XII. Feedback Loop",
-        "XIII. Data Governance",
-        "XIV. Test-Driven Development",
-    ]
-
-    print("\n" + "=" * 60)
-    print("CONSTITUTION COMPLIANCE SUMMARY")
-    print("=" * 60)
-    for principle in principles:
-        print(f"  ✓ {principle}")
-    print("=" * 60)
-    print("Run individual test classes for detailed validation")
-    print("=" * 60)
+    rule = "=" * 60
+    sys.stdout.write(
+        "\n".join(
+            (
+                "",
+                rule,
+                "CONSTITUTION COMPLIANCE SUMMARY",
+                rule,
+                *(f"  ✓ {principle}" for principle in PRINCIPLES),
+                rule,
+                "Run individual test classes for detailed validation",
+                rule,
+                "",
+            )
+        )
+    )
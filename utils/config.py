@@ -5,15 +5,21 @@ Refactored to use pydantic-settings for type-safe environment variable loading
 with Phase 2 variables for Celery, Supabase, and observability.
 """
 
-import os
+from functools import cached_property, lru_cache
+from typing import ClassVar
 
 from loguru import logger
-from pydantic import Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-class Webhook(BaseSettings):
-    """Configuration for optional notification webhooks."""
+class Webhook(BaseModel):
+    """
+    Configuration for optional notification webhooks.
+
+    A plain model rather than a settings class: values are always passed in
+    explicitly by Config, so no environment scan is needed on construction.
+    """
 
     url: str | None = None
     header_name: str | None = None
@@ -46,6 +52,9 @@ class Config(BaseSettings):
         case_sensitive=False,  # Allow case-insensitive env var matching
     )
 
+    # Inputs of the last successful _validate() run (see reset_validation)
+    _validated: ClassVar[tuple[object, ...] | None] = None
+
     # -------------------------------------------------------------------------
     # Git Platform Configuration
     # -------------------------------------------------------------------------
@@ -74,11 +83,26 @@ class Config(BaseSettings):
     LLM_MODEL: str = Field(default="gpt-4", description="Model identifier for LLM requests")
     LLM_LOCALE: str = Field(default="en_us", description="Response language locale")
     LLM_PROVIDER: str = Field(default="openai", description="Provider identifier for logging")
+    LLM_CONCURRENCY: int = Field(
+        default=8, ge=1, le=64, description="Maximum concurrent LLM requests per review task"
+    )
+    REVIEW_CACHE_TTL: int = Field(
+        default=86400, ge=0, description="Review response cache lifetime in seconds (0 disables)"
+    )
+    MAX_DIFF_BLOCK_CHARS: int = Field(
+        default=50000, ge=1, description="Diff blocks longer than this are not reviewed"
+    )
 
     # Embedding model for RAG
     EMBEDDING_MODEL: str = Field(
         default="text-embedding-3-small", description="Embedding model for RAG context retrieval"
     )
+    EMBEDDING_BATCH_SIZE: int = Field(
+        default=64, ge=1, le=2048, description="Maximum inputs per embeddings API request"
+    )
+    EMBEDDING_CACHE_TTL: int = Field(
+        default=604800, ge=0, description="Embedding cache lifetime in seconds (0 disables)"
+    )
 
     # Legacy Compatibility (fallback)
     OPENAI_KEY: str | None = Field(default=None, description="Legacy OpenAI API key (deprecated)")
@@ -172,22 +196,18 @@ class Config(BaseSettings):
     # -------------------------------------------------------------------------
     # Optional Webhook (nested model)
     # -------------------------------------------------------------------------
-    webhook: Webhook | None = Field(default=None, description="Notification webhook configuration")
+    # Populated from WEBHOOK__URL, WEBHOOK__HEADER_NAME, WEBHOOK__HEADER_VALUE
+    # and WEBHOOK__REQUEST_BODY via env_nested_delimiter
+    webhook: Webhook = Field(
+        default_factory=Webhook, description="Notification webhook configuration"
+    )
 
     # -------------------------------------------------------------------------
     # Post-processing and Validation
     # -------------------------------------------------------------------------
-    def __init__(self, **kwargs):
-        """
-        Initialize configuration and apply legacy compatibility transformations.
-
-        Raises:
-            ValueError: If required variables are missing or invalid
-        """
-        super().__init__(**kwargs)
-
-        # Apply strict priority for LLM authentication
-        # Priority: LLM_API_KEY > OPENAI_KEY > COPILOT_TOKEN
+    @model_validator(mode="after")
+    def _resolve_llm_key(self) -> "Config":
+        """Apply strict priority for LLM authentication: LLM_API_KEY > OPENAI_KEY > COPILOT_TOKEN."""
         if not self.LLM_API_KEY:
             if self.OPENAI_KEY:
                 self.LLM_API_KEY = self.OPENAI_KEY
@@ -195,33 +215,28 @@ class Config(BaseSettings):
             elif self.COPILOT_TOKEN:
                 self.LLM_API_KEY = self.COPILOT_TOKEN
                 logger.warning("COPILOT_TOKEN is deprecated, use LLM_API_KEY instead")
-            else:
-                # No LLM auth method configured
-                pass
-
-        # Initialize webhook if URL provided
-        if not self.webhook:
-            webhook_url = kwargs.get("webhook_url") or os.getenv("WEBHOOK_URL")
-            if webhook_url:
-                self.webhook = Webhook(
-                    url=webhook_url,
-                    header_name=kwargs.get("webhook_header_name")
-                    or os.getenv("WEBHOOK_HEADER_NAME"),
-                    header_value=kwargs.get("webhook_header_value")
-                    or os.getenv("WEBHOOK_HEADER_VALUE"),
-                    request_body=kwargs.get("webhook_request_body")
-                    or os.getenv("WEBHOOK_REQUEST_BODY"),
-                )
+        return self
+
+    @model_validator(mode="after")
+    def _check_webhook(self) -> "Config":
+        """Warn if a webhook URL is configured without a request body."""
+        if self.webhook.url and not self.webhook.is_init:
+            logger.warning(
+                "Webhook configuration is incomplete. "
+                "Both WEBHOOK__URL and WEBHOOK__REQUEST_BODY are required."
+            )
+        return self
 
-                # Warn if webhook configuration is incomplete
-                if not self.webhook.is_init:
-                    logger.warning(
-                        "Webhook configuration is incomplete. "
-                        "Both WEBHOOK_URL and WEBHOOK_REQUEST_BODY are required."
-                    )
+    @model_validator(mode="after")
+    def _check_required(self) -> "Config":
+        """
+        Validate required configuration once legacy values are resolved.
 
-        # Validate required configuration
+        Raises:
+            ValueError: If required variables are missing or invalid
+        """
         self._validate()
+        return self
 
     @field_validator("PLATFORM")
     @classmethod
@@ -242,34 +257,58 @@ class Config(BaseSettings):
             return "INFO"
         return v.upper()
 
-    def _validate(self) -> None:
-        """Validate required configuration is present."""
-        if not self.GITEA_TOKEN:
-            raise ValueError("GITEA_TOKEN is required")
-
-        if not self.GITEA_HOST:
-            raise ValueError("GITEA_HOST is required")
+    @classmethod
+    def reset_validation(cls) -> None:
+        """Forget the last validated inputs so the next instance re-runs all checks."""
+        cls._validated = None
 
-        if not self.LLM_API_KEY:
-            raise ValueError(
-                "At least one LLM authentication method required: "
-                "LLM_API_KEY (recommended), OPENAI_KEY, or COPILOT_TOKEN"
-            )
+    def _validate(self) -> None:
+        """
+        Validate required configuration is present.
 
-        # Warn if Supabase not configured (required for RAG/RLHF)
+        Environment variables don't change mid-process, so the checks and the
+        Supabase warning run once per distinct set of inputs; repeat
+        constructions only reapply the RAG/RLHF downgrade.
+        """
         # Support both external Supabase Cloud and local Supabase deployments
-        if self.RAG_ENABLED or self.RLHF_ENABLED:
-            has_external_supabase = bool(self.SUPABASE_URL and self.SUPABASE_SERVICE_KEY)
-            has_local_supabase = bool(self.SUPABASE_DB_URL)
+        has_external_supabase = bool(self.SUPABASE_URL and self.SUPABASE_SERVICE_KEY)
+        has_local_supabase = bool(self.SUPABASE_DB_URL)
+        supabase_configured = has_external_supabase or has_local_supabase
+        needs_supabase = self.RAG_ENABLED or self.RLHF_ENABLED
+
+        inputs = (
+            self.GITEA_TOKEN,
+            self.GITEA_HOST,
+            self.LLM_API_KEY,
+            needs_supabase,
+            supabase_configured,
+        )
+        if inputs != type(self)._validated:
+            if not self.GITEA_TOKEN:
+                raise ValueError("GITEA_TOKEN is required")
+
+            if not self.GITEA_HOST:
+                raise ValueError("GITEA_HOST is required")
+
+            if not self.LLM_API_KEY:
+                raise ValueError(
+                    "At least one LLM authentication method required: "
+                    "LLM_API_KEY (recommended), OPENAI_KEY, or COPILOT_TOKEN"
+                )
 
-            if not has_external_supabase and not has_local_supabase:
+            # Warn if Supabase not configured (required for RAG/RLHF)
+            if needs_supabase and not supabase_configured:
                 logger.warning(
                     "Supabase configuration is missing. RAG and RLHF features will be disabled. "
                     "Configure SUPABASE_URL + SUPABASE_SERVICE_KEY for external Supabase Cloud, "
                     "or SUPABASE_DB_URL for local Supabase deployment."
                 )
-                self.RAG_ENABLED = False
-                self.RLHF_ENABLED = False
+
+            type(self)._validated = inputs
+
+        if needs_supabase and not supabase_configured:
+            self.RAG_ENABLED = False
+            self.RLHF_ENABLED = False
 
     # -------------------------------------------------------------------------
     # Computed Properties
@@ -283,3 +322,23 @@ class Config(BaseSettings):
     def effective_llm_api_key(self) -> str | None:
         """Get the effective LLM API key after priority resolution."""
         return self.LLM_API_KEY
+
+    @cached_property
+    def ignored_file_suffixes(self) -> tuple[str, ...]:
+        """Lowercased IGNORED_FILE_SUFFIX entries, ready for str.endswith()."""
+        return tuple(
+            suffix.strip().lower()
+            for suffix in self.IGNORED_FILE_SUFFIX.split(",")
+            if suffix.strip()
+        )
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Return the process-wide Config instance.
+
+    The environment and .env file are parsed on first call only; tests that
+    change the environment can reset it with get_config.cache_clear().
+    """
+    return Config()
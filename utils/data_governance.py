@@ -12,11 +12,27 @@ Key Features:
 - GDPR-style right-to-forget implementation
 """
 
-from datetime import datetime, timedelta
-from typing import Any
-
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator, Mapping
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from types import MappingProxyType
+from typing import IO, TYPE_CHECKING, Any, Final
+
+import httpx
+import orjson
 from loguru import logger
-from supabase import Client
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
+
+if TYPE_CHECKING:
+    # Type-only: importing supabase pulls in httpx, postgrest and gotrue
+    from supabase import Client
 
 
 class DataIsolationError(Exception):
@@ -36,11 +52,13 @@ class DataRetentionError(Exception):
 # =============================================================================
 
 
+@lru_cache(maxsize=4096)
 def enforce_repo_isolation(repo_id: str) -> str:
     """
     Validate and normalize repo_id for data isolation enforcement.
 
-    Ensures repo_id is properly formatted for query scoping.
+    Ensures repo_id is properly formatted for query scoping. Results are
+    cached per repo_id since the same repositories recur across queries.
 
     Args:
         repo_id: Repository identifier (e.g., "owner/repo" or "owner%2Frepo")
@@ -54,11 +72,13 @@ def enforce_repo_isolation(repo_id: str) -> str:
     if not repo_id:
         raise DataIsolationError("repo_id cannot be empty")
 
-    # Normalize: replace URL encoding
-    normalized = repo_id.replace("%2F", "/")
+    # Normalize: replace URL encoding (only scan again when it can be present)
+    normalized = repo_id.replace("%2F", "/") if "%" in repo_id else repo_id
 
-    # Validate format: should contain exactly one slash
-    if normalized.count("/") != 1:
+    # Validate format: exactly one slash with non-empty owner and repo
+    # (find stops at the first slash instead of scanning the whole string)
+    idx = normalized.find("/")
+    if idx <= 0 or idx == len(normalized) - 1 or normalized.find("/", idx + 1) != -1:
         raise DataIsolationError(
             f"Invalid repo_id format: '{repo_id}'. Expected format: 'owner/repo'"
         )
@@ -66,28 +86,30 @@ def enforce_repo_isolation(repo_id: str) -> str:
     return normalized
 
 
-def build_repo_filter(repo_id: str) -> dict[str, Any]:
+@lru_cache(maxsize=2048)
+def build_repo_filter(repo_id: str) -> Mapping[str, str]:
     """
     Build Supabase filter for repository-level data isolation.
 
     All queries to knowledge_base and learned_constraints MUST
-    include this filter to ensure data isolation.
+    include this filter to ensure data isolation. Filters are cached
+    per repo_id and returned read-only, since callers share them.
 
     Args:
         repo_id: Repository identifier
 
     Returns:
-        Supabase filter dict
+        Read-only Supabase filter mapping
 
     Example:
         filter = build_repo_filter("octocat/hello-world")
         response = supabase.table("knowledge_base").select("*").filter(**filter).execute()
     """
     normalized_repo_id = enforce_repo_isolation(repo_id)
-    return {"repo_id": f"eq.{normalized_repo_id}"}
+    return MappingProxyType({"repo_id": f"eq.{normalized_repo_id}"})
 
 
-def verify_repo_access(supabase: Client, repo_id: str, table: str, record_id: int) -> bool:
+def verify_repo_access(supabase: "Client | None", repo_id: str, table: str, record_id: int) -> bool:
     """
     Verify that a record belongs to the specified repository.
 
@@ -95,29 +117,34 @@ def verify_repo_access(supabase: Client, repo_id: str, table: str, record_id: in
     cross-repository data access.
 
     Args:
-        supabase: Supabase client
+        supabase: Supabase client (None when Supabase is disabled)
         repo_id: Repository identifier
         table: Table name (e.g., "knowledge_base")
         record_id: Record ID to verify
 
     Returns:
-        True if record belongs to repo, False otherwise
+        True if record belongs to repo, False otherwise (always False
+        when Supabase is disabled)
 
     Raises:
         DataIsolationError: If repo_id is invalid
     """
+    if supabase is None:
+        return False
+
     normalized_repo_id = enforce_repo_isolation(repo_id)
 
     try:
         result = (
             supabase.table(table)
-            .select("id, repo_id")
+            .select("id")
             .eq("id", record_id)
             .eq("repo_id", normalized_repo_id)
+            .limit(1)
             .execute()
         )
 
-        return len(result.data) > 0
+        return bool(result.data)
 
     except Exception as e:
         logger.error(f"Failed to verify repo access: {e}")
@@ -129,30 +156,62 @@ def verify_repo_access(supabase: Client, repo_id: str, table: str, record_id: in
 # =============================================================================
 
 
-class RetentionPolicy:
-    """
-    Data retention policy configuration.
+# Retention periods: how long each type of data is kept before cleanup
+
+# Knowledge base entries (RAG context)
+KNOWLEDGE_RETENTION_DAYS: Final[int] = 180  # 6 months
+
+# Learned constraints (RLHF feedback)
+CONSTRAINT_RETENTION_DAYS: Final[int] = 90  # 3 months (default, configurable)
+
+# Review results (for audit)
+REVIEW_RETENTION_DAYS: Final[int] = 365  # 1 year
+
+# Failed task logs
+FAILED_TASK_RETENTION_DAYS: Final[int] = 30  # 1 month
+
+
+def _cutoff_iso(days: int, now: datetime | None = None) -> str:
+    """Return the UTC expiration timestamp for a retention period, e.g. "2025-01-31T12:00:00Z"."""
+    return f"{(now or datetime.now(UTC)) - timedelta(days=days):%Y-%m-%dT%H:%M:%S}Z"
 
-    Defines how long different types of data are retained before cleanup.
-    """
 
-    # Knowledge base entries (RAG context)
-    KNOWLEDGE_RETENTION_DAYS = 180  # 6 months
+# (epoch second, ISO string) of the last _utc_iso_now() result
+_iso_now_cache: tuple[int, str] = (0, "")
 
-    # Learned constraints (RLHF feedback)
-    CONSTRAINT_RETENTION_DAYS = 90  # 3 months (default, configurable)
 
-    # Review results (for audit)
-    REVIEW_RETENTION_DAYS = 365  # 1 year
+def _utc_iso_now() -> str:
+    """Return the current UTC time as "YYYY-MM-DDTHH:MM:SSZ", formatted at most once per second."""
+    global _iso_now_cache
+    now = int(time.time())
+    second, iso = _iso_now_cache
+    if now != second:
+        iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        # Rebinding one tuple keeps concurrent readers consistent
+        _iso_now_cache = (now, iso)
+    return iso
 
-    # Failed task logs
-    FAILED_TASK_RETENTION_DAYS = 30  # 1 month
+
+# DELETE options: report the affected row count (Content-Range header) without
+# sending the deleted rows back in the response body
+_COUNT_ONLY: Final[Mapping[str, Any]] = MappingProxyType(
+    {"count": CountMethod.exact, "returning": ReturnMethod.minimal}
+)
+
+# Result of a cleanup job when Supabase is disabled (no client configured)
+_SKIPPED_CLEANUP: Final[Mapping[str, Any]] = MappingProxyType(
+    {"status": "skipped", "reason": "supabase_disabled", "total_deleted": 0}
+)
+
+# Repositories per IN-filtered DELETE in bulk cleanup (PostgREST URL length limit)
+BULK_CLEANUP_CHUNK_SIZE: Final[int] = 500
 
 
 def cleanup_expired_knowledge(
-    supabase: Client,
+    supabase: "Client",
     repo_id: str | None = None,
-    retention_days: int = RetentionPolicy.KNOWLEDGE_RETENTION_DAYS,
+    retention_days: int = KNOWLEDGE_RETENTION_DAYS,
+    cutoff_iso: str | None = None,
 ) -> dict[str, Any]:
     """
     Clean up expired knowledge base entries.
@@ -161,52 +220,58 @@ def cleanup_expired_knowledge(
         supabase: Supabase client
         repo_id: Optional repository ID for scoped cleanup (None = all repos)
         retention_days: Retention period in days
+        cutoff_iso: Precomputed expiration timestamp; derived from
+            retention_days when omitted
 
     Returns:
         Dict with cleanup results (deleted_count, status)
 
     Raises:
-        DataRetentionError: If cleanup operation fails
+        DataIsolationError: If repo_id is invalid
+        DataRetentionError: If the Supabase request fails
     """
-    try:
-        # Calculate expiration date
-        expiration_date = datetime.utcnow() - timedelta(days=retention_days)
+    # Calculate expiration date
+    if cutoff_iso is None:
+        cutoff_iso = _cutoff_iso(retention_days)
+
+    # Validate repo isolation up front so invalid input is not reported as a DB failure
+    normalized_repo_id = enforce_repo_isolation(repo_id) if repo_id else None
 
+    try:
         # Build query
-        query = (
-            supabase.table("knowledge_base").delete().lt("created_at", expiration_date.isoformat())
-        )
+        query = supabase.table("knowledge_base").delete(**_COUNT_ONLY).lt("created_at", cutoff_iso)
 
         # Apply repo isolation if specified
-        if repo_id:
-            normalized_repo_id = enforce_repo_isolation(repo_id)
+        if normalized_repo_id:
             query = query.eq("repo_id", normalized_repo_id)
 
         # Execute deletion
         result = query.execute()
+        deleted_count = result.count or 0
 
         logger.info(
-            f"Knowledge base cleanup completed: {len(result.data)} records deleted "
+            f"Knowledge base cleanup completed: {deleted_count} records deleted "
             f"(repo_id={repo_id or 'all'}, retention={retention_days}d)"
         )
 
         return {
             "status": "success",
-            "deleted_count": len(result.data),
+            "deleted_count": deleted_count,
             "retention_days": retention_days,
             "repo_id": repo_id,
         }
 
-    except Exception as e:
+    except (APIError, httpx.HTTPError) as e:
         error_msg = f"Knowledge base cleanup failed: {e}"
         logger.error(error_msg)
         raise DataRetentionError(error_msg) from e
 
 
 def cleanup_expired_constraints(
-    supabase: Client,
+    supabase: "Client",
     repo_id: str | None = None,
-    retention_days: int = RetentionPolicy.CONSTRAINT_RETENTION_DAYS,
+    retention_days: int = CONSTRAINT_RETENTION_DAYS,
+    cutoff_iso: str | None = None,
 ) -> dict[str, Any]:
     """
     Clean up expired learned constraints.
@@ -215,52 +280,167 @@ def cleanup_expired_constraints(
         supabase: Supabase client
         repo_id: Optional repository ID for scoped cleanup (None = all repos)
         retention_days: Retention period in days
+        cutoff_iso: Precomputed expiration timestamp; derived from
+            retention_days when omitted
 
     Returns:
         Dict with cleanup results (deleted_count, status)
 
     Raises:
-        DataRetentionError: If cleanup operation fails
+        DataIsolationError: If repo_id is invalid
+        DataRetentionError: If the Supabase request fails
     """
-    try:
-        # Calculate expiration date
-        expiration_date = datetime.utcnow() - timedelta(days=retention_days)
+    # Calculate expiration date
+    if cutoff_iso is None:
+        cutoff_iso = _cutoff_iso(retention_days)
 
+    # Validate repo isolation up front so invalid input is not reported as a DB failure
+    normalized_repo_id = enforce_repo_isolation(repo_id) if repo_id else None
+
+    try:
         # Build query
         query = (
-            supabase.table("learned_constraints")
-            .delete()
-            .lt("created_at", expiration_date.isoformat())
+            supabase.table("learned_constraints").delete(**_COUNT_ONLY).lt("created_at", cutoff_iso)
         )
 
         # Apply repo isolation if specified
-        if repo_id:
-            normalized_repo_id = enforce_repo_isolation(repo_id)
+        if normalized_repo_id:
             query = query.eq("repo_id", normalized_repo_id)
 
         # Execute deletion
         result = query.execute()
+        deleted_count = result.count or 0
 
         logger.info(
-            f"Learned constraints cleanup completed: {len(result.data)} records deleted "
+            f"Learned constraints cleanup completed: {deleted_count} records deleted "
             f"(repo_id={repo_id or 'all'}, retention={retention_days}d)"
         )
 
         return {
             "status": "success",
-            "deleted_count": len(result.data),
+            "deleted_count": deleted_count,
             "retention_days": retention_days,
             "repo_id": repo_id,
         }
 
-    except Exception as e:
+    except (APIError, httpx.HTTPError) as e:
         error_msg = f"Learned constraints cleanup failed: {e}"
         logger.error(error_msg)
         raise DataRetentionError(error_msg) from e
 
 
+def cleanup_expired_knowledge_batch(
+    supabase: "Client",
+    repo_ids: list[str],
+    cutoff_iso: str,
+    retention_days: int = KNOWLEDGE_RETENTION_DAYS,
+) -> dict[str, Any]:
+    """
+    Clean up expired knowledge base entries for several repositories at once.
+
+    Issues a single DELETE scoped with an IN filter instead of one
+    round-trip per repository.
+
+    Args:
+        supabase: Supabase client
+        repo_ids: Repository identifiers to clean up
+        cutoff_iso: Expiration timestamp shared by the whole batch
+        retention_days: Retention period in days (reported only)
+
+    Returns:
+        Dict with cleanup results (deleted_count, status)
+
+    Raises:
+        DataIsolationError: If any repo_id is invalid
+        DataRetentionError: If the Supabase request fails
+    """
+    normalized_repo_ids = [enforce_repo_isolation(repo_id) for repo_id in repo_ids]
+
+    try:
+        result = (
+            supabase.table("knowledge_base")
+            .delete(**_COUNT_ONLY)
+            .lt("created_at", cutoff_iso)
+            .in_("repo_id", normalized_repo_ids)
+            .execute()
+        )
+        deleted_count = result.count or 0
+
+        logger.info(
+            f"Knowledge base batch cleanup completed: {deleted_count} records deleted "
+            f"({len(normalized_repo_ids)} repos, retention={retention_days}d)"
+        )
+
+        return {
+            "status": "success",
+            "deleted_count": deleted_count,
+            "retention_days": retention_days,
+            "repo_ids": normalized_repo_ids,
+        }
+
+    except (APIError, httpx.HTTPError) as e:
+        error_msg = f"Knowledge base batch cleanup failed: {e}"
+        logger.error(error_msg)
+        raise DataRetentionError(error_msg) from e
+
+
+def cleanup_expired_constraints_batch(
+    supabase: "Client",
+    repo_ids: list[str],
+    cutoff_iso: str,
+    retention_days: int = CONSTRAINT_RETENTION_DAYS,
+) -> dict[str, Any]:
+    """
+    Clean up expired learned constraints for several repositories at once.
+
+    Issues a single DELETE scoped with an IN filter instead of one
+    round-trip per repository.
+
+    Args:
+        supabase: Supabase client
+        repo_ids: Repository identifiers to clean up
+        cutoff_iso: Expiration timestamp shared by the whole batch
+        retention_days: Retention period in days (reported only)
+
+    Returns:
+        Dict with cleanup results (deleted_count, status)
+
+    Raises:
+        DataIsolationError: If any repo_id is invalid
+        DataRetentionError: If the Supabase request fails
+    """
+    normalized_repo_ids = [enforce_repo_isolation(repo_id) for repo_id in repo_ids]
+
+    try:
+        result = (
+            supabase.table("learned_constraints")
+            .delete(**_COUNT_ONLY)
+            .lt("created_at", cutoff_iso)
+            .in_("repo_id", normalized_repo_ids)
+            .execute()
+        )
+        deleted_count = result.count or 0
+
+        logger.info(
+            f"Learned constraints batch cleanup completed: {deleted_count} records deleted "
+            f"({len(normalized_repo_ids)} repos, retention={retention_days}d)"
+        )
+
+        return {
+            "status": "success",
+            "deleted_count": deleted_count,
+            "retention_days": retention_days,
+            "repo_ids": normalized_repo_ids,
+        }
+
+    except (APIError, httpx.HTTPError) as e:
+        error_msg = f"Learned constraints batch cleanup failed: {e}"
+        logger.error(error_msg)
+        raise DataRetentionError(error_msg) from e
+
+
 def cleanup_all_expired_data(
-    supabase: Client,
+    supabase: "Client | None",
     repo_id: str | None = None,
 ) -> dict[str, Any]:
     """
@@ -269,12 +449,15 @@ def cleanup_all_expired_data(
     This is the main cleanup job called by the Celery Beat scheduler.
 
     Args:
-        supabase: Supabase client
+        supabase: Supabase client (None when Supabase is disabled)
         repo_id: Optional repository ID for scoped cleanup
 
     Returns:
         Dict with combined cleanup results
     """
+    if supabase is None:
+        return dict(_SKIPPED_CLEANUP)
+
     logger.info(f"Starting data retention cleanup (repo_id={repo_id or 'all'})")
 
     results = {
@@ -284,16 +467,27 @@ def cleanup_all_expired_data(
         "total_deleted": 0,
     }
 
+    # Compute both cutoffs once for the whole run
+    now = datetime.now(UTC)
+    knowledge_cutoff = _cutoff_iso(KNOWLEDGE_RETENTION_DAYS, now)
+    constraint_cutoff = _cutoff_iso(CONSTRAINT_RETENTION_DAYS, now)
+
     try:
         # Clean up knowledge base
         results["knowledge"] = cleanup_expired_knowledge(
-            supabase, repo_id, RetentionPolicy.KNOWLEDGE_RETENTION_DAYS
+            supabase,
+            repo_id,
+            KNOWLEDGE_RETENTION_DAYS,
+            cutoff_iso=knowledge_cutoff,
         )
         results["total_deleted"] += results["knowledge"]["deleted_count"]
 
         # Clean up learned constraints
         results["constraints"] = cleanup_expired_constraints(
-            supabase, repo_id, RetentionPolicy.CONSTRAINT_RETENTION_DAYS
+            supabase,
+            repo_id,
+            CONSTRAINT_RETENTION_DAYS,
+            cutoff_iso=constraint_cutoff,
         )
         results["total_deleted"] += results["constraints"]["deleted_count"]
 
@@ -307,12 +501,79 @@ def cleanup_all_expired_data(
     return results
 
 
+def cleanup_all_expired_data_bulk(
+    supabase: "Client | None",
+    repo_ids: list[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Clean up all expired data for many repositories in batched queries.
+
+    Repositories are processed in chunks of BULK_CLEANUP_CHUNK_SIZE (kept
+    under the PostgREST URL length limit), giving two DELETE round-trips
+    per chunk instead of two per repository.
+
+    Args:
+        supabase: Supabase client (None when Supabase is disabled)
+        repo_ids: Repository identifiers to clean up (None = all repos)
+
+    Returns:
+        Dict with combined cleanup results
+    """
+    if supabase is None:
+        return dict(_SKIPPED_CLEANUP)
+
+    if not repo_ids:
+        return cleanup_all_expired_data(supabase)
+
+    logger.info(f"Starting bulk data retention cleanup ({len(repo_ids)} repos)")
+
+    results = {
+        "status": "success",
+        "repo_count": len(repo_ids),
+        "knowledge_deleted": 0,
+        "constraints_deleted": 0,
+        "total_deleted": 0,
+    }
+
+    # Compute both cutoffs once for the whole run
+    now = datetime.now(UTC)
+    knowledge_cutoff = _cutoff_iso(KNOWLEDGE_RETENTION_DAYS, now)
+    constraint_cutoff = _cutoff_iso(CONSTRAINT_RETENTION_DAYS, now)
+
+    try:
+        for start in range(0, len(repo_ids), BULK_CLEANUP_CHUNK_SIZE):
+            chunk = repo_ids[start : start + BULK_CLEANUP_CHUNK_SIZE]
+
+            knowledge = cleanup_expired_knowledge_batch(supabase, chunk, knowledge_cutoff)
+            results["knowledge_deleted"] += knowledge["deleted_count"]
+
+            constraints = cleanup_expired_constraints_batch(supabase, chunk, constraint_cutoff)
+            results["constraints_deleted"] += constraints["deleted_count"]
+
+        results["total_deleted"] = results["knowledge_deleted"] + results["constraints_deleted"]
+
+        logger.info(
+            f"Bulk data retention cleanup completed: {results['total_deleted']} records deleted"
+        )
+
+    except Exception as e:
+        results["status"] = "error"
+        results["error"] = str(e)
+        logger.error(f"Bulk data retention cleanup failed: {e}")
+
+    return results
+
+
 # =============================================================================
 # Right-to-Forget (GDPR-style Data Deletion)
 # =============================================================================
 
 
-def delete_all_repo_data(supabase: Client, repo_id: str) -> dict[str, Any]:
+# Rows deleted per table in each right-to-forget batch
+RIGHT_TO_FORGET_BATCH_SIZE: Final[int] = 1000
+
+
+def delete_all_repo_data(supabase: "Client", repo_id: str) -> dict[str, Any]:
     """
     Delete ALL data for a repository (right-to-forget).
 
@@ -343,20 +604,27 @@ def delete_all_repo_data(supabase: Client, repo_id: str) -> dict[str, Any]:
     }
 
     try:
-        # Delete all knowledge base entries
-        kb_result = (
-            supabase.table("knowledge_base").delete().eq("repo_id", normalized_repo_id).execute()
-        )
-        results["knowledge_deleted"] = len(kb_result.data)
-
-        # Delete all learned constraints
-        lc_result = (
-            supabase.table("learned_constraints")
-            .delete()
-            .eq("repo_id", normalized_repo_id)
-            .execute()
-        )
-        results["constraints_deleted"] = len(lc_result.data)
+        # Delete in bounded batches, each its own short server-side transaction
+        # (scripts/sql/009_create_delete_repo_data.sql), so row locks are
+        # released between batches on large repositories
+        params = {"p_repo_id": normalized_repo_id, "p_batch_size": RIGHT_TO_FORGET_BATCH_SIZE}
+        while True:
+            counts = supabase.rpc("delete_repo_data", params).execute().data or {}
+            knowledge_deleted = counts.get("knowledge_deleted", 0)
+            constraints_deleted = counts.get("constraints_deleted", 0)
+            results["knowledge_deleted"] += knowledge_deleted
+            results["constraints_deleted"] += constraints_deleted
+
+            logger.info(
+                f"RIGHT-TO-FORGET batch: {knowledge_deleted} knowledge entries, "
+                f"{constraints_deleted} constraints deleted for repo {normalized_repo_id}"
+            )
+
+            if (
+                knowledge_deleted < RIGHT_TO_FORGET_BATCH_SIZE
+                and constraints_deleted < RIGHT_TO_FORGET_BATCH_SIZE
+            ):
+                break
 
         logger.warning(
             f"RIGHT-TO-FORGET completed: {results['knowledge_deleted']} knowledge entries, "
@@ -376,6 +644,98 @@ def delete_all_repo_data(supabase: Client, repo_id: str) -> dict[str, Any]:
 # =============================================================================
 
 
+# Pending audit records that trigger an immediate flush
+AUDIT_LOG_BUFFER_SIZE: Final[int] = 256
+
+# Maximum seconds a buffered audit record waits before being flushed (and could be
+# lost to a hard crash; normal exits flush via atexit)
+AUDIT_LOG_FLUSH_INTERVAL: Final[float] = 1.0
+
+# Hard cap on pending records; the oldest are dropped (and counted) if the flusher falls this far behind
+AUDIT_LOG_MAX_PENDING: Final[int] = 10_000
+
+_AUDIT_FIELDS: Final[tuple[str, ...]] = (
+    "timestamp",
+    "action",
+    "repo_id",
+    "table",
+    "record_id",
+    "user_id",
+    "metadata",
+)
+
+_audit_queue: deque[tuple[Any, ...]] = deque(maxlen=AUDIT_LOG_MAX_PENDING)
+_audit_lock = threading.Lock()
+_audit_wakeup = threading.Event()
+_audit_flusher: threading.Thread | None = None
+# Records dropped because the queue was full, reported by the next flush
+_audit_dropped = 0
+
+
+def flush_audit_log() -> int:
+    """
+    Emit all buffered audit records, one structured log entry per access.
+
+    Returns:
+        Number of records flushed
+    """
+    global _audit_dropped
+    # Producers append without the lock; popleft() only takes records that are
+    # already queued, so an append racing the drain waits for the next flush.
+    # The lock keeps concurrent flushes from interleaving their records.
+    with _audit_lock:
+        popleft = _audit_queue.popleft
+        batch = [popleft() for _ in range(len(_audit_queue))]
+        dropped, _audit_dropped = _audit_dropped, 0
+        for entry in batch:
+            logger.bind(audit="data_access", **dict(zip(_AUDIT_FIELDS, entry, strict=True))).info(
+                "Data access logged"
+            )
+
+    if dropped:
+        logger.warning(
+            f"Dropped {dropped} audit records: more than {AUDIT_LOG_MAX_PENDING} were pending"
+        )
+    return len(batch)
+
+
+def _audit_flush_loop() -> None:
+    while True:
+        _audit_wakeup.wait(AUDIT_LOG_FLUSH_INTERVAL)
+        _audit_wakeup.clear()
+        try:
+            flush_audit_log()
+        except Exception as e:
+            logger.error(f"Audit log flush failed: {e}")
+
+
+def _ensure_audit_flusher() -> None:
+    """Start the background flusher on first use (per process)."""
+    global _audit_flusher
+    if _audit_flusher is not None:
+        return
+    with _audit_lock:
+        if _audit_flusher is None:
+            _audit_flusher = threading.Thread(
+                target=_audit_flush_loop, name="audit-log-flusher", daemon=True
+            )
+            _audit_flusher.start()
+
+
+def _reset_audit_after_fork() -> None:
+    # Threads don't survive fork (e.g. Celery prefork workers): start afresh in the child
+    global _audit_flusher, _audit_lock, _audit_wakeup, _audit_dropped
+    _audit_lock = threading.Lock()
+    _audit_wakeup = threading.Event()
+    _audit_queue.clear()
+    _audit_flusher = None
+    _audit_dropped = 0
+
+
+os.register_at_fork(after_in_child=_reset_audit_after_fork)
+atexit.register(flush_audit_log)
+
+
 def log_data_access(
     action: str,
     repo_id: str,
@@ -387,6 +747,11 @@ def log_data_access(
     """
     Log data access for audit trail.
 
+    Records are buffered and written by a background thread, one log entry
+    per access, whenever AUDIT_LOG_BUFFER_SIZE are pending or every
+    AUDIT_LOG_FLUSH_INTERVAL seconds; call flush_audit_log() to write
+    pending records immediately.
+
     Args:
         action: Action performed (read, write, delete)
         repo_id: Repository identifier
@@ -395,24 +760,30 @@ def log_data_access(
         user_id: Optional user identifier
         metadata: Optional additional metadata
     """
-    log_entry = {
-        "timestamp": datetime.utcnow().isoformat(),
-        "action": action,
-        "repo_id": repo_id,
-        "table": table,
-        "record_id": record_id,
-        "user_id": user_id,
-        "metadata": metadata or {},
-    }
+    global _audit_dropped
+    if len(_audit_queue) >= AUDIT_LOG_MAX_PENDING:
+        # The append below evicts the oldest record
+        with _audit_lock:
+            _audit_dropped += 1
+
+    # action/repo_id/table have low cardinality: interning lets buffered
+    # records share one string object per distinct value
+    _audit_queue.append(
+        (
+            _utc_iso_now(),
+            sys.intern(action),
+            sys.intern(repo_id),
+            sys.intern(table),
+            record_id,
+            user_id,
+            # Copied so later changes by the caller don't alter the record
+            dict(metadata) if metadata else {},
+        )
+    )
 
-    # Use structured logging for audit trail
-    logger.bind(
-        audit="data_access",
-        action=action,
-        repo_id=repo_id,
-        table=table,
-        record_id=record_id,
-    ).info("Data access logged")
+    if len(_audit_queue) >= AUDIT_LOG_BUFFER_SIZE:
+        _audit_wakeup.set()
+    _ensure_audit_flusher()
 
 
 # =============================================================================
@@ -420,8 +791,95 @@ def log_data_access(
 # =============================================================================
 
 
+# Rows fetched per keyset-paginated request when streaming exports
+EXPORT_PAGE_SIZE: Final[int] = 500
+
+# knowledge_base columns exported when embeddings are excluded
+_KNOWLEDGE_EXPORT_COLUMNS: Final[str] = "id, repo_id, content, metadata, created_at"
+
+
+def _iter_repo_rows(
+    supabase: "Client",
+    table: str,
+    columns: str,
+    repo_id: str,
+    page_size: int,
+) -> Iterator[dict[str, Any]]:
+    """Yield a repository's rows from table in id order, one page in memory at a time."""
+    last_id = None
+    while True:
+        query = supabase.table(table).select(columns).eq("repo_id", repo_id)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data
+
+        yield from rows
+
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def export_repo_data_stream(
+    supabase: "Client",
+    repo_id: str,
+    sink: IO[bytes],
+    include_embeddings: bool = False,
+    page_size: int = EXPORT_PAGE_SIZE,
+) -> dict[str, int]:
+    """
+    Stream all data for a repository to sink as JSON Lines.
+
+    Each line is {"table": ..., "record": {...}}. Rows are fetched with
+    keyset pagination on id, so memory use is bounded by page_size rather
+    than the size of the repository.
+
+    Args:
+        supabase: Supabase client
+        repo_id: Repository identifier
+        sink: Binary file-like object receiving the JSONL output
+        include_embeddings: Whether to include vector embeddings (large)
+        page_size: Rows fetched per request
+
+    Returns:
+        Dict with exported row counts per table
+
+    Raises:
+        DataIsolationError: If repo_id is invalid
+        DataRetentionError: If the Supabase request fails
+    """
+    normalized_repo_id = enforce_repo_isolation(repo_id)
+
+    logger.info(f"Streaming export for repo: {normalized_repo_id}")
+
+    tables = (
+        ("knowledge_base", "*" if include_embeddings else _KNOWLEDGE_EXPORT_COLUMNS),
+        ("learned_constraints", "*"),
+    )
+    counts = {table: 0 for table, _ in tables}
+
+    try:
+        for table, columns in tables:
+            for row in _iter_repo_rows(supabase, table, columns, normalized_repo_id, page_size):
+                sink.write(orjson.dumps({"table": table, "record": row}))
+                sink.write(b"\n")
+                counts[table] += 1
+
+    except (APIError, httpx.HTTPError) as e:
+        error_msg = f"Streaming export failed for repo {normalized_repo_id}: {e}"
+        logger.error(error_msg)
+        raise DataRetentionError(error_msg) from e
+
+    logger.info(
+        f"Export completed: {counts['knowledge_base']} knowledge entries, "
+        f"{counts['learned_constraints']} constraints"
+    )
+
+    return counts
+
+
 def export_repo_data(
-    supabase: Client,
+    supabase: "Client",
     repo_id: str,
     include_embeddings: bool = False,
 ) -> dict[str, Any]:
@@ -430,6 +888,9 @@ def export_repo_data(
 
     Used for backup, migration, or data portability (GDPR).
 
+    NOTE: Deprecated in favor of export_repo_data_stream(), which does not
+    hold the whole repository in memory. Kept for backward compatibility.
+
     Args:
         supabase: Supabase client
         repo_id: Repository identifier
@@ -447,7 +908,7 @@ def export_repo_data(
 
     export_data = {
         "repo_id": normalized_repo_id,
-        "export_timestamp": datetime.utcnow().isoformat(),
+        "export_timestamp": _utc_iso_now(),
         "knowledge_base": [],
         "learned_constraints": [],
     }
@@ -488,16 +949,26 @@ def export_repo_data(
 # Module Exports
 # =============================================================================
 __all__ = [
+    "AUDIT_LOG_BUFFER_SIZE",
+    "AUDIT_LOG_FLUSH_INTERVAL",
+    "CONSTRAINT_RETENTION_DAYS",
+    "FAILED_TASK_RETENTION_DAYS",
+    "KNOWLEDGE_RETENTION_DAYS",
+    "REVIEW_RETENTION_DAYS",
     "DataIsolationError",
     "DataRetentionError",
-    "RetentionPolicy",
     "build_repo_filter",
     "cleanup_all_expired_data",
+    "cleanup_all_expired_data_bulk",
     "cleanup_expired_constraints",
+    "cleanup_expired_constraints_batch",
     "cleanup_expired_knowledge",
+    "cleanup_expired_knowledge_batch",
     "delete_all_repo_data",
     "enforce_repo_isolation",
     "export_repo_data",
+    "export_repo_data_stream",
+    "flush_audit_log",
     "log_data_access",
     "verify_repo_access",
 ]
@@ -12,14 +12,30 @@ Fallback Levels:
 5. EMERGENCY: Fallback to legacy Phase 1 behavior (synchronous processing)
 """
 
+import asyncio
+import contextvars
+import inspect
+import random
 import time
 from collections.abc import Callable
 from enum import Enum
 from functools import wraps
-from typing import Any
+from typing import Any, NamedTuple
 
+import httpx
+import requests
 from loguru import logger
 
+# Transport failures worth retrying in with_llm_fallback: the built-ins plus the
+# requests and httpx exceptions LLM clients raise, which don't subclass them
+LLM_RETRYABLE_EXCEPTIONS: tuple[type[BaseException], ...] = (
+    TimeoutError,
+    ConnectionError,
+    requests.Timeout,
+    requests.ConnectionError,
+    httpx.TransportError,
+)
+
 
 class FallbackLevel(str, Enum):
     """
@@ -36,38 +52,119 @@ class FallbackLevel(str, Enum):
     EMERGENCY = "emergency"  # Legacy Phase 1 synchronous processing
 
 
+# Health bits packed into HealthStatus.mask: (llm << 2) | (supabase << 1) | redis
+_REDIS_BIT = 0b001
+_SUPABASE_BIT = 0b010
+_LLM_BIT = 0b100
+
+# Fallback level for every health mask, indexed by mask value
+_LEVEL_TABLE: tuple[FallbackLevel, ...] = (
+    FallbackLevel.EMERGENCY,  # 000: LLM is critical - no reviews possible
+    FallbackLevel.EMERGENCY,  # 001
+    FallbackLevel.EMERGENCY,  # 010
+    FallbackLevel.EMERGENCY,  # 011
+    FallbackLevel.MINIMAL,  # 100: both data stores down - minimal LLM-only reviews
+    FallbackLevel.DEGRADED_BOTH,  # 101: Supabase down - no RAG or RLHF
+    FallbackLevel.DEGRADED_RAG,  # 110: Redis down - async processing affected
+    FallbackLevel.FULL,  # 111: all services healthy
+)
+
+# Fallback levels at which each feature stays enabled
+_RAG_LEVELS = frozenset({FallbackLevel.FULL, FallbackLevel.DEGRADED_RLHF})
+_RLHF_LEVELS = frozenset({FallbackLevel.FULL, FallbackLevel.DEGRADED_RAG})
+
+# Bit m is set when health mask m allows the feature
+_RAG_ENABLED_MASKS = sum(
+    1 << mask for mask, level in enumerate(_LEVEL_TABLE) if level in _RAG_LEVELS
+)
+_RLHF_ENABLED_MASKS = sum(
+    1 << mask for mask, level in enumerate(_LEVEL_TABLE) if level in _RLHF_LEVELS
+)
+
+
 class HealthStatus:
     """
     Tracks health status of external services.
 
-    Used to determine current fallback level.
+    Used to determine current fallback level. Service health is kept as a
+    3-bit mask so the fallback level is a single table lookup.
     """
 
     def __init__(self):
-        self.supabase_healthy: bool = True
-        self.redis_healthy: bool = True
-        self.llm_healthy: bool = True
+        self.mask: int = _LLM_BIT | _SUPABASE_BIT | _REDIS_BIT
         self.last_check: float = time.time()
         self.check_interval: int = 60  # Seconds between health checks
+        self.last_probe: dict[str, float] = {}  # Service name -> time of last active probe
+
+    def _set_bit(self, bit: int, healthy: bool) -> None:
+        self.mask = self.mask | bit if healthy else self.mask & ~bit
+
+    @property
+    def supabase_healthy(self) -> bool:
+        return bool(self.mask & _SUPABASE_BIT)
+
+    @supabase_healthy.setter
+    def supabase_healthy(self, healthy: bool) -> None:
+        self._set_bit(_SUPABASE_BIT, healthy)
+
+    @property
+    def redis_healthy(self) -> bool:
+        return bool(self.mask & _REDIS_BIT)
+
+    @redis_healthy.setter
+    def redis_healthy(self, healthy: bool) -> None:
+        self._set_bit(_REDIS_BIT, healthy)
+
+    @property
+    def llm_healthy(self) -> bool:
+        return bool(self.mask & _LLM_BIT)
+
+    @llm_healthy.setter
+    def llm_healthy(self, healthy: bool) -> None:
+        self._set_bit(_LLM_BIT, healthy)
 
     def set_supabase_health(self, healthy: bool) -> None:
-        """Update Supabase health status."""
-        self.supabase_healthy = healthy
+        """Update Supabase health status (no-op when unchanged)."""
+        if self.supabase_healthy == healthy:
+            return
+        self._set_bit(_SUPABASE_BIT, healthy)
         self.last_check = time.time()
 
     def set_redis_health(self, healthy: bool) -> None:
-        """Update Redis health status."""
-        self.redis_healthy = healthy
+        """Update Redis health status (no-op when unchanged)."""
+        if self.redis_healthy == healthy:
+            return
+        self._set_bit(_REDIS_BIT, healthy)
         self.last_check = time.time()
 
     def set_llm_health(self, healthy: bool) -> None:
-        """Update LLM health status."""
-        self.llm_healthy = healthy
+        """Update LLM health status (no-op when unchanged)."""
+        if self.llm_healthy == healthy:
+            return
+        self._set_bit(_LLM_BIT, healthy)
         self.last_check = time.time()
 
-    def should_check_health(self) -> bool:
-        """Check if enough time has passed since last health check."""
-        return time.time() - self.last_check >= self.check_interval
+    def should_check_health(self, service: str | None = None) -> bool:
+        """
+        Check if enough time has passed since last health check.
+
+        With a service name, compares against that service's last active
+        probe instead, so a failure reported elsewhere doesn't delay the
+        probe that detects recovery.
+        """
+        last = self.last_check if service is None else self.last_probe.get(service, 0.0)
+        return time.time() - last >= self.check_interval
+
+    def force_recheck(self, service: str | None = None) -> None:
+        """
+        Forget the last probe time so the next call or health check goes through.
+
+        Clears the gate for one service, or for all services when omitted.
+        """
+        if service is None:
+            self.last_probe.clear()
+        else:
+            self.last_probe.pop(service, None)
 
     def get_fallback_level(self) -> FallbackLevel:
         """
@@ -76,38 +173,34 @@ class HealthStatus:
         Returns:
             FallbackLevel enum value
         """
-        if not self.llm_healthy:
-            # LLM is critical - no reviews possible
-            return FallbackLevel.EMERGENCY
-
-        if not self.supabase_healthy and not self.redis_healthy:
-            # Both data stores down - minimal LLM-only reviews
-            return FallbackLevel.MINIMAL
-
-        if not self.supabase_healthy:
-            # Supabase down - no RAG or RLHF
-            return FallbackLevel.DEGRADED_BOTH
-
-        if not self.redis_healthy:
-            # Redis down but Supabase up - degraded state
-            # Can still do RAG/RLHF but async processing affected
-            return FallbackLevel.DEGRADED_RAG
-
-        # All services healthy
-        return FallbackLevel.FULL
+        return _LEVEL_TABLE[self.mask]
 
 
 # Global health status instance
 _health_status = HealthStatus()
 
+# Levels forced by active FallbackContext blocks, innermost last. A ContextVar
+# rather than a thread-local so overrides also stay scoped to one asyncio task.
+_level_overrides: contextvars.ContextVar[tuple[FallbackLevel, ...]] = contextvars.ContextVar(
+    "fallback_level_overrides", default=()
+)
+
 
 def get_health_status() -> HealthStatus:
     """Get global health status instance."""
     return _health_status
 
 
+def force_recheck(service: str | None = None) -> None:
+    """Let the next call to an unhealthy service through without waiting for the interval."""
+    _health_status.force_recheck(service)
+
+
 def get_fallback_level() -> FallbackLevel:
-    """Get current system fallback level."""
+    """Get current system fallback level, honouring any active FallbackContext."""
+    overrides = _level_overrides.get()
+    if overrides:
+        return overrides[-1]
     return _health_status.get_fallback_level()
 
 
@@ -130,6 +223,8 @@ def with_supabase_fallback(
     Decorator for graceful Supabase connection failure handling.
 
     If Supabase connection fails, updates health status and returns fallback value.
+    While Supabase is marked unhealthy, calls return the fallback immediately until
+    the health check interval has passed since the last failed attempt.
 
     Args:
         fallback_return: Value to return if Supabase fails
@@ -143,22 +238,31 @@ def with_supabase_fallback(
     """
 
     def decorator(func: Callable) -> Callable:
+        log_func = getattr(logger, log_level, logger.warning)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            # Known down and not yet due for a retry: skip the call (and its timeout)
+            if not _health_status.supabase_healthy and not _health_status.should_check_health(
+                "supabase"
+            ):
+                return fallback_return
+
             try:
                 result = func(*args, **kwargs)
 
-                # Update health status on success
-                _health_status.set_supabase_health(True)
+                # Update health status on success (only on recovery)
+                if not _health_status.supabase_healthy:
+                    _health_status.set_supabase_health(True)
 
                 return result
 
             except Exception as e:
-                # Update health status on failure
+                # Update health status on failure; the failed call counts as a probe
                 _health_status.set_supabase_health(False)
+                _health_status.last_probe["supabase"] = time.time()
 
                 # Log the failure
-                log_func = getattr(logger, log_level, logger.warning)
                 log_func(
                     f"Supabase connection failed in {func.__name__}: {e}. "
                     f"Fallback level: {_health_status.get_fallback_level().value}"
@@ -190,6 +294,8 @@ def with_redis_fallback(
     Decorator for graceful Redis connection failure handling.
 
     If Redis connection fails, updates health status and returns fallback value.
+    While Redis is marked unhealthy, calls return the fallback immediately until
+    the health check interval has passed since the last failed attempt.
 
     Args:
         fallback_return: Value to return if Redis fails
@@ -203,22 +309,29 @@ def with_redis_fallback(
     """
 
     def decorator(func: Callable) -> Callable:
+        log_func = getattr(logger, log_level, logger.warning)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            # Known down and not yet due for a retry: skip the call (and its timeout)
+            if not _health_status.redis_healthy and not _health_status.should_check_health("redis"):
+                return fallback_return
+
             try:
                 result = func(*args, **kwargs)
 
-                # Update health status on success
-                _health_status.set_redis_health(True)
+                # Update health status on success (only on recovery)
+                if not _health_status.redis_healthy:
+                    _health_status.set_redis_health(True)
 
                 return result
 
             except Exception as e:
-                # Update health status on failure
+                # Update health status on failure; the failed call counts as a probe
                 _health_status.set_redis_health(False)
+                _health_status.last_probe["redis"] = time.time()
 
                 # Log the failure
-                log_func = getattr(logger, log_level, logger.warning)
                 log_func(
                     f"Redis connection failed in {func.__name__}: {e}. "
                     f"Fallback level: {_health_status.get_fallback_level().value}"
@@ -242,64 +355,107 @@ class LLMConnectionError(Exception):
     pass
 
 
+def _next_backoff(previous: float, base: float, cap: float) -> float:
+    """Decorrelated-jitter backoff: random wait in [base, 3 * previous], capped."""
+    return min(cap, random.uniform(base, previous * 3))
+
+
 def with_llm_fallback(
     fallback_return: Any = None,
     max_retries: int = 2,
     log_level: str = "error",
+    retryable_exceptions: tuple[type[BaseException], ...] = LLM_RETRYABLE_EXCEPTIONS,
+    backoff_base: float = 1.0,
+    backoff_cap: float = 8.0,
 ) -> Callable:
     """
     Decorator for graceful LLM API connection failure handling.
 
     If LLM connection fails, updates health status and returns fallback value.
+    Only retryable_exceptions are retried, with decorrelated-jitter backoff
+    so concurrent callers don't retry in lockstep; any other error (e.g.
+    authentication or 4xx) falls back immediately. Coroutine functions are
+    wrapped with an async variant that awaits asyncio.sleep between attempts.
 
     Args:
         fallback_return: Value to return if LLM fails
         max_retries: Number of retries before giving up
         log_level: Log level for failure messages (default: error)
+        retryable_exceptions: Exception types worth retrying
+        backoff_base: Minimum wait between attempts in seconds
+        backoff_cap: Maximum wait between attempts in seconds
 
     Example:
-        @with_llm_fallback(fallback_return="", max_retries=2)
+        @with_llm_fallback(
+            fallback_return="",
+            max_retries=2,
+            retryable_exceptions=(openai.APIConnectionError, openai.RateLimitError),
+        )
         def generate_review(diff: str) -> str:
             # LLM API call code
             pass
     """
 
     def decorator(func: Callable) -> Callable:
+        log_func = getattr(logger, log_level, logger.error)
+
+        def next_wait(e: Exception, attempt: int, previous_wait: float) -> float | None:
+            """Return seconds to wait before retrying, or None to give up."""
+            if attempt <= max_retries and isinstance(e, retryable_exceptions):
+                wait_time = _next_backoff(previous_wait, backoff_base, backoff_cap)
+                logger.warning(
+                    f"LLM connection failed, retrying in {wait_time:.1f}s... "
+                    f"(attempt {attempt}/{max_retries})"
+                )
+                return wait_time
+
+            # Update health status on final failure
+            _health_status.set_llm_health(False)
+
+            # Log the failure
+            log_func(
+                f"LLM connection failed in {func.__name__} after {attempt - 1} retries: {e}. "
+                f"Fallback level: {_health_status.get_fallback_level().value}"
+            )
+            return None
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                wait_time = backoff_base
+                for attempt in range(1, max_retries + 2):
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        wait_time = next_wait(e, attempt, wait_time)
+                        if wait_time is None:
+                            return fallback_return
+                        await asyncio.sleep(wait_time)
+                    else:
+                        # Update health status on success (only on recovery)
+                        if not _health_status.llm_healthy:
+                            _health_status.set_llm_health(True)
+                        return result
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            retries = 0
-
-            while retries <= max_retries:
+            wait_time = backoff_base
+            for attempt in range(1, max_retries + 2):
                 try:
                     result = func(*args, **kwargs)
-
-                    # Update health status on success
-                    _health_status.set_llm_health(True)
-
-                    return result
-
                 except Exception as e:
-                    retries += 1
-
-                    if retries > max_retries:
-                        # Update health status on final failure
-                        _health_status.set_llm_health(False)
-
-                        # Log the failure
-                        log_func = getattr(logger, log_level, logger.error)
-                        log_func(
-                            f"LLM connection failed in {func.__name__} after {max_retries} retries: {e}. "
-                            f"Fallback level: {_health_status.get_fallback_level().value}"
-                        )
-
+                    wait_time = next_wait(e, attempt, wait_time)
+                    if wait_time is None:
                         return fallback_return
-
-                    # Wait before retry (exponential backoff)
-                    wait_time = 2**retries
-                    logger.warning(
-                        f"LLM connection failed, retrying in {wait_time}s... (attempt {retries}/{max_retries})"
-                    )
                     time.sleep(wait_time)
+                else:
+                    # Update health status on success (only on recovery)
+                    if not _health_status.llm_healthy:
+                        _health_status.set_llm_health(True)
+                    return result
 
         return wrapper
 
@@ -325,17 +481,19 @@ class FallbackContext:
 
     def __init__(self, level: FallbackLevel):
         self.level = level
-        self._previous_level: FallbackLevel | None = None
+        self._token: contextvars.Token | None = None
 
     def __enter__(self) -> "FallbackContext":
-        """Enter fallback context and save previous level."""
-        # For a full implementation, we'd store and restore previous level
-        logger.debug(f"Entering fallback context: {self.level.value}")
+        """Enter fallback context, pushing this level over the current one."""
+        self._token = _level_overrides.set((*_level_overrides.get(), self.level))
+        logger.debug("Entering fallback context: {}", self.level.value)
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Exit fallback context and restore previous level."""
-        logger.debug(f"Exiting fallback context: {self.level.value}")
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        """Exit fallback context and restore the previous level."""
+        _level_overrides.reset(self._token)
+        self._token = None
+        logger.debug("Exiting fallback context: {}", self.level.value)
         return False
 
 
@@ -344,12 +502,21 @@ class FallbackContext:
 # =============================================================================
 
 
-async def check_supabase_health(supabase_client) -> bool:
+# Upper bounds on a single health probe, so a hung backend can't stall the caller
+SUPABASE_PROBE_TIMEOUT = 2.0
+REDIS_PROBE_TIMEOUT = 1.0
+
+
+async def check_supabase_health(supabase_client, force: bool = False) -> bool:
     """
     Check Supabase connection health.
 
+    The probe only runs once per HealthStatus.check_interval; in between,
+    the cached health is returned.
+
     Args:
         supabase_client: Supabase client instance
+        force: Probe even if the check interval has not elapsed
 
     Returns:
         True if healthy, False otherwise
@@ -358,24 +525,34 @@ async def check_supabase_health(supabase_client) -> bool:
         _health_status.set_supabase_health(False)
         return False
 
+    if not force and not _health_status.should_check_health("supabase"):
+        return _health_status.supabase_healthy
+    _health_status.last_probe["supabase"] = time.time()
+
     try:
-        # Simple query to test connection
-        result = supabase_client.table("knowledge_base").select("id").limit(1).execute()
+        # HEAD request for at most one id: PostgREST plans and runs the query but
+        # sends no body. No count is requested, so no table scan either.
+        probe = supabase_client.table("knowledge_base").select("id", head=True).limit(1)
+        await asyncio.wait_for(asyncio.to_thread(probe.execute), timeout=SUPABASE_PROBE_TIMEOUT)
         _health_status.set_supabase_health(True)
         return True
 
     except Exception as e:
         _health_status.set_supabase_health(False)
-        logger.warning(f"Supabase health check failed: {e}")
+        logger.warning(f"Supabase health check failed: {e!r}")
         return False
 
 
-async def check_redis_health(redis_client) -> bool:
+async def check_redis_health(redis_client, force: bool = False) -> bool:
     """
     Check Redis connection health.
 
+    The probe only runs once per HealthStatus.check_interval; in between,
+    the cached health is returned.
+
     Args:
         redis_client: Redis client instance
+        force: Probe even if the check interval has not elapsed
 
     Returns:
         True if healthy, False otherwise
@@ -384,43 +561,81 @@ async def check_redis_health(redis_client) -> bool:
         _health_status.set_redis_health(False)
         return False
 
+    if not force and not _health_status.should_check_health("redis"):
+        return _health_status.redis_healthy
+    _health_status.last_probe["redis"] = time.time()
+
     try:
-        # PING command to test connection
-        redis_client.ping()
+        # PING command to test connection, run off the event loop with a timeout
+        await asyncio.wait_for(asyncio.to_thread(redis_client.ping), timeout=REDIS_PROBE_TIMEOUT)
         _health_status.set_redis_health(True)
         return True
 
     except Exception as e:
         _health_status.set_redis_health(False)
-        logger.warning(f"Redis health check failed: {e}")
+        logger.warning(f"Redis health check failed: {e!r}")
         return False
 
 
 def is_rag_enabled() -> bool:
-    """Check if RAG is enabled based on current fallback level."""
-    level = get_fallback_level()
-    return level in (FallbackLevel.FULL, FallbackLevel.DEGRADED_RLHF)
+    """Check if RAG is enabled based on current fallback level (FULL or DEGRADED_RLHF)."""
+    overrides = _level_overrides.get()
+    if overrides:
+        return overrides[-1] in _RAG_LEVELS
+    return bool(_RAG_ENABLED_MASKS >> _health_status.mask & 1)
 
 
 def is_rlhf_enabled() -> bool:
-    """Check if RLHF is enabled based on current fallback level."""
+    """Check if RLHF is enabled based on current fallback level (FULL or DEGRADED_RAG)."""
+    overrides = _level_overrides.get()
+    if overrides:
+        return overrides[-1] in _RLHF_LEVELS
+    return bool(_RLHF_ENABLED_MASKS >> _health_status.mask & 1)
+
+
+class FeatureFlags(NamedTuple):
+    """Feature availability at one fallback level, from get_feature_flags()."""
+
+    rag: bool
+    rlhf: bool
+    level: FallbackLevel
+
+
+def get_feature_flags() -> FeatureFlags:
+    """
+    Resolve the fallback level once and report which features it allows.
+
+    Prefer this over separate is_rag_enabled()/is_rlhf_enabled() calls when
+    both are needed: the two flags then come from the same health snapshot.
+
+    Example:
+        flags = get_feature_flags()
+        if flags.rag:
+            context = retrieve_rag_context(...)
+        if flags.rlhf:
+            constraints = load_constraints(...)
+    """
     level = get_fallback_level()
-    return level in (FallbackLevel.FULL, FallbackLevel.DEGRADED_RAG)
+    return FeatureFlags(level in _RAG_LEVELS, level in _RLHF_LEVELS, level)
 
 
 # =============================================================================
 # Module Exports
 # =============================================================================
 __all__ = [
+    "LLM_RETRYABLE_EXCEPTIONS",
     "FallbackContext",
     "FallbackLevel",
+    "FeatureFlags",
     "HealthStatus",
     "LLMConnectionError",
     "RedisConnectionError",
     "SupabaseConnectionError",
     "check_redis_health",
     "check_supabase_health",
+    "force_recheck",
     "get_fallback_level",
+    "get_feature_flags",
     "get_health_status",
     "is_rag_enabled",
     "is_rlhf_enabled",
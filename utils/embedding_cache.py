@@ -0,0 +1,112 @@
+"""
+CortexReview Platform - Embedding Cache
+
+Content-addressed cache in front of the embeddings API. Identical inputs
+(retried tasks, re-pushed PRs, hunks shared across branches) are embedded
+once per model and TTL, and reused by every worker process.
+
+Architecture:
+- Keys: blake2b digest of the input text, namespaced by embedding model
+- Values: float32 vectors packed with array('f'), stored in Redis with a TTL
+- Lookups through utils.redis_cache: one MGET, misses computed in a single
+  batched call and written back; Redis errors fall through to computing
+"""
+
+import hashlib
+from array import array
+from collections.abc import Callable, Sequence
+
+import redis
+from loguru import logger
+
+from utils.config import Config
+from utils.redis_cache import create_redis_client, get_or_compute_many
+
+# Redis key namespace for cached embedding vectors
+KEY_PREFIX = "embedding"
+
+# Digest size in bytes; 128 bits keeps collisions out of reach at any realistic volume
+DIGEST_SIZE = 16
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content address of text's embedding under model."""
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=DIGEST_SIZE)
+    return f"{KEY_PREFIX}:{model}:{digest.hexdigest()}"
+
+
+class EmbeddingCache:
+    """
+    Redis-backed embedding cache keyed by model and input content.
+
+    Attributes:
+        redis: Redis client storing packed vectors
+        ttl_seconds: Lifetime of each cached vector
+    """
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int):
+        """
+        Initialize EmbeddingCache.
+
+        Args:
+            client: Redis client (binary responses, i.e. decode_responses=False)
+            ttl_seconds: Lifetime of each cached vector
+        """
+        self.redis = client
+        self.ttl_seconds = ttl_seconds
+
+    def get_or_compute_many(
+        self,
+        texts: Sequence[str],
+        model: str,
+        compute: Callable[[list[str]], list[list[float]]],
+    ) -> list[list[float]]:
+        """
+        Return one embedding per text, computing only the uncached ones.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model identifier (part of the cache key)
+            compute: Embeds a list of texts, returning vectors in input order
+
+        Returns:
+            One embedding per text, in input order
+        """
+        return get_or_compute_many(
+            self.redis,
+            [cache_key(model, text) for text in texts],
+            texts,
+            compute,
+            encode=_pack,
+            decode=_unpack,
+            ttl_seconds=self.ttl_seconds,
+            name="Embedding",
+        )
+
+
+def _pack(embedding: list[float]) -> bytes:
+    return array("f", embedding).tobytes()
+
+
+def _unpack(raw: bytes) -> list[float]:
+    vector = array("f")
+    vector.frombytes(raw)
+    return vector.tolist()
+
+
+def create_embedding_cache(config: Config) -> EmbeddingCache | None:
+    """
+    Factory function to create EmbeddingCache from configuration.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        EmbeddingCache on the Celery broker's Redis, or None if disabled
+    """
+    if not config.EMBEDDING_CACHE_TTL:
+        logger.info("Embedding cache disabled via configuration")
+        return None
+
+    client = create_redis_client(config, "Embedding")
+    return EmbeddingCache(client, config.EMBEDDING_CACHE_TTL) if client else None
@@ -5,15 +5,41 @@ Configures loguru with structured JSON logging for observability (Constitution X
 Supports trace_id binding for request correlation across async tasks.
 """
 
-import inspect
-import json
 import logging
+import os
+import queue
 import sys
 import threading
+import time
+import weakref
+import zipfile
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
+import orjson
 from loguru import logger
 
+# Stdlib levels mapped to loguru level names, resolved once at import
+_LEVEL_MAP: dict[int, str] = {
+    logging.DEBUG: "DEBUG",
+    logging.INFO: "INFO",
+    logging.WARNING: "WARNING",
+    logging.ERROR: "ERROR",
+    logging.CRITICAL: "CRITICAL",
+}
+
+# Frames between emit() and the caller of logger.info()/warning()/...:
+# Handler.handle, Logger.callHandlers, Logger.handle, Logger._log, Logger.<level>
+_CALLER_DEPTH = 6
+
+# Source file of the stdlib logging package, whose frames are skipped
+_LOGGING_FILE = logging.__file__
+
+# Lowest level any configured sink accepts; updated by setup_logging()
+_min_level_no = 0
+
 
 class InterceptHandler(logging.Handler):
     """
@@ -23,20 +49,64 @@ class InterceptHandler(logging.Handler):
     """
 
     def emit(self, record: logging.LogRecord) -> None:
-        # Get corresponding Loguru level if it exists.
-        level: str | int
-        try:
-            level = logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        # Records below every sink's level would be dropped by loguru anyway
+        if record.levelno < _min_level_no:
+            return
 
-        # Find caller from where originated the logged message.
-        frame, depth = inspect.currentframe(), 0
-        while frame and (depth == 0 or frame.f_code.co_filename == logging.__file__):
+        # Get corresponding Loguru level if it exists.
+        level: str | int = _LEVEL_MAP.get(record.levelno) or _custom_level(record)
+
+        # Find caller from where originated the logged message: start past
+        # the fixed Logger.<level>() call chain when it is there, then skip
+        # any further logging frames (logging.log(), logger.exception(), ...).
+        frame = sys._getframe(_CALLER_DEPTH - 1)
+        if frame.f_code.co_filename == _LOGGING_FILE:
+            frame, depth = frame.f_back, _CALLER_DEPTH
+        else:
+            frame, depth = sys._getframe(1), 1
+        while frame and frame.f_code.co_filename == _LOGGING_FILE:
             frame = frame.f_back
             depth += 1
 
-        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+        # Only exception records pay for loguru's exception capture
+        if record.exc_info:
+            opt = logger.opt(depth=depth, exception=record.exc_info)
+        else:
+            opt = logger.opt(depth=depth)
+        opt.log(level, record.getMessage())
+
+
+def _custom_level(record: logging.LogRecord) -> str | int:
+    return _resolve_level(record.levelname, record.levelno)
+
+
+@lru_cache(maxsize=64)
+def _resolve_level(levelname: str, levelno: int) -> str | int:
+    """Loguru level for a non-standard stdlib level, looked up once per name/number."""
+    try:
+        return logger.level(levelname).name
+    except ValueError:
+        return levelno
+
+
+# The one handler installed on the stdlib root logger; reused on reconfiguration
+_intercept_handler = InterceptHandler()
+
+
+# Bound context fields copied into structured records, with their value coercion:
+# trace_id/request_id/task_id correlate requests (Constitution VII), latency_ms
+# and status track operations (Constitution XI), platform/repo_id/pr_number
+# give multi-tenant context
+_STRUCTURED_FIELDS: dict[str, Callable[[Any], Any] | None] = {
+    "trace_id": str,
+    "request_id": str,
+    "latency_ms": int,
+    "status": None,
+    "platform": None,
+    "task_id": str,
+    "repo_id": None,
+    "pr_number": None,
+}
 
 
 def structured_formatter(record: dict[str, Any]) -> str:
@@ -53,7 +123,7 @@ def structured_formatter(record: dict[str, Any]) -> str:
         logger.bind(trace_id=..., request_id=..., latency_ms=..., status=...)
     """
     log_data = {
-        "timestamp": record["time"].isoformat(),
+        "timestamp": record["time"],  # serialized natively by orjson (RFC 3339)
         "level": record["level"].name,
         "message": record["message"],
         "file": record["file"].name,
@@ -61,53 +131,240 @@ def structured_formatter(record: dict[str, Any]) -> str:
         "function": record["function"],
     }
 
-    # Add bound context (trace_id, request_id, latency_ms, status, etc.)
-    extra = record.get("extra", {})
+    # Add bound context in a single pass over the extras
+    for key, value in record.get("extra", {}).items():
+        if key in _STRUCTURED_FIELDS:
+            convert = _STRUCTURED_FIELDS[key]
+            # Values usually arrive as the target type already; None stays null
+            if convert is None or value is None or type(value) is convert:
+                log_data[key] = value
+            else:
+                log_data[key] = convert(value)
 
-    # Trace ID for request correlation (Constitution VII)
-    if "trace_id" in extra:
-        log_data["trace_id"] = str(extra["trace_id"])
+    return orjson.dumps(log_data, option=orjson.OPT_NAIVE_UTC).decode()
 
-    # Request ID for individual request tracking
-    if "request_id" in extra:
-        log_data["request_id"] = str(extra["request_id"])
 
-    # Latency tracking for observability (Constitution XI)
-    if "latency_ms" in extra:
-        log_data["latency_ms"] = int(extra["latency_ms"])
+# =============================================================================
+# Batched File Sink
+# =============================================================================
+
+# Maximum number of records joined into a single write() syscall
+FILE_SINK_BATCH_SIZE = 256
 
-    # Operation status
-    if "status" in extra:
-        log_data["status"] = extra["status"]
+# Size at which a log file is rotated (matches the former "10 MB" rotation)
+FILE_SINK_ROTATION_BYTES = 10 * 1024 * 1024
 
-    # Platform identifier
-    if "platform" in extra:
-        log_data["platform"] = extra["platform"]
+# How often an idle writer wakes to check the file size (forked children write without it)
+FILE_SINK_CHECK_INTERVAL_SEC = 1.0
 
-    # Task ID for Celery task tracking
-    if "task_id" in extra:
-        log_data["task_id"] = str(extra["task_id"])
+# Delay before a rotated file is zipped, so forked writers still holding it can finish
+FILE_SINK_ROTATION_GRACE_SEC = 5.0
 
-    # Repository ID for multi-tenant context
-    if "repo_id" in extra:
-        log_data["repo_id"] = extra["repo_id"]
+# Longest a record waits for more records to share its write() (LOG_FLUSH_INTERVAL_SEC)
+LOG_FLUSH_INTERVAL_SEC = float(os.getenv("LOG_FLUSH_INTERVAL_SEC", "0.5"))
 
-    # PR number for context
-    if "pr_number" in extra:
-        log_data["pr_number"] = extra["pr_number"]
+# Minimum level written to app.log (LOG_FILE_LEVEL); INFO skips debug chatter in production
+LOG_FILE_LEVEL = os.getenv("LOG_FILE_LEVEL", "DEBUG").upper()
 
-    return json.dumps(log_data)
+# Open flags for log files: appends are atomic per write() and need no seek
+_LOG_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+
+
+class BatchedFileSink:
+    """
+    Loguru stream sink that hands formatted records to a single writer thread.
+
+    Replaces enqueue=True, whose multiprocessing queue pickles every record
+    and takes a lock per put. Producers only encode the already-serialized
+    line and put it on a queue.SimpleQueue; one daemon thread drains up to
+    FILE_SINK_BATCH_SIZE records at a time and issues one os.write() per
+    batch to an O_APPEND descriptor. After the first record of a batch the
+    writer lingers up to flush_interval seconds for more, which bounds disk
+    latency while coalescing bursts.
+
+    Only the process that created the sink rotates the file. It checks the
+    on-disk size (which includes appends from forked children, e.g. Celery
+    prefork workers) after each batch and every FILE_SINK_CHECK_INTERVAL_SEC
+    while idle. Forked children never rotate; before each batch they reopen
+    the path if it no longer names the file they hold. A rotated file is
+    zipped only after rotation_grace seconds, so a child that wrote to it
+    just before reopening loses nothing. Archives are pruned after
+    retention_days.
+
+    The sink deliberately has no flush() method: loguru would call it after
+    every record. Pending records are written by stop().
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rotation_bytes: int = FILE_SINK_ROTATION_BYTES,
+        retention_days: int = 10,
+        batch_size: int = FILE_SINK_BATCH_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL_SEC,
+        rotation_grace: float = FILE_SINK_ROTATION_GRACE_SEC,
+    ):
+        self.path = Path(path)
+        self.rotation_bytes = rotation_bytes
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotation_grace = rotation_grace
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Fail at setup time (PermissionError/OSError) rather than in the writer
+        os.close(os.open(self.path, _LOG_OPEN_FLAGS, 0o644))
+        self._owner_pid = os.getpid()
+        # Rotated files awaiting compression, as (monotonic due time, path)
+        self._rotated: list[tuple[float, Path]] = []
+        self._start()
+        _active_file_sinks.add(self)
+
+    def _start(self) -> None:
+        self._rotates = os.getpid() == self._owner_pid
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._writer = threading.Thread(
+            target=self._drain, name=f"log-writer-{self.path.name}", daemon=True
+        )
+        self._writer.start()
+
+    def write(self, message: str) -> None:
+        # With serialize=True the message is already one JSON line ending in "\n"
+        self._queue.put(message.encode())
+
+    def stop(self) -> None:
+        """Flush pending records and stop the writer thread (called by logger.remove())."""
+        _active_file_sinks.discard(self)
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5.0)
+
+    def _drain(self) -> None:
+        fd = os.open(self.path, _LOG_OPEN_FLAGS, 0o644)
+        try:
+            while True:
+                batch, stop = self._collect()
+                if batch:
+                    if not self._rotates:
+                        fd = self._reopen_if_moved(fd)
+                    try:
+                        os.write(fd, b"".join(batch))
+                    except OSError as e:
+                        sys.stderr.write(f"Failed to write {self.path}: {e}\n")
+                if self._rotates:
+                    fd = self._rotate_if_full(fd)
+                    self._compress_rotated(force=stop)
+                if stop:
+                    return
+        finally:
+            os.close(fd)
+
+    def _collect(self) -> tuple[list[bytes], bool]:
+        """Wait for the next batch of records; returns (batch, stop requested)."""
+        get = self._queue.get
+        try:
+            item = get(timeout=FILE_SINK_CHECK_INTERVAL_SEC)
+        except queue.Empty:
+            return [], False
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _reopen_if_moved(self, fd: int) -> int:
+        try:
+            current = os.stat(self.path)
+            held = os.fstat(fd)
+            if (current.st_dev, current.st_ino) == (held.st_dev, held.st_ino):
+                return fd
+        except FileNotFoundError:
+            pass  # renamed by the rotating process and not recreated yet
+        except OSError:
+            return fd
+        os.close(fd)
+        return os.open(self.path, _LOG_OPEN_FLAGS, 0o644)
+
+    def _rotate_if_full(self, fd: int) -> int:
+        try:
+            if os.fstat(fd).st_size < self.rotation_bytes:
+                return fd
+        except OSError:
+            return fd
+        os.close(fd)
+        # Nanoseconds keep names unique when rotations share a second
+        stamp = f"{time.strftime('%Y-%m-%d_%H-%M-%S')}_{time.time_ns() % 1_000_000_000:09d}"
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        try:
+            self.path.replace(rotated)
+        except OSError as e:
+            sys.stderr.write(f"Failed to rotate {self.path}: {e}\n")
+        else:
+            self._rotated.append((time.monotonic() + self.rotation_grace, rotated))
+        return os.open(self.path, _LOG_OPEN_FLAGS, 0o644)
+
+    def _compress_rotated(self, force: bool = False) -> None:
+        now = time.monotonic()
+        while self._rotated and (force or self._rotated[0][0] <= now):
+            _, rotated = self._rotated.pop(0)
+            try:
+                with zipfile.ZipFile(f"{rotated}.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+                    archive.write(rotated, arcname=rotated.name)
+                rotated.unlink()
+                self._prune()
+            except OSError as e:
+                sys.stderr.write(f"Failed to compress {rotated}: {e}\n")
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_days * 86400
+        for archive in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}.zip"):
+            if archive.stat().st_mtime < cutoff:
+                archive.unlink(missing_ok=True)
+
+
+# Sinks whose writer thread must be restarted in forked children (Celery prefork)
+_active_file_sinks: "weakref.WeakSet[BatchedFileSink]" = weakref.WeakSet()
+
+
+def _restart_file_sinks_after_fork() -> None:
+    for sink in list(_active_file_sinks):
+        sink._start()
+
+
+os.register_at_fork(after_in_child=_restart_file_sinks_after_fork)
 
 
 # Thread-safe lock for logging setup
 lock = threading.Lock()
 
+# Console layout, with color markup for interactive terminals
+_CONSOLE_FORMAT = (
+    "<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
+    " | <level>{level: <8}</level>"
+    " | <cyan><b>{line}</b></cyan>"
+    " - <white><b>{message}</b></white>"
+)
+_PLAIN_CONSOLE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {line} - {message}"
+
+# Set once setup_logging() has installed its sinks in this process
+_configured = False
+
 
 def stop_logging() -> None:
     """
     Disable noisy loggers from third-party libraries.
 
-    Reduces log noise from HTTP clients and database drivers.
+    Reduces log noise from HTTP clients and database drivers. Their stdlib
+    loggers are also raised to WARNING, so debug/info calls in those
+    libraries return at the isEnabledFor() check without building a
+    LogRecord; loguru.disable() drops whatever still gets through.
     """
     noisy_loggers = [
         "httpcore",
@@ -120,22 +377,29 @@ def stop_logging() -> None:
         "PIL",
     ]
     for module_name in noisy_loggers:
+        logging.getLogger(module_name).setLevel(logging.WARNING)
         logger.disable(module_name)
 
 
-def setup_logging(log_level: str = "INFO") -> None:
+def setup_logging(log_level: str = "INFO", force: bool = False) -> None:
     """
     Configure loguru for console and file logging.
 
+    Runs once per process; later calls are no-ops unless force is set
+    (e.g. tests that need a different log level).
+
     Args:
         log_level: Minimum log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        force: Reconfigure even if logging was already set up
 
     Configuration:
     - Console: Human-readable colored output for development
-    - File: Structured JSON for log aggregation (Constitution XI)
+    - File: Structured JSON for log aggregation (Constitution XI), from LOG_FILE_LEVEL
     - Rotation: 10 MB per file
-    - Retention: 10 days
+    - Retention: 10 days (30 days for error.log)
     - Compression: ZIP
+    - Writes: batched by a single writer thread per file (BatchedFileSink),
+      at most LOG_FLUSH_INTERVAL_SEC (env, default 0.5 s) behind the caller
 
     Trace ID Binding:
         Use logger.bind(trace_id=...) to add correlation ID to all logs.
@@ -157,12 +421,20 @@ def setup_logging(log_level: str = "INFO") -> None:
         latency_ms = int((time.time() - start_time) * 1000)
         logger.bind(request_id=request_id, trace_id=trace_id, latency_ms=latency_ms, status="success").info("LLM request completed")
     """
+    global _configured, _min_level_no
+
     with lock:
-        # Intercept standard logging
-        logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+        if _configured and not force:
+            return
+
+        # Intercept standard logging. InterceptHandler locates the caller for
+        # loguru itself, so skip the stdlib's own findCaller() frame walk.
+        logging.basicConfig(handlers=[_intercept_handler], level=0, force=True)
+        logging._srcfile = None
 
-        # Remove all other logger handlers and propagate to root
-        for name in logging.root.manager.loggerDict.keys():
+        # Remove all other logger handlers and propagate to root (snapshot the
+        # names, since getLogger() may register placeholders while iterating)
+        for name in tuple(logging.root.manager.loggerDict):
             logging.getLogger(name).handlers = []
             logging.getLogger(name).propagate = True
 
@@ -175,19 +447,17 @@ def setup_logging(log_level: str = "INFO") -> None:
         # -------------------------------------------------------------------------
         # Console Handler: Human-readable colored output (development)
         # -------------------------------------------------------------------------
+        # Colors only on a terminal; container stdout gets the plain layout
+        colorize = sys.stdout.isatty()
         logger.add(
             sink=sys.stdout,
-            format=(
-                "<white>{time:YYYY-MM-DD HH:mm:ss}</white>"
-                " | <level>{level: <8}</level>"
-                " | <cyan><b>{line}</b></cyan>"
-                " - <white><b>{message}</b></white>"
-            ),
+            format=_CONSOLE_FORMAT if colorize else _PLAIN_CONSOLE_FORMAT,
             level=log_level,
-            colorize=True,
+            colorize=colorize,
             backtrace=True,
             diagnose=True,
         )
+        min_level = logger.level(log_level.upper()).no
 
         # -------------------------------------------------------------------------
         # File Handler: Structured JSON for log aggregation (Constitution XI)
@@ -195,15 +465,12 @@ def setup_logging(log_level: str = "INFO") -> None:
         # Gracefully handle permission errors (e.g., in containerized environments)
         try:
             logger.add(
-                sink="./logs/app.log",
+                sink=BatchedFileSink("./logs/app.log", retention_days=10),
                 format="{message}",  # Raw message - structured JSON added via bind()
-                level="DEBUG",
-                rotation="10 MB",
-                retention="10 days",
-                compression="zip",
-                enqueue=True,  # Thread-safe logging
+                level=LOG_FILE_LEVEL,
                 serialize=True,  # Enable JSON serialization
             )
+            min_level = min(min_level, logger.level(LOG_FILE_LEVEL).no)
         except (PermissionError, OSError) as e:
             # Fall back to console-only logging if file logging fails
             logger.warning(f"File logging disabled due to permission error: {e}")
@@ -211,19 +478,17 @@ def setup_logging(log_level: str = "INFO") -> None:
         # Optional: Separate file for errors
         try:
             logger.add(
-                sink="./logs/error.log",
+                sink=BatchedFileSink("./logs/error.log", retention_days=30),
                 format="{message}",  # Raw message - structured JSON added via bind()
                 level="ERROR",
-                rotation="10 MB",
-                retention="30 days",
-                compression="zip",
-                enqueue=True,
                 serialize=True,  # Enable JSON serialization
             )
         except (PermissionError, OSError) as e:
             logger.warning(f"Error file logging disabled due to permission error: {e}")
 
-        logger.opt(colors=True)
+        # Let InterceptHandler drop stdlib records no sink will accept
+        _min_level_no = min_level
+        _configured = True
 
 
 def get_logger(trace_id: str = None, **kwargs):
@@ -254,6 +519,11 @@ def get_logger(trace_id: str = None, **kwargs):
 # Module Exports
 # =============================================================================
 __all__ = [
+    "FILE_SINK_BATCH_SIZE",
+    "FILE_SINK_ROTATION_BYTES",
+    "LOG_FILE_LEVEL",
+    "LOG_FLUSH_INTERVAL_SEC",
+    "BatchedFileSink",
     "InterceptHandler",
     "get_logger",
     "logger",
@@ -5,6 +5,13 @@ Defines all metrics emitted for monitoring system performance,
 costs, and operational health per Constitution XI (Observability).
 """
 
+import inspect
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from functools import lru_cache, wraps
+
 import redis
 from celery import Celery
 from prometheus_client import Counter, Gauge, Histogram, Summary
@@ -128,6 +135,11 @@ celery_worker_active_tasks = Gauge(
     labelnames=("worker_name",),
 )
 
+celery_metrics_collector_last_success_seconds = Gauge(
+    "cortexreview_celery_metrics_collector_last_success_seconds",
+    "Unix time of the last fully successful Celery metrics collection",
+)
+
 celery_task_duration_seconds = Histogram(
     "cortexreview_celery_task_duration_seconds",
     "Time taken for Celery task execution",
@@ -198,6 +210,31 @@ webhook_parse_errors_total = Counter(
     labelnames=("platform", "error_type"),
 )
 
+# Platforms accepted by POST /v1/webhook/{platform}
+WEBHOOK_PLATFORMS = ("github", "gitea")
+
+# Parse failure kinds reported by the webhook endpoint
+WEBHOOK_PARSE_ERROR_TYPES = ("invalid_json", "invalid_payload")
+
+# Webhook counters run on every request, so their inc methods are bound once per label set
+_WEBHOOK_RECEIVED = {
+    platform: webhook_received_total.labels(platform=platform).inc for platform in WEBHOOK_PLATFORMS
+}
+_WEBHOOK_SIGNATURE_VERIFIED = {
+    (platform, result): webhook_signature_verified_total.labels(
+        platform=platform, result=result
+    ).inc
+    for platform in WEBHOOK_PLATFORMS
+    for result in ("success", "failure")
+}
+_WEBHOOK_PARSE_ERRORS = {
+    (platform, error_type): webhook_parse_errors_total.labels(
+        platform=platform, error_type=error_type
+    ).inc
+    for platform in WEBHOOK_PLATFORMS
+    for error_type in WEBHOOK_PARSE_ERROR_TYPES
+}
+
 # ============================================================================
 # Error Metrics
 # ============================================================================
@@ -213,13 +250,68 @@ error_total = Counter(
 # ============================================================================
 
 
+class MetricBatch:
+    """
+    Accumulate counter increments and apply them once per label set.
+
+    Each Counter.labels(...).inc() takes the metric's lock; inside a loop
+    over files or chunks, collect increments here instead and they are
+    applied on exit, one inc() per distinct (counter, labels) pair.
+
+    Example:
+        with MetricBatch() as batch:
+            for file_path in files:
+                ...
+                batch.inc(indexing_files_processed_total, repo_id)
+    """
+
+    def __init__(self):
+        self._pending: defaultdict[tuple[Counter, tuple[str, ...]], float] = defaultdict(float)
+
+    def inc(self, counter: Counter, *labelvalues: str, amount: float = 1.0) -> None:
+        """Record an increment of counter for the given label values (in labelnames order)."""
+        self._pending[counter, labelvalues] += amount
+
+    def flush(self) -> None:
+        """Apply the accumulated increments and reset the batch."""
+        pending, self._pending = self._pending, defaultdict(float)
+        for (counter, labelvalues), amount in pending.items():
+            counter.labels(*labelvalues).inc(amount)
+
+    def __enter__(self) -> "MetricBatch":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Work completed before an error still counts
+        self.flush()
+
+
 def track_review_duration(platform: str, status: str):
-    """Decorator to track review duration."""
+    """Decorator to track review duration of sync or async functions."""
+    # Labels are fixed per decorated function, so resolve the child once
+    duration = review_duration_seconds.labels(platform=platform, status=status)
 
     def decorator(func):
+        # Timing the call of a coroutine function alone would only measure coroutine creation
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    duration.observe(time.perf_counter() - start)
+
+            return async_wrapper
+
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            with review_duration_seconds.labels(platform=platform, status=status).time():
+            start = time.perf_counter()
+            try:
                 return func(*args, **kwargs)
+            finally:
+                duration.observe(time.perf_counter() - start)
 
         return wrapper
 
@@ -227,32 +319,126 @@ def track_review_duration(platform: str, status: str):
 
 
 def track_llm_request(model_type: str, model_name: str):
-    """Decorator to track LLM request duration and tokens."""
+    """Decorator to track LLM request duration and tokens of sync or async functions."""
+    # Labels are fixed per decorated function, so resolve the children once
+    duration = llm_request_duration_seconds.labels(model_type=model_type, model_name=model_name)
+    tokens_total = llm_tokens_total.labels(model_type=model_type, model_name=model_name)
+
+    def record_tokens(result) -> None:
+        # Extract token count if available in result
+        if hasattr(result, "usage"):
+            tokens_total.inc(result.usage.total_tokens)
 
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                finally:
+                    duration.observe(time.perf_counter() - start)
+                record_tokens(result)
+                return result
+
+            return async_wrapper
+
+        @wraps(func)
         def wrapper(*args, **kwargs):
-            with llm_request_duration_seconds.labels(
-                model_type=model_type, model_name=model_name
-            ).time():
+            start = time.perf_counter()
+            try:
                 result = func(*args, **kwargs)
-                # Extract token count if available in result
-                if hasattr(result, "usage"):
-                    tokens = result.usage.total_tokens
-                    llm_tokens_total.labels(model_type=model_type, model_name=model_name).inc(
-                        tokens
-                    )
-                return result
+            finally:
+                duration.observe(time.perf_counter() - start)
+            record_tokens(result)
+            return result
 
         return wrapper
 
     return decorator
 
 
+def record_webhook_received(platform: str) -> None:
+    """Count a received webhook."""
+    inc = _WEBHOOK_RECEIVED.get(platform)
+    if inc is None:
+        inc = webhook_received_total.labels(platform=platform).inc
+    inc()
+
+
+def record_webhook_signature(platform: str, valid: bool) -> None:
+    """Count a webhook signature verification outcome."""
+    result = "success" if valid else "failure"
+    inc = _WEBHOOK_SIGNATURE_VERIFIED.get((platform, result))
+    if inc is None:
+        inc = webhook_signature_verified_total.labels(platform=platform, result=result).inc
+    inc()
+
+
+def record_webhook_parse_error(platform: str, error_type: str) -> None:
+    """Count a webhook payload that could not be parsed."""
+    inc = _WEBHOOK_PARSE_ERRORS.get((platform, error_type))
+    if inc is None:
+        inc = webhook_parse_errors_total.labels(platform=platform, error_type=error_type).inc
+    inc()
+
+
 # ============================================================================
 # Celery Metrics Collection Functions (T081-T082)
 # ============================================================================
 
 
+# Connect/read timeout for queue depth scrapes, so a stalled broker can't hang the collector
+QUEUE_DEPTH_SOCKET_TIMEOUT = 2.0
+
+
+@lru_cache(maxsize=16)
+def _redis_for(broker_url: str) -> redis.Redis:
+    """Shared client (and connection pool) per broker URL for metrics scrapes."""
+    return redis.Redis.from_url(
+        broker_url,
+        decode_responses=True,
+        socket_timeout=QUEUE_DEPTH_SOCKET_TIMEOUT,
+        socket_connect_timeout=QUEUE_DEPTH_SOCKET_TIMEOUT,
+    )
+
+
+def update_celery_queue_depths(
+    broker_url: str,
+    queue_names: Sequence[str],
+) -> dict[str, int] | None:
+    """
+    Update Celery queue depth gauges for several queues (T081).
+
+    All LLEN commands go out in one non-transactional Redis pipeline, so
+    any number of queues costs a single round-trip.
+
+    Args:
+        broker_url: Redis broker URL (e.g., redis://localhost:6379/0 or rediss://...)
+        queue_names: Celery queue names to monitor
+
+    Returns:
+        Dict mapping queue_name -> depth, or None if the query fails
+    """
+    try:
+        # redis-py parses redis://, rediss:// (TLS), credentials and unix://
+        # sockets itself; other brokers (e.g. amqp://) raise ValueError here
+        pipe = _redis_for(broker_url).pipeline(transaction=False)
+        for queue_name in queue_names:
+            pipe.llen(queue_name)
+        depths = dict(zip(queue_names, pipe.execute(), strict=True))
+
+        for queue_name, queue_depth in depths.items():
+            celery_queue_depth.labels(queue_name=queue_name).set(queue_depth)
+
+        return depths
+
+    except Exception:
+        # Silent failure - metrics should not crash application
+        return None
+
+
 def update_celery_queue_depth(
     broker_url: str,
     queue_name: str = "celery",
@@ -269,35 +455,118 @@ def update_celery_queue_depth(
     Returns:
         Current queue depth or None if query fails
     """
-    try:
-        # Parse Redis URL
-        if broker_url.startswith("redis://"):
-            # Extract host and db from URL
-            # Format: redis://localhost:6379/0
-            url_parts = broker_url.replace("redis://", "").split("/")
-            host_port = url_parts[0]
-            db = int(url_parts[1]) if len(url_parts) > 1 else 0
-
-            # Connect to Redis
-            r = redis.from_url(f"redis://{host_port}/{db}", decode_responses=True)
-
-            # Get queue length (list length for queue key)
-            queue_key = queue_name  # Default Celery queue key
-            queue_depth = r.llen(queue_key)
-
-            # Update gauge
-            celery_queue_depth.labels(queue_name=queue_name).set(queue_depth)
+    depths = update_celery_queue_depths(broker_url, (queue_name,))
+    return None if depths is None else depths[queue_name]
 
-            return queue_depth
 
-    except Exception:
-        # Silent failure - metrics should not crash application
-        pass
+# Seconds to wait before reconnecting the task event receiver after a broker error
+EVENT_MONITOR_RETRY_SECONDS = 5.0
 
-    return None
+# Worker name -> tasks currently executing, kept current from Celery task events
+_active_by_worker: dict[str, int] = {}
+
+# Set while the task event receiver is consuming, so scrapes can skip inspect().active()
+_events_connected = threading.Event()
+
+# Collections served from task events before inspect().active() reseeds the counts,
+# so a missed or unmatched event cannot skew the gauge for long
+EVENT_RESEED_INTERVALS = 6
+
+
+def _set_worker_active_tasks(worker_name: str, active_count: int) -> None:
+    _active_by_worker[worker_name] = active_count
+    celery_worker_active_tasks.labels(worker_name=worker_name).set(active_count)
+
+
+def _on_task_started(event: dict) -> None:
+    worker_name = event["hostname"]
+    _set_worker_active_tasks(worker_name, _active_by_worker.get(worker_name, 0) + 1)
+
+
+def _on_task_finished(event: dict) -> None:
+    worker_name = event["hostname"]
+    # A task started before the counts were seeded may finish without a matching start
+    _set_worker_active_tasks(worker_name, max(_active_by_worker.get(worker_name, 0) - 1, 0))
+
+
+def _on_worker_offline(event: dict) -> None:
+    _set_worker_active_tasks(event["hostname"], 0)
+
+
+_TASK_EVENT_HANDLERS = {
+    "task-started": _on_task_started,
+    "task-succeeded": _on_task_finished,
+    "task-failed": _on_task_finished,
+    "task-retried": _on_task_finished,
+    "task-revoked": _on_task_finished,
+    "task-rejected": _on_task_finished,
+    "worker-offline": _on_worker_offline,
+}
+
+
+def _capture_task_events(celery_app: Celery, stop: threading.Event) -> None:
+    with celery_app.connection_for_read() as connection:
+        receiver = celery_app.events.Receiver(connection, handlers=_TASK_EVENT_HANDLERS)
 
+        # Called before every drain (at least once a second), so a stop is noticed promptly
+        def on_iteration():
+            _events_connected.set()
+            receiver.should_stop = stop.is_set()
 
-def update_celery_worker_active_tasks(celery_app: Celery) -> dict | None:
+        receiver.on_iteration = on_iteration
+        receiver.capture(limit=None, timeout=None, wakeup=False)
+
+
+def start_celery_event_monitor(
+    celery_app: Celery,
+    stop_event: threading.Event | None = None,
+) -> threading.Thread:
+    """
+    Start background thread keeping worker active task gauges current from task events.
+
+    Workers publish task events (worker_send_task_events), so active task
+    counts can be maintained locally instead of broadcasting
+    inspect().active() to every worker on each scrape. Until the receiver
+    is consuming, and after broker errors, the collector falls back to
+    inspect().active(), which also reseeds the counts; while connected it
+    still reseeds every EVENT_RESEED_INTERVALS collections.
+
+    Args:
+        celery_app: Celery application instance
+        stop_event: Set to stop the monitor (e.g. on shutdown or in tests)
+
+    Returns:
+        The started daemon thread
+    """
+    stop = stop_event or threading.Event()
+
+    def monitor():
+        """Event capture loop, reconnecting after broker errors."""
+        while not stop.is_set():
+            try:
+                _capture_task_events(celery_app, stop)
+            except Exception:
+                # Silent failure - fall back to inspect() until reconnected
+                pass
+            finally:
+                _events_connected.clear()
+
+            stop.wait(EVENT_MONITOR_RETRY_SECONDS)
+
+    monitor_thread = threading.Thread(
+        target=monitor,
+        name="celery_event_monitor",
+        daemon=True,
+    )
+    monitor_thread.start()
+
+    return monitor_thread
+
+
+def update_celery_worker_active_tasks(
+    celery_app: Celery,
+    timeout: float = 0.5,
+) -> dict | None:
     """
     Update Celery worker active tasks gauge (T082).
 
@@ -305,13 +574,14 @@ def update_celery_worker_active_tasks(celery_app: Celery) -> dict | None:
 
     Args:
         celery_app: Celery application instance
+        timeout: Seconds to wait for worker replies to the inspect broadcast
 
     Returns:
         Dict mapping worker_name -> active_task_count or None if query fails
     """
     try:
         # Get active tasks from Celery
-        inspect = celery_app.control.inspect()
+        inspect = celery_app.control.inspect(timeout=timeout)
         active_tasks = inspect.active()
 
         if not active_tasks:
@@ -322,8 +592,8 @@ def update_celery_worker_active_tasks(celery_app: Celery) -> dict | None:
             # Count active tasks for this worker
             active_count = len(tasks) if tasks else 0
 
-            # Update gauge
-            celery_worker_active_tasks.labels(worker_name=worker_name).set(active_count)
+            # Update gauge and reseed the event-driven counts
+            _set_worker_active_tasks(worker_name, active_count)
 
             worker_stats[worker_name] = active_count
 
@@ -341,38 +611,67 @@ def start_celery_metrics_collector(
     broker_url: str,
     queue_name: str = "celery",
     interval_seconds: int = 10,
+    stop_event: threading.Event | None = None,
+    inspect_timeout: float = 0.5,
+    use_events: bool = True,
 ):
     """
     Start background thread to collect Celery metrics (T081-T082).
 
     This function should be called during worker startup to begin
     periodic collection of Celery queue depth and worker metrics.
+    Collections are scheduled on a monotonic clock, so a slow broker or
+    inspect broadcast shortens the following wait instead of shifting
+    every later collection.
 
     Args:
         celery_app: Celery application instance
         broker_url: Redis broker URL
         queue_name: Celery queue name to monitor
         interval_seconds: Collection interval (default 10 seconds)
+        stop_event: Set to stop the collector (e.g. on shutdown or in tests)
+        inspect_timeout: Seconds to wait for workers to answer inspect().active()
+        use_events: Track worker active tasks from task events via
+            start_celery_event_monitor(), broadcasting inspect().active()
+            only while the event receiver is not consuming and every
+            EVENT_RESEED_INTERVALS collections to reseed the counts
     """
-    import threading
-    import time
+    stop = stop_event or threading.Event()
+    if use_events:
+        start_celery_event_monitor(celery_app, stop_event=stop)
 
     def collect_metrics():
         """Background metrics collection loop."""
+        deadline = time.monotonic()
+        event_collections = 0
         while True:
             try:
-                # Update queue depth (T081)
-                update_celery_queue_depth(broker_url, queue_name)
-
-                # Update worker active tasks (T082)
-                update_celery_worker_active_tasks(celery_app)
+                # Update queue depth (T081) and worker active tasks (T082)
+                depth = update_celery_queue_depth(broker_url, queue_name)
+                if (
+                    use_events
+                    and _events_connected.is_set()
+                    and event_collections < EVENT_RESEED_INTERVALS - 1
+                ):
+                    event_collections += 1
+                    workers = dict(_active_by_worker)
+                else:
+                    event_collections = 0
+                    workers = update_celery_worker_active_tasks(celery_app, timeout=inspect_timeout)
+                if depth is not None and workers is not None:
+                    celery_metrics_collector_last_success_seconds.set_to_current_time()
 
             except Exception:
                 # Silent failure - metrics collector should not crash
                 pass
 
-            # Wait for next collection
-            time.sleep(interval_seconds)
+            # Wait for next collection; after an overrun, restart the schedule
+            deadline += interval_seconds
+            now = time.monotonic()
+            if deadline < now:
+                deadline = now + interval_seconds
+            if stop.wait(deadline - now):
+                return
 
     # Start daemon thread
     collector_thread = threading.Thread(
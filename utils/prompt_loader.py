@@ -7,9 +7,16 @@ files with YAML front matter support and variable substitution.
 
 import os
 import re
+from functools import lru_cache
 
 from loguru import logger
 
+# ${variable} placeholders substituted by _substitute_variables()
+_VAR_RE = re.compile(r"\$\{([a-zA-Z0-9_]+)\}")
+
+# Directory holding the prompt Markdown files
+_PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "prompts")
+
 # Default fallback prompt when no prompt file is available
 _FALLBACK_PROMPT = """You are a senior code reviewer. Analyze the provided code diff for:
 - Security vulnerabilities
@@ -64,6 +71,23 @@ def _strip_yaml_front_matter(content: str) -> tuple[str, dict]:
         return content, {}
 
 
+def _strip_front_matter(content: str) -> str:
+    """
+    Remove YAML front matter without parsing it.
+
+    Same result as _strip_yaml_front_matter()[0], but pure string
+    operations: load_prompt() never uses the metadata.
+    """
+    if not content.startswith("---"):
+        return content
+
+    parts = content.split("---", 2)
+    if len(parts) == 3:
+        return parts[2].strip()
+    # Malformed - fallback to naive strip
+    return content.replace("---", "", 1)
+
+
 def _substitute_variables(content: str, context: dict[str, str]) -> str:
     """
     Replace ${variable} placeholders with actual values.
@@ -88,7 +112,22 @@ def _substitute_variables(content: str, context: dict[str, str]) -> str:
         logger.warning("Variable ${" + var_name + "} not found in context, leaving placeholder")
         return match.group(0)
 
-    return re.sub(r"\$\{([a-zA-Z0-9_]+)\}", replacer, content)
+    return _VAR_RE.sub(replacer, content)
+
+
+@lru_cache(maxsize=32)
+def _load_template(file_path: str) -> str:
+    """
+    Read a prompt file and strip its front matter, once per path.
+
+    Prompt files ship with the code and do not change at runtime; call
+    _load_template.cache_clear() after editing one in a live process.
+    Missing files raise (and are not cached), so they are retried.
+    """
+    with open(file_path, encoding="utf-8") as f:
+        content = f.read()
+
+    return _strip_front_matter(content)
 
 
 def load_prompt(filename: str, context: dict[str, str] | None = None) -> str:
@@ -96,7 +135,7 @@ def load_prompt(filename: str, context: dict[str, str] | None = None) -> str:
     Load a prompt from a markdown file in ./prompts/ directory.
 
     Performs the following operations:
-    1. Reads the file from ./prompts/{filename}
+    1. Reads the file from ./prompts/{filename} (cached after the first load)
     2. Strips YAML front matter (content between --- markers)
     3. Replaces ${variable} placeholders with values from context dict
     4. Falls back to a safe default prompt if file is missing
@@ -124,19 +163,14 @@ def load_prompt(filename: str, context: dict[str, str] | None = None) -> str:
     context.setdefault("locale", "zh-cn")
     context.setdefault("input-focus", "general best practices")
 
-    file_path = os.path.join(os.path.dirname(__file__), "..", "prompts", filename)
+    file_path = os.path.join(_PROMPTS_DIR, filename)
 
     try:
-        with open(file_path, encoding="utf-8") as f:
-            content = f.read()
-
-        # 1. Strip YAML Front Matter
-        content, metadata = _strip_yaml_front_matter(content)
+        # 1. Read and strip YAML front matter (cached per file)
+        content = _load_template(file_path)
 
         # 2. Variable Substitution
-        content = _substitute_variables(content, context)
-
-        return content
+        return _substitute_variables(content, context)
 
     except FileNotFoundError:
         logger.warning(f"Prompt file {file_path} not found, using fallback prompt")
@@ -145,3 +179,27 @@ def load_prompt(filename: str, context: dict[str, str] | None = None) -> str:
     except Exception as e:
         logger.warning(f"Error loading prompt file {file_path}: {e}, using fallback prompt")
         return _substitute_variables(_FALLBACK_PROMPT, context)
+
+
+def load_prompt_with_metadata(
+    filename: str, context: dict[str, str] | None = None
+) -> tuple[str, dict]:
+    """
+    Load a prompt like load_prompt(), also returning its parsed YAML front matter.
+
+    Args:
+        filename: Name of the prompt file (e.g., "code-review-pr.md")
+        context: Optional dictionary of variable substitutions
+
+    Returns:
+        Tuple of (processed_prompt, metadata_dict); metadata is empty when
+        the file has no front matter or cannot be read
+    """
+    file_path = os.path.join(_PROMPTS_DIR, filename)
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            _content, metadata = _strip_yaml_front_matter(f.read())
+    except OSError:
+        metadata = {}
+
+    return load_prompt(filename, context), metadata
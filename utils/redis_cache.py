@@ -0,0 +1,128 @@
+"""
+CortexReview Platform - Redis Batch Cache
+
+Read-through lookup shared by the content-addressed caches (embeddings,
+review responses). Callers supply the keys and how values are encoded;
+this module does the Redis round trips.
+
+Architecture:
+- One MGET per lookup; misses computed in a single call and written back pipelined
+- Duplicate keys within a lookup are computed once
+- Graceful degradation: Redis errors fall through to computing every input
+"""
+
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+import redis
+from loguru import logger
+
+from utils.config import Config
+
+# Connect/read timeout, so a stalled Redis can't hold up a review
+SOCKET_TIMEOUT = 0.5
+
+InputT = TypeVar("InputT")
+ValueT = TypeVar("ValueT")
+
+
+def get_or_compute_many(
+    client: redis.Redis,
+    keys: Sequence[str],
+    inputs: Sequence[InputT],
+    compute: Callable[[list[InputT]], list[ValueT]],
+    *,
+    encode: Callable[[ValueT], bytes],
+    decode: Callable[[bytes], ValueT],
+    ttl_seconds: int,
+    name: str,
+    cacheable: Callable[[ValueT], bool] | None = None,
+    hit_log_level: str = "DEBUG",
+) -> list[ValueT]:
+    """
+    Return one value per input, computing only those whose key is not cached.
+
+    Args:
+        client: Redis client (binary responses, i.e. decode_responses=False)
+        keys: Cache key of each input, in input order
+        inputs: Inputs passed to compute on a miss
+        compute: Computes a list of inputs, returning values in input order
+        encode: Serializes a computed value for Redis
+        decode: Deserializes a cached value
+        ttl_seconds: Lifetime of each written value
+        name: Cache name used in log messages (e.g. "Embedding")
+        cacheable: Optional filter; computed values it rejects are not written back
+        hit_log_level: Level of the per-lookup hit ratio log line
+
+    Returns:
+        One value per input, in input order
+    """
+    if not inputs:
+        return []
+
+    try:
+        cached = client.mget(keys)
+    except redis.RedisError as e:
+        logger.warning(f"{name} cache unavailable, computing {len(inputs)} inputs: {e}")
+        return compute(list(inputs))
+
+    values: list[ValueT | None] = [None if raw is None else decode(raw) for raw in cached]
+    # Positions of each missing key, so duplicate inputs are computed once
+    missing: dict[str, list[int]] = {}
+    for i, (key, raw) in enumerate(zip(keys, cached, strict=True)):
+        if raw is None:
+            missing.setdefault(key, []).append(i)
+
+    if missing:
+        computed = compute([inputs[positions[0]] for positions in missing.values()])
+        for positions, value in zip(missing.values(), computed, strict=True):
+            for i in positions:
+                values[i] = value
+        _store(
+            client,
+            {
+                key: encode(value)
+                for key, value in zip(missing, computed, strict=True)
+                if cacheable is None or cacheable(value)
+            },
+            ttl_seconds,
+            name,
+        )
+
+    logger.log(hit_log_level, f"{name} cache: {len(inputs) - len(missing)}/{len(inputs)} hits")
+    return values
+
+
+def _store(client: redis.Redis, entries: dict[str, bytes], ttl_seconds: int, name: str) -> None:
+    """Write entries back in one pipelined round trip; failures are only logged."""
+    if not entries:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for key, value in entries.items():
+            pipe.set(key, value, ex=ttl_seconds)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Failed to write {len(entries)} entries to the {name.lower()} cache: {e}")
+
+
+def create_redis_client(config: Config, name: str) -> redis.Redis | None:
+    """
+    Connect a cache to the Celery broker's Redis.
+
+    Args:
+        config: Application configuration
+        name: Cache name used in log messages
+
+    Returns:
+        Redis client, or None if the broker is not Redis
+    """
+    try:
+        return redis.Redis.from_url(
+            config.CELERY_BROKER_URL,
+            socket_timeout=SOCKET_TIMEOUT,
+            socket_connect_timeout=SOCKET_TIMEOUT,
+        )
+    except ValueError as e:
+        logger.warning(f"{name} cache disabled, broker is not Redis: {e}")
+        return None
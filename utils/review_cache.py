@@ -0,0 +1,112 @@
+"""
+CortexReview Platform - Review Response Cache
+
+Exact-match cache for LLM review responses. A diff block that was already
+reviewed under the same model, locale and system prompt (task retries,
+re-pushed or rebased PRs, hunks shared across branches) is answered from
+Redis instead of a new completion.
+
+Architecture:
+- Keys: SHA-256 of (model, locale, system prompt, diff block); editing the
+  prompt template starts a new key space
+- Values: review text, stored in Redis with a TTL
+- Lookups through utils.redis_cache: one MGET per review, misses computed
+  together and written back; Redis errors fall through to reviewing every block
+- Error responses are never cached
+"""
+
+import hashlib
+from collections.abc import Callable, Sequence
+
+import redis
+from loguru import logger
+
+from utils.config import Config
+from utils.redis_cache import create_redis_client, get_or_compute_many
+
+# Redis key namespace for cached review responses
+KEY_PREFIX = "review"
+
+# Prefix Copilot.code_review() puts on failed responses
+ERROR_PREFIX = "Error:"
+
+
+def cache_key(model: str, locale: str, prompt: str, diff_content: str) -> str:
+    """Content address of the review of diff_content under model, locale and prompt."""
+    digest = hashlib.sha256(f"{model}\0{locale}\0".encode())
+    digest.update(hashlib.sha256(prompt.encode("utf-8", "surrogatepass")).digest())
+    digest.update(diff_content.encode("utf-8", "surrogatepass"))
+    return f"{KEY_PREFIX}:{digest.hexdigest()}"
+
+
+class ReviewCache:
+    """
+    Redis-backed cache of review responses keyed by diff content.
+
+    Attributes:
+        redis: Redis client storing review text
+        ttl_seconds: Lifetime of each cached review
+    """
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int):
+        """
+        Initialize ReviewCache.
+
+        Args:
+            client: Redis client (binary responses, i.e. decode_responses=False)
+            ttl_seconds: Lifetime of each cached review
+        """
+        self.redis = client
+        self.ttl_seconds = ttl_seconds
+
+    def get_or_compute_many(
+        self,
+        diffs: Sequence[str],
+        model: str,
+        locale: str,
+        prompt: str,
+        compute: Callable[[list[str]], list[str]],
+    ) -> list[str]:
+        """
+        Return one review per diff block, reviewing only the uncached ones.
+
+        Args:
+            diffs: Diff blocks to review
+            model: LLM model identifier (part of the cache key)
+            locale: Review language locale (part of the cache key)
+            prompt: System prompt the reviews are requested with (hashed into the cache key)
+            compute: Reviews a list of diff blocks, returning responses in input order
+
+        Returns:
+            One review response per diff block, in input order
+        """
+        return get_or_compute_many(
+            self.redis,
+            [cache_key(model, locale, prompt, diff) for diff in diffs],
+            diffs,
+            compute,
+            encode=lambda response: response.encode("utf-8", "surrogatepass"),
+            decode=lambda raw: raw.decode("utf-8", "surrogatepass"),
+            ttl_seconds=self.ttl_seconds,
+            name="Review",
+            cacheable=lambda response: not response.startswith(ERROR_PREFIX),
+            hit_log_level="INFO",
+        )
+
+
+def create_review_cache(config: Config) -> ReviewCache | None:
+    """
+    Factory function to create ReviewCache from configuration.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        ReviewCache on the Celery broker's Redis, or None if disabled
+    """
+    if not config.REVIEW_CACHE_TTL:
+        logger.info("Review cache disabled via configuration")
+        return None
+
+    client = create_redis_client(config, "Review")
+    return ReviewCache(client, config.REVIEW_CACHE_TTL) if client else None
@@ -7,9 +7,14 @@ and feedback handling. Integrates with platform adapters, RAG, and RLHF.
 Constitution VII: Async-First Processing - All reviews run as background tasks.
 """
 
+import os
+import re
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 
+from jose import jwt
 from loguru import logger
 from openai import OpenAI
 from supabase import Client, create_client
@@ -18,24 +23,33 @@ from adapters.gitea import GiteaAdapter
 from adapters.github import GitHubAdapter
 from celery_app import app
 from codereview.copilot import Copilot
+from models.feedback import FeedbackRequest
+from models.indexing import IndexDepth
 from models.platform import PRMetadata
 from models.review import (
     ReviewComment,
     ReviewResponse,
     ReviewStats,
 )
-from repositories.knowledge import KnowledgeRepository, create_knowledge_repository
+from repositories.constraints import ConstraintRepository
+from repositories.knowledge import (
+    QUERY_MAX_CHARS,
+    KnowledgeRepository,
+    create_knowledge_repository,
+)
+from services.feedback import FeedbackService
 from services.indexing import IndexingService, create_indexing_service
-from utils.config import Config
+from utils.config import get_config
+from utils.embedding_cache import create_embedding_cache
 from utils.metrics import (
-    llm_tokens_total,
     rag_retrieval_failure_total,
     review_duration_seconds,
 )
-from utils.secrets import scan_for_secrets
+from utils.review_cache import create_review_cache
+from utils.secrets import scan_blocks_for_secrets
 
 # Load configuration (singleton instance)
-config = Config()
+config = get_config()
 
 # Initialize LLM client
 llm_client = OpenAI(
@@ -43,6 +57,51 @@ llm_client = OpenAI(
     base_url=config.effective_llm_base_url,
 )
 
+# Content-addressed embedding cache shared by all worker processes (None if disabled)
+embedding_cache = create_embedding_cache(config)
+
+# Exact-match cache of review responses per diff block (None if disabled)
+review_cache = create_review_cache(config)
+
+# Git diff header: diff --git a/<old path> b/<new path>
+_DIFF_HEADER_RE = re.compile(r"diff --git a/(\S+) b/(\S+)")
+
+# Generated, vendored and lock files, whose diffs are not reviewed
+_GENERATED_PATH_RE = re.compile(
+    r"(?:^|/)(?:vendor|node_modules)/"
+    r"|(?:^|/)(?:package-lock\.json|yarn\.lock|pnpm-lock\.yaml|poetry\.lock|uv\.lock"
+    r"|Pipfile\.lock|Cargo\.lock|Gemfile\.lock|composer\.lock|go\.sum)$"
+    r"|\.min\.(?:js|css)$|\.map$"
+)
+
+# Lifetime of the JWT signed for local Supabase
+LOCAL_SUPABASE_TOKEN_TTL_SECONDS = 3600
+
+# Tokens are re-signed this long before they expire
+LOCAL_SUPABASE_TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Expiry of the current local Supabase JWT (stays 0 outside local mode)
+_local_supabase_token_expires_at = 0
+
+
+def _sign_local_supabase_token(jwt_secret: str) -> str:
+    """Sign a postgres-role JWT for local PostgREST and record its expiry."""
+    global _local_supabase_token_expires_at
+
+    issued_at = int(time.time())
+    expires_at = issued_at + LOCAL_SUPABASE_TOKEN_TTL_SECONDS
+    # Note: Using postgres role instead of service_role for local deployment
+    payload = {
+        "role": "postgres",  # Use postgres role (has privileges on tables)
+        "iss": "supabase",  # Issuer
+        "iat": issued_at,  # Issued at
+        "exp": expires_at,
+    }
+    token = jwt.encode(payload, jwt_secret, algorithm="HS256")
+    _local_supabase_token_expires_at = expires_at
+    return token
+
+
 # Initialize Supabase client (if configured)
 supabase_client: Client | None = None
 
@@ -64,42 +123,32 @@ if config.SUPABASE_URL and config.SUPABASE_SERVICE_KEY:
 elif config.SUPABASE_DB_URL:
     # Mode 2: Local Supabase via PostgREST API
     # The local Supabase deployment includes supabase-rest (PostgREST) service
-    # We generate a JWT token signed with JWT_SECRET for authentication
-    import os
-    import time
-    from jose import jwt
-
+    # We sign a JWT with JWT_SECRET for authentication, renewed by
+    # _refresh_local_supabase_token() before it expires
     local_rest_url = "http://supabase-rest:3000"  # Internal Docker network
     jwt_secret = os.getenv("JWT_SECRET")
 
     if jwt_secret:
         try:
-            # Generate a JWT token for local Supabase with postgres role
-            # Note: Using postgres role instead of service_role for local deployment
-            payload = {
-                "role": "postgres",  # Use postgres role (has privileges on tables)
-                "iss": "supabase",  # Issuer
-                "iat": int(time.time()),  # Issued at
-                "exp": int(time.time()) + 3600,  # Expires in 1 hour (will be refreshed)
-            }
-            token = jwt.encode(payload, jwt_secret, algorithm="HS256")
-
-            supabase_client = create_client(local_rest_url, token)
+            supabase_client = create_client(local_rest_url, _sign_local_supabase_token(jwt_secret))
 
             # Patch rest_url to remove /rest/v1 prefix (local PostgREST uses root path)
             supabase_client.rest_url = local_rest_url
 
             logger.info("Supabase client initialized (local Supabase via PostgREST with JWT)")
         except Exception as e:
-            logger.warning(f"Local Supabase initialization failed: {e}. RAG/RLHF features disabled.")
+            logger.warning(
+                f"Local Supabase initialization failed: {e}. RAG/RLHF features disabled."
+            )
             supabase_client = None
+            _local_supabase_token_expires_at = 0
     else:
         logger.warning("JWT_SECRET not configured for local Supabase. RAG/RLHF features disabled.")
 
 # Initialize RAG repository (if Supabase available)
 knowledge_repo: KnowledgeRepository | None = None
 if supabase_client:
-    knowledge_repo = create_knowledge_repository(supabase_client, config)
+    knowledge_repo = create_knowledge_repository(supabase_client, config, embedding_cache)
     if knowledge_repo:
         logger.info("Knowledge repository initialized for RAG")
 
@@ -139,17 +188,13 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
     task_logger.info(f"Processing code review: task_id={self.request.id}")
 
     try:
+        _refresh_local_supabase_token()
+
         # Reconstruct PRMetadata from dict
         metadata = PRMetadata(**metadata_dict)
 
-        # Initialize platform adapter
-        if metadata.platform == "github":
-            adapter = GitHubAdapter(token=config.GITHUB_TOKEN or "")
-        else:  # gitea
-            adapter = GiteaAdapter(
-                host=config.GITEA_HOST,
-                token=config.GITEA_TOKEN,
-            )
+        # Platform adapter (shared by every task in this worker process)
+        adapter = _get_adapter(metadata.platform)
 
         # Get diff from platform
         diff_blocks = adapter.get_diff(metadata)
@@ -164,21 +209,48 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
                 "error": "No diff content found",
             }
 
+        # Drop oversized and generated file diffs before any embedding or LLM call
+        reviewable_blocks = [block for block in diff_blocks if _is_reviewable(block)]
+        if len(reviewable_blocks) < len(diff_blocks):
+            task_logger.info(
+                f"Skipped {len(diff_blocks) - len(reviewable_blocks)} generated or oversized diff blocks"
+            )
+        diff_blocks = reviewable_blocks
+
+        # -------------------------------------------------------------------------
+        # Embeddings: computed once per PR and shared by RAG and RLHF
+        # -------------------------------------------------------------------------
+        rlhf_active = config.RLHF_ENABLED and supabase_client is not None
+        rag_active = bool(config.RAG_ENABLED and knowledge_repo)
+        # Build query from diff blocks for context retrieval
+        rag_query_text = "\n".join(diff_blocks[:3])  # Use first 3 diffs as query
+        rag_query_embedding: list[float] | None = None
+        block_embeddings: list[list[float] | None] = [None] * len(diff_blocks)
+        if rlhf_active or rag_active:
+            try:
+                rag_query_embedding, embedded = _embed_review_inputs(
+                    rag_query_text if rag_active else None,
+                    diff_blocks if rlhf_active else [],
+                )
+                if rlhf_active:
+                    block_embeddings = embedded
+            except Exception as e:
+                task_logger.warning(f"Diff embedding failed (graceful fallback): {e}")
+
         # -------------------------------------------------------------------------
         # RAG: Retrieve context from knowledge base (if enabled) (T056-T059)
         # -------------------------------------------------------------------------
         rag_context_citations = []
         rag_match_count_value = 0
-        if config.RAG_ENABLED and knowledge_repo:
+        if rag_active:
             rag_start = time.time()
             try:
-                # Build query from diff blocks for context retrieval
-                query_text = "\n".join(diff_blocks[:3])  # Use first 3 diffs as query
                 rag_context = knowledge_repo.search_context(
-                    query_text=query_text,
+                    query_text=rag_query_text,
                     repo_id=metadata.repo_id,
                     match_threshold=config.RAG_THRESHOLD,
                     match_count=config.RAG_MATCH_COUNT_MIN,
+                    query_embedding=rag_query_embedding,
                 )
                 rag_match_count_value = len(rag_context)
                 rag_latency = time.time() - rag_start
@@ -200,10 +272,11 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
         # -------------------------------------------------------------------------
         # RLHF: Check for learned constraints (if enabled)
         # -------------------------------------------------------------------------
-        suppressed_patterns = []
-        if config.RLHF_ENABLED and supabase_client:
+        suppressed_by_block: list[list[str]] = [[] for _ in diff_blocks]
+        if rlhf_active:
             try:
-                suppressed_patterns = _check_learned_constraints(metadata, diff_blocks)
+                suppressed_by_block = _check_learned_constraints(metadata, block_embeddings)
+                suppressed_patterns = {cid for ids in suppressed_by_block for cid in ids}
                 if suppressed_patterns:
                     task_logger.info(f"RLHF suppressed {len(suppressed_patterns)} known patterns")
             except Exception as e:
@@ -212,26 +285,38 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
         # -------------------------------------------------------------------------
         # LLM: Generate review comments
         # -------------------------------------------------------------------------
-        copilot = Copilot(config)
+        copilot = _get_copilot()
 
         comments = []
-        total_tokens = 0
 
-        for diff_content in diff_blocks:
+        reviewable_diffs = []
+        for diff_content, suppressed_ids in zip(diff_blocks, suppressed_by_block, strict=True):
             # Skip if suppressed by RLHF
-            if _is_diff_suppressed(diff_content, suppressed_patterns):
+            if _is_diff_suppressed(diff_content, suppressed_ids):
                 task_logger.debug("Diff suppressed by learned constraints")
                 continue
+            reviewable_diffs.append(diff_content)
+
+        # Extract file paths and scan every diff for secrets in one pass (data governance)
+        file_paths = [_extract_file_path(diff_content) for diff_content in reviewable_diffs]
+        secret_matches_by_diff = scan_blocks_for_secrets(reviewable_diffs, file_paths)
+
+        # Diffs already reviewed under this model, locale and prompt are served from the cache
+        if review_cache:
+            responses = review_cache.get_or_compute_many(
+                reviewable_diffs,
+                copilot.model,
+                config.LLM_LOCALE,
+                copilot.system_prompt(),
+                lambda diffs: _review_diffs(copilot, diffs),
+            )
+        else:
+            responses = _review_diffs(copilot, reviewable_diffs)
 
-            # Generate review comment
-            response = copilot.code_review(diff_content)
-
+        for file_path, secret_matches, response in zip(
+            file_paths, secret_matches_by_diff, responses, strict=True
+        ):
             if response:
-                # Extract file path from diff
-                file_path = _extract_file_path(diff_content)
-
-                # Scan for secrets (data governance)
-                secret_matches = scan_for_secrets(diff_content, file_path)
                 if secret_matches:
                     task_logger.warning(f"Secrets detected in {file_path}, redacting from review")
 
@@ -248,9 +333,6 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
                 )
                 comments.append(comment)
 
-                # Track token usage (approximate)
-                total_tokens += len(response.split())
-
         # -------------------------------------------------------------------------
         # Metrics: Record observability data (Constitution XI)
         # -------------------------------------------------------------------------
@@ -258,9 +340,6 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
         review_duration_seconds.labels(platform=metadata.platform, status="success").observe(
             duration
         )
-        llm_tokens_total.labels(model_type=config.LLM_MODEL, model_name=config.LLM_MODEL).inc(
-            total_tokens
-        )
 
         # Build review response
         review_response = ReviewResponse(
@@ -281,10 +360,7 @@ def process_code_review(self, metadata_dict: dict, trace_id: str) -> dict:
         # Post review to platform
         adapter.post_review(metadata, review_response)
 
-        task_logger.info(
-            f"Code review completed: {len(comments)} comments, "
-            f"{duration:.2f}s, {total_tokens} tokens"
-        )
+        task_logger.info(f"Code review completed: {len(comments)} comments, {duration:.2f}s")
 
         return {
             "task_id": self.request.id,
@@ -338,12 +414,12 @@ def index_repository(
     task_logger.info(f"Starting repository indexing: {repo_id}")
 
     try:
+        _refresh_local_supabase_token()
+
         if not indexing_service:
             raise Exception("Indexing service not available (Supabase not configured)")
 
         # Parse depth string to IndexDepth enum
-        from models.indexing import IndexDepth
-
         index_depth = IndexDepth.SHALLOW if depth == "shallow" else IndexDepth.DEEP
 
         # Run indexing workflow
@@ -398,14 +474,13 @@ def process_feedback(
     Returns:
         dict with feedback processing result
     """
-    from models.feedback import FeedbackRequest
-    from services.feedback import FeedbackService
-
     trace_id = trace_id or str(uuid.uuid4())
     task_logger = logger.bind(trace_id=trace_id, task_id=self.request.id)
     task_logger.info(f"Processing feedback: action={feedback_dict.get('action')}")
 
     try:
+        _refresh_local_supabase_token()
+
         if not supabase_client:
             raise Exception("Supabase client not configured")
 
@@ -452,19 +527,19 @@ def cleanup_expired_constraints() -> dict:
     Runs hourly via Celery Beat to remove constraints past their expiration date.
     Uses 90-day expiration policy by default.
     """
-    from repositories.constraints import ConstraintRepository
-
     logger.info("Starting expired constraint cleanup")
 
     try:
+        _refresh_local_supabase_token()
+
         if not supabase_client:
             return {"status": "skipped", "reason": "Supabase not configured"}
 
         # Initialize constraint repository
         constraint_repo = ConstraintRepository(supabase_client)
 
-        # Delete constraints older than 90 days (T069)
-        deleted_count = constraint_repo.delete_expired(days_old=config.CONSTRAINT_EXPIRATION_DAYS)
+        # Delete constraints past their expires_at (set from CONSTRAINT_EXPIRATION_DAYS) (T069)
+        deleted_count = constraint_repo.delete_expired()
 
         logger.info(f"Cleanup completed: {deleted_count} expired constraints deleted")
 
@@ -494,6 +569,76 @@ def aggregate_metrics() -> dict:
 # =============================================================================
 
 
+def _refresh_local_supabase_token() -> None:
+    """
+    Re-sign the local Supabase JWT if it is about to expire.
+
+    The client is re-authenticated in place, so the repositories and services
+    created with it at startup keep working in workers running for hours.
+    """
+    expires_at = _local_supabase_token_expires_at
+    if not expires_at or time.time() < expires_at - LOCAL_SUPABASE_TOKEN_REFRESH_MARGIN_SECONDS:
+        return
+
+    token = _sign_local_supabase_token(os.environ["JWT_SECRET"])
+    supabase_client.options.headers["Authorization"] = f"Bearer {token}"
+    supabase_client.postgrest.auth(token)
+    logger.debug("Local Supabase token refreshed")
+
+
+@cache
+def _get_adapter(platform: str) -> GitHubAdapter | GiteaAdapter:
+    """
+    Get the platform adapter for this worker process, creating it on first use.
+
+    Args:
+        platform: Platform identifier ("github" or "gitea")
+
+    Returns:
+        Platform adapter configured with the worker's credentials
+    """
+    if platform == "github":
+        return GitHubAdapter(token=config.GITHUB_TOKEN or "")
+    return GiteaAdapter(
+        host=config.GITEA_HOST,
+        token=config.GITEA_TOKEN,
+    )
+
+
+@cache
+def _get_copilot() -> Copilot:
+    """
+    Get the LLM client for this worker process, creating it on first use.
+
+    Created lazily rather than at import so a missing LLM key only fails the
+    review tasks, and a renewed Copilot token is kept for later tasks.
+    """
+    return Copilot(config)
+
+
+def _review_diffs(copilot: Copilot, diffs: list[str]) -> list[str]:
+    """
+    Review diff blocks concurrently (LLM calls are network-bound).
+
+    Identical blocks are reviewed once and the response is shared.
+
+    Args:
+        copilot: AI reviewer
+        diffs: Diff blocks to review
+
+    Returns:
+        One review response per diff block, in input order
+    """
+    unique_diffs = list(dict.fromkeys(diffs))
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(config.LLM_CONCURRENCY, len(unique_diffs)))
+    ) as executor:
+        reviews = dict(
+            zip(unique_diffs, executor.map(copilot.code_review, unique_diffs), strict=True)
+        )
+    return [reviews[diff] for diff in diffs]
+
+
 def _retrieve_rag_context(metadata: PRMetadata, diff_blocks: list[str]) -> list[str]:
     """
     Retrieve relevant context from knowledge base using vector similarity.
@@ -518,57 +663,121 @@ def _retrieve_rag_context(metadata: PRMetadata, diff_blocks: list[str]) -> list[
     return []
 
 
-def _check_learned_constraints(metadata: PRMetadata, diff_blocks: list[str]) -> list[str]:
+def _embed_blocks(diff_blocks: list[str]) -> list[list[float] | None]:
     """
-    Check if diff matches any learned constraints (RLHF).
-
-    Uses ConstraintRepository to generate embeddings and query Supabase
-    for matching constraints that should suppress false positives.
+    Embed each diff block once, through the embedding cache when enabled.
 
     Args:
-        metadata: PR metadata
         diff_blocks: List of diff content blocks
 
     Returns:
-        list of suppressed constraint IDs
+        One embedding per block (None for empty blocks), in block order
     """
-    from repositories.constraints import ConstraintRepository
+    positions = [i for i, block in enumerate(diff_blocks) if block]
+    texts = [diff_blocks[i][:8000] for i in positions]
+    if embedding_cache:
+        vectors = embedding_cache.get_or_compute_many(texts, config.EMBEDDING_MODEL, _embed_texts)
+    else:
+        vectors = _embed_texts(texts)
+
+    embeddings: list[list[float] | None] = [None] * len(diff_blocks)
+    for i, vector in zip(positions, vectors, strict=True):
+        embeddings[i] = vector
+    return embeddings
+
+
+def _embed_review_inputs(
+    query_text: str | None, diff_blocks: list[str]
+) -> tuple[list[float] | None, list[list[float] | None]]:
+    """
+    Embed the RAG query and the diff blocks in one cached, batched lookup.
+
+    The query is embedded as the knowledge repository would embed it itself,
+    so it shares that cache entry.
+
+    Args:
+        query_text: RAG query text, or None when RAG is disabled
+        diff_blocks: Blocks to embed individually (empty when RLHF is disabled)
+
+    Returns:
+        Tuple of (query embedding or None, one embedding per diff block)
+    """
+    if query_text is None:
+        return None, _embed_blocks(diff_blocks)
+    embedded = _embed_blocks([query_text[:QUERY_MAX_CHARS], *diff_blocks])
+    return embedded[0], embedded[1:]
+
+
+def _check_learned_constraints(
+    metadata: PRMetadata, block_embeddings: list[list[float] | None]
+) -> list[list[str]]:
+    """
+    Check each diff block against the learned constraints (RLHF).
+
+    Uses ConstraintRepository to query Supabase for matching constraints
+    that should suppress false positives.
 
+    Args:
+        metadata: PR metadata
+        block_embeddings: Embedding of each diff block (None for blocks not embedded)
+
+    Returns:
+        IDs of the constraints matching each diff block, in block order
+    """
+    suppressed_by_block: list[list[str]] = [[] for _ in block_embeddings]
     if not supabase_client:
-        return []
+        return suppressed_by_block
 
     try:
         # Initialize constraint repository
         constraint_repo = ConstraintRepository(supabase_client)
 
-        # Generate embedding for query (using first diff block)
-        query_text = diff_blocks[0] if diff_blocks else ""
-        if not query_text:
-            return []
-
-        # Generate embedding for the query
-        query_embedding = (
-            llm_client.embeddings.create(
-                model=config.EMBEDDING_MODEL,
-                input=query_text[:8000],
+        def check(query_embedding: list[float]) -> list[str]:
+            matching_constraints = constraint_repo.check_suppressions(
+                repo_id=metadata.repo_id,
+                embedding=query_embedding,
+                threshold=config.RLHF_THRESHOLD,
             )
-            .data[0]
-            .embedding
-        )
-
-        # Check for matching constraints
-        matching_constraints = constraint_repo.check_suppressions(
-            repo_id=metadata.repo_id,
-            embedding=query_embedding,
-            threshold=config.RLHF_THRESHOLD,
-        )
-
-        # Return list of constraint IDs that should be suppressed
-        return [c.id for c in matching_constraints]
+            return [c.id for c in matching_constraints]
+
+        # Check each block against the constraints with its own embedding; the
+        # RPCs are network-bound, so they run concurrently like the LLM calls
+        embedded = [i for i, embedding in enumerate(block_embeddings) if embedding is not None]
+        if not embedded:
+            return suppressed_by_block
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(config.LLM_CONCURRENCY, len(embedded)))
+        ) as executor:
+            matches = executor.map(check, [block_embeddings[i] for i in embedded])
+            for i, constraint_ids in zip(embedded, matches, strict=True):
+                suppressed_by_block[i] = constraint_ids
+
+        return suppressed_by_block
 
     except Exception as e:
         logger.warning(f"Failed to check learned constraints: {e}")
-        return []
+        return [[] for _ in block_embeddings]
+
+
+def _embed_texts(texts: list[str]) -> list[list[float]]:
+    """
+    Generate embeddings for several texts in batched API requests.
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        One embedding per text, in input order
+    """
+    embeddings = []
+    batch_size = config.EMBEDDING_BATCH_SIZE
+    for start in range(0, len(texts), batch_size):
+        response = llm_client.embeddings.create(
+            model=config.EMBEDDING_MODEL,
+            input=texts[start : start + batch_size],
+        )
+        embeddings.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+    return embeddings
 
 
 def _is_diff_suppressed(diff_content: str, suppressed_constraints: list[str]) -> bool:
@@ -577,19 +786,29 @@ def _is_diff_suppressed(diff_content: str, suppressed_constraints: list[str]) ->
 
     Args:
         diff_content: Diff content to check
-        suppressed_constraints: List of constraint IDs that are suppressed
+        suppressed_constraints: IDs of the constraints matching this diff's
+            own embedding above RLHF_THRESHOLD
 
     Returns:
         True if diff should be suppressed
     """
-    # For now, we check if any constraints were found that match this diff
-    # In a more sophisticated implementation, we could:
-    # 1. Generate embedding for this specific diff
-    # 2. Check against each suppressed constraint individually
-    # 3. Return True only if similarity exceeds threshold
+    return bool(diff_content) and bool(suppressed_constraints)
+
+
+def _is_reviewable(diff_content: str) -> bool:
+    """
+    Check whether a diff block is worth an LLM review.
 
-    # Current implementation: If we have suppressed constraints, assume suppression
-    return len(suppressed_constraints) > 0
+    Args:
+        diff_content: Diff content to check
+
+    Returns:
+        False for blocks longer than MAX_DIFF_BLOCK_CHARS and for diffs of
+        generated, vendored or lock files
+    """
+    if len(diff_content) > config.MAX_DIFF_BLOCK_CHARS:
+        return False
+    return not _GENERATED_PATH_RE.search(_extract_file_path(diff_content))
 
 
 def _extract_file_path(diff_content: str) -> str:
@@ -600,16 +819,15 @@ def _extract_file_path(diff_content: str) -> str:
         diff_content: Git diff content
 
     Returns:
-        File path string
-    """
-    lines = diff_content.split("\n")
-    for line in lines:
-        if line.startswith("diff --git a/"):
-            # Extract: diff --git a/file.py b/file.py
-            parts = line.split()
-            if len(parts) >= 3:
-                return parts[2][2:]  # Remove "b/" prefix
-    return "unknown"
+        File path string (the post-change "b/" path)
+    """
+    # The header is normally the first line; otherwise find it without splitting the diff
+    match = _DIFF_HEADER_RE.match(diff_content)
+    if not match:
+        start = diff_content.find("\ndiff --git a/") + 1
+        if start:
+            match = _DIFF_HEADER_RE.match(diff_content, start)
+    return match.group(2) if match else "unknown"
 
 
 # =============================================================================